@@ -5,7 +5,6 @@ from zenml import pipeline
 
 from steps.collect_urls.extract_urls_from_sitemap import extract_urls_from_sitemap
 from steps.collect_crawl_data.extract_crawled_data import extract_crawled_data
-from steps.infrastructure.save_documents_to_disk import save_documents_to_disk
 from steps.infrastructure.upload_to_s3 import upload_to_s3
 
 @pipeline
@@ -13,23 +12,66 @@ def collect_crawl_data(
     url_prefix: str, 
     data_dir: Path = Path(),
     to_s3: bool = False,
+    s3_sync_mode: str = "archive",
     max_workers:int = 10,
+    incremental: bool = False,
+    requests_per_second: float = 2.0,
+    max_requests_per_second: float = 20.0,
+    respect_crawl_delay: bool = True,
+    page_timeout: float = 60.0,
+    max_retries: int = 3,
+    retry_failures: bool = False,
+    fast_path: bool = True,
+    browser_pool_size: int = 1,
+    pages_per_browser: int = 500,
+    num_crawl_processes: int = 1,
+    crawl_shard_by: str = "path",
+    global_requests_per_second: float | None = None,
+    follow_links: bool = False,
+    max_crawl_depth: int = 3,
+    max_crawl_pages: int | None = None,
 ) -> None:
 
     crawled_data_dir = data_dir / "crawled"
     logger.info(f"Saving crawled data to {crawled_data_dir}")
+
+    # The ledger lives next to the crawled folder, which is rewritten on every crawl
+    ledger_path = data_dir / "crawl_ledger.json" if incremental else None
+    failures_path = data_dir / "crawl_failures.json"
     
 
     urls = extract_urls_from_sitemap(url_prefix=url_prefix)
 
-    crawled_documents = extract_crawled_data(urls=urls, max_workers=max_workers)
-
-    save_documents_to_disk(documents=crawled_documents, output_dir=crawled_data_dir)
+    # Documents are written to disk as they are crawled instead of being passed as an artifact
+    extract_crawled_data(
+        urls=urls,
+        output_dir=crawled_data_dir,
+        max_workers=max_workers,
+        ledger_path=ledger_path,
+        requests_per_second=requests_per_second,
+        max_requests_per_second=max_requests_per_second,
+        respect_crawl_delay=respect_crawl_delay,
+        page_timeout=page_timeout,
+        max_retries=max_retries,
+        failures_path=failures_path,
+        retry_failures=retry_failures,
+        fast_path=fast_path,
+        browser_pool_size=browser_pool_size,
+        pages_per_browser=pages_per_browser,
+        num_processes=num_crawl_processes,
+        shard_by=crawl_shard_by,
+        global_requests_per_second=global_requests_per_second,
+        follow_links=follow_links,
+        scope_prefix=url_prefix,
+        max_depth=max_crawl_depth,
+        max_pages=max_crawl_pages,
+    )
 
     if to_s3:
         upload_to_s3(
         folder_path=str(crawled_data_dir),
         s3_prefix="slack_integrations/crawled",
-        after="save_documents_to_disk"
+        sync_mode=s3_sync_mode,
+        after="extract_crawled_data"
         )
 
@@ -1,6 +1,5 @@
 from zenml import pipeline
 
-from steps.infrastructure.fetch_from_mongodb import fetch_from_mongodb
 from steps.compute_rag.chunk_embed_load import chunk_embed_load
 
 
@@ -17,11 +16,9 @@ def compute_rag(
     processing_max_workers: int,
     limit: int,
 ) -> None:
-    
-    documents = fetch_from_mongodb(collection_name=extract_collection_name, limit=limit)
 
     chunk_embed_load(
-        documents=documents,
+        extract_collection_name=extract_collection_name,
         collection_name=new_collection_name,
         embedding_model_id=embedding_model_id, 
         embedding_model_dim=embedding_model_dim,
@@ -30,4 +27,5 @@ def compute_rag(
         top_k=top_k,
         processing_batch_size=processing_batch_size,
         processing_max_workers=processing_max_workers,
+        limit=limit,
     )
\ No newline at end of file
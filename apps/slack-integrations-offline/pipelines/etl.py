@@ -3,7 +3,10 @@ from pathlib import Path
 from loguru import logger
 from zenml import pipeline
 
+from steps.infrastructure.download_from_s3 import download_from_s3
 from steps.infrastructure.read_documents_from_disk import read_documents_from_disk
+from steps.preprocessing.deduplicate_documents import deduplicate_documents
+from steps.preprocessing.strip_boilerplate import strip_boilerplate
 from steps.generate_summaries.generate_summary import generate_summary
 from steps.infrastructure.save_documents_to_disk import save_documents_to_disk
 from steps.infrastructure.ingest_to_mongodb import ingest_to_mongodb
@@ -18,14 +21,48 @@ def etl(
     temperature: float = 0.0,
     max_workers: int = 10,
     summarization_max_characters: int = 1000,
+    from_s3: bool = False,
+    s3_sync_mode: str = "archive",
+    near_duplicate_threshold: float = 0.9,
+    boilerplate_min_page_fraction: float = 0.2,
+    incremental_ingestion: bool = False,
+    summarization_requests_per_minute: int = 500,
+    summarization_tokens_per_minute: int = 200_000,
+    use_summary_cache: bool = True,
+    summary_cache_collection_name: str | None = None,
+    summarization_max_input_tokens: int = 12_000,
 ) -> None:
     
     crawled_data_dir = data_dir / "crawled"
 
     enhanced_data_dir = data_dir / "enhanced"
 
+    if from_s3:
+        # Seed the crawled data from the published dataset instead of re-crawling
+        download_from_s3(
+            output_dir=str(crawled_data_dir),
+            s3_prefix="slack_integrations/crawled",
+            sync_mode=s3_sync_mode,
+            no_sign_request=True,
+        )
+
     documents = read_documents_from_disk(
-        data_directory = crawled_data_dir, nesting_level = 0
+        data_directory = crawled_data_dir,
+        nesting_level = 0,
+        after="download_from_s3" if from_s3 else None,
+    )
+
+    # Navigation and footers repeated on every page would be paid for in every prompt and chunk
+    documents = strip_boilerplate(
+        documents=documents,
+        min_page_fraction=boilerplate_min_page_fraction,
+        tokenizer_model=summarization_model,
+    )
+
+    # Duplicates are dropped before paying for their summaries and embeddings
+    documents = deduplicate_documents(
+        documents=documents,
+        similarity_threshold=near_duplicate_threshold,
     )
 
     enhanced_documents = generate_summary(
@@ -34,13 +71,23 @@ def etl(
         temperature=temperature,
         max_workers=max_workers,
         summarization_max_characters=summarization_max_characters,
+        requests_per_minute=summarization_requests_per_minute,
+        tokens_per_minute=summarization_tokens_per_minute,
+        cache_path=data_dir / "summary_cache.sqlite" if use_summary_cache else None,
+        cache_collection_name=summary_cache_collection_name,
+        max_input_tokens=summarization_max_input_tokens,
     )
 
     save_documents_to_disk(documents=enhanced_documents, output_dir=enhanced_data_dir)
     
 
+    # Document IDs are stable per URL, so an incremental run upserts and skips unchanged content,
+    # then deletes the documents of pages that are no longer crawled
     ingest_to_mongodb(
         models=enhanced_documents,
         collection_name=load_collection_name,
-        clear_collection=True
+        clear_collection=not incremental_ingestion,
+        upsert_key="id" if incremental_ingestion else None,
+        skip_unchanged=incremental_ingestion,
+        delete_missing=incremental_ingestion,
     )
\ No newline at end of file
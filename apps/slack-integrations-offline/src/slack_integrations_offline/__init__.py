@@ -1,4 +1,4 @@
-from .utils import generate_random_hex
+from .utils import compute_content_hash, generate_document_id, generate_random_hex
 from .config import settings
 
-__all__ = ["generate_random_hex", "settings"]
\ No newline at end of file
+__all__ = ["compute_content_hash", "generate_document_id", "generate_random_hex", "settings"]
\ No newline at end of file
@@ -0,0 +1,268 @@
+import asyncio
+import re
+import time
+from typing import Mapping
+
+from loguru import logger
+
+
+# Durations of the OpenAI reset headers, such as "1s", "6m0s" or "20ms"
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+RATE_LIMIT_HEADERS = {
+    "limit_requests": "x-ratelimit-limit-requests",
+    "limit_tokens": "x-ratelimit-limit-tokens",
+    "remaining_requests": "x-ratelimit-remaining-requests",
+    "remaining_tokens": "x-ratelimit-remaining-tokens",
+    "reset_requests": "x-ratelimit-reset-requests",
+    "reset_tokens": "x-ratelimit-reset-tokens",
+}
+
+
+class RateLimitScheduler:
+    """Pace LLM requests to the requests-per-minute and tokens-per-minute limits of a provider.
+
+    Two token buckets refill continuously at the per-minute limits. Each request reserves one
+    request and its estimated tokens before it is sent, waiting only when a bucket runs dry,
+    and the reservation is corrected with the actual usage once the response arrives. The
+    `x-ratelimit-*` response headers replace the configured limits with the ones of the
+    account and cap the buckets to what the provider reports as remaining, and a rate limit
+    error pauses every request for the `Retry-After` delay.
+
+    Attributes:
+        requests_per_minute: Maximum number of requests per minute.
+        tokens_per_minute: Maximum number of tokens per minute.
+        request_count: Number of requests let through.
+        throttle_count: Number of rate limit errors received.
+        estimated_tokens: Total number of tokens reserved before the requests.
+        used_tokens: Total number of tokens reported by the responses.
+        wait_seconds: Total time requests spent waiting for the budget.
+    """
+
+    def __init__(self, requests_per_minute: int = 500, tokens_per_minute: int = 200_000) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+
+        self.request_count = 0
+        self.throttle_count = 0
+        self.estimated_tokens = 0
+        self.used_tokens = 0
+        self.wait_seconds = 0.0
+
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+
+
+    async def acquire(self, estimated_tokens: int) -> int:
+        """Wait until the budget allows a request and reserve it.
+
+        Args:
+            estimated_tokens: Estimated prompt and completion tokens of the request.
+
+        Returns:
+            int: Number of tokens reserved, to pass to `release`.
+        """
+
+        # asyncio locks are bound to one event loop, and the scheduler may outlive it
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+
+        # A request larger than the whole budget would wait forever
+        reserved_tokens = min(estimated_tokens, self.tokens_per_minute)
+        start_time = time.monotonic()
+
+        # Waiters queue on the lock, so the budget is handed out in arrival order
+        async with self._lock:
+            while True:
+                now = self.__refill()
+
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                elif self._requests >= 1.0 and self._tokens >= reserved_tokens:
+                    self._requests -= 1.0
+                    self._tokens -= reserved_tokens
+                    break
+                else:
+                    await asyncio.sleep(
+                        max(
+                            (1.0 - self._requests) * 60.0 / self.requests_per_minute,
+                            (reserved_tokens - self._tokens) * 60.0 / self.tokens_per_minute,
+                            0.01,
+                        )
+                    )
+
+        self.request_count += 1
+        self.estimated_tokens += reserved_tokens
+        self.wait_seconds += time.monotonic() - start_time
+
+        return reserved_tokens
+
+
+    def release(
+        self,
+        reserved_tokens: int,
+        used_tokens: int | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        """Correct a reservation with the usage and rate limit headers of the response.
+
+        Args:
+            reserved_tokens: Tokens reserved by `acquire`.
+            used_tokens: Tokens reported by the response, None if unknown.
+            headers: Response headers, used to follow the provider's own accounting.
+        """
+
+        self.__refill()
+
+        if used_tokens is not None:
+            self.used_tokens += used_tokens
+            # Tokens reserved but not used go back to the bucket, overruns are taken from it
+            self._tokens = min(
+                float(self.tokens_per_minute), self._tokens + reserved_tokens - used_tokens
+            )
+
+        if headers:
+            self.__update_from_headers(headers)
+
+
+    def throttle(self, retry_after_seconds: float | None = None) -> None:
+        """Pause every request after a rate limit error.
+
+        Args:
+            retry_after_seconds: Delay requested by the provider. Defaults to the time needed
+                to refill one request.
+        """
+
+        self.throttle_count += 1
+        delay = retry_after_seconds or 60.0 / self.requests_per_minute
+
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        self._tokens = min(self._tokens, 0.0)
+        self._requests = min(self._requests, 0.0)
+
+        logger.warning(f"Rate limited by the provider, pausing requests for {delay:.1f}s")
+
+
+    def stats(self) -> dict[str, float | int]:
+        """Counters of the scheduler, for reporting.
+
+        Returns:
+            dict[str, float | int]: Limits, request and token counts and time spent waiting.
+        """
+
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "requests": self.request_count,
+            "throttled_requests": self.throttle_count,
+            "estimated_tokens": self.estimated_tokens,
+            "used_tokens": self.used_tokens,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+    def __refill(self) -> float:
+        now = time.monotonic()
+        elapsed_minutes = (now - self._updated_at) / 60.0
+
+        self._requests = min(
+            float(self.requests_per_minute),
+            self._requests + elapsed_minutes * self.requests_per_minute,
+        )
+        self._tokens = min(
+            float(self.tokens_per_minute),
+            self._tokens + elapsed_minutes * self.tokens_per_minute,
+        )
+        self._updated_at = now
+
+        return now
+
+
+    def __update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Follow the limits and remaining budget reported by the provider.
+
+        Args:
+            headers: Response headers, possibly with a provider prefix on their names.
+        """
+
+        values = _rate_limit_values(headers)
+
+        limit_requests = _parse_int(values.get("limit_requests"))
+        if limit_requests and limit_requests != self.requests_per_minute:
+            logger.info(f"Following the provider limit of {limit_requests} requests per minute")
+            self.requests_per_minute = limit_requests
+
+        limit_tokens = _parse_int(values.get("limit_tokens"))
+        if limit_tokens and limit_tokens != self.tokens_per_minute:
+            logger.info(f"Following the provider limit of {limit_tokens} tokens per minute")
+            self.tokens_per_minute = limit_tokens
+
+        # The provider's count also includes requests sent by other clients of the account
+        remaining_requests = _parse_int(values.get("remaining_requests"))
+        if remaining_requests is not None:
+            self._requests = min(self._requests, float(remaining_requests))
+
+        remaining_tokens = _parse_int(values.get("remaining_tokens"))
+        if remaining_tokens is not None:
+            self._tokens = min(self._tokens, float(remaining_tokens))
+
+        if remaining_requests == 0 or remaining_tokens == 0:
+            reset_seconds = max(
+                parse_duration(values.get("reset_requests")) or 0.0,
+                parse_duration(values.get("reset_tokens")) or 0.0,
+            )
+            self._blocked_until = max(self._blocked_until, time.monotonic() + reset_seconds)
+
+
+def parse_duration(value: str | None) -> float | None:
+    """Parse a duration such as "6m0s", "1.5s" or "20ms" into seconds.
+
+    Args:
+        value: Duration string, or a plain number of seconds.
+
+    Returns:
+        float | None: Duration in seconds, or None if it cannot be parsed.
+    """
+
+    if not value:
+        return None
+
+    try:
+        return float(value)
+
+    except ValueError:
+        pass
+
+    parts = DURATION_PATTERN.findall(value)
+    if not parts:
+        return None
+
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _rate_limit_values(headers: Mapping[str, str]) -> dict[str, str]:
+    """Pick the `x-ratelimit-*` headers, whatever prefix the client library added."""
+
+    values = {}
+    for name, value in headers.items():
+        name = name.lower()
+        for key, header in RATE_LIMIT_HEADERS.items():
+            if name.endswith(header):
+                values[key] = str(value)
+
+    return values
+
+
+def _parse_int(value: str | None) -> int | None:
+    try:
+        return int(float(value)) if value is not None else None
+
+    except ValueError:
+        return None
\ No newline at end of file
@@ -1,12 +1,19 @@
 import os
 import asyncio
+import hashlib
+import time
 import psutil
 
-from litellm import acompletion
+import tiktoken
+from litellm import RateLimitError, acompletion
 
 from loguru import logger
 from tqdm.asyncio import tqdm
 
+from src.slack_integrations_offline.applications.agents.rate_limits import (
+    RateLimitScheduler,
+    parse_duration,
+)
 from src.slack_integrations_offline.domain.document import Document
 
 
@@ -14,12 +21,24 @@ class SummarizationAgent:
     """Agent for generating concise summaries of technical documentation using language models.
     
     Processes documents asynchronously with configurable concurrency limits 
-    and automatic retry logic for failed summarizations.
+    and automatic retry logic for failed summarizations. Requests are paced by a
+    `RateLimitScheduler` to the requests and tokens per minute of the provider, so they are
+    sent as fast as the account allows instead of sleeping after every completion.
+
+    Documents longer than `max_input_tokens` are split into sections of `section_tokens`,
+    summarized in parallel and reduced into a single summary; shorter ones are summarized in
+    a single call.
     
     Attributes:
         max_characters: Maximum character length for generated summaries.
         model_id: Identifier for the language model to use.
         max_concurrent_requests: Maximum number of concurrent API requests.
+        max_rate_limit_retries: Maximum number of retries of a request after a rate limit error.
+        max_input_tokens: Documents with more content tokens take the map-reduce path.
+        section_tokens: Maximum number of tokens of each section of the map-reduce path.
+        scheduler: Scheduler pacing the requests to the provider limits.
+        document_paths: Summarization path taken by each document, keyed by document ID.
+        latencies: Duration of each summarization attempt in seconds, keyed by path.
     """
     
     SYSTEM_PROMPT_TEMPLATE = """
@@ -55,15 +74,95 @@ class SummarizationAgent:
     Generate a concise TL;DR summary (maximum {characters} characters) following the guidelines provided.
     """
 
+    MAP_PROMPT_TEMPLATE = """
+    Please summarize section {index} of {count} of the document "{title}":
+
+    Section:
+    {content}
+
+    Generate a concise summary of this section only (maximum {characters} characters) following the guidelines provided.
+    It will be combined with the summaries of the other sections.
+    """
+
+    REDUCE_PROMPT_TEMPLATE = """
+    The document "{title}" was summarized section by section. Please combine the section summaries below:
+
+    Section summaries:
+    {content}
+
+    Generate a single concise TL;DR summary of the whole document (maximum {characters} characters) following the guidelines provided.
+    """
+
     def __init__(
         self,
         max_characters: int, 
         model_id: str = "gpt-4o-mini",
         max_concurrent_requests: int = 10,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 200_000,
+        max_rate_limit_retries: int = 5,
+        max_input_tokens: int = 12_000,
+        section_tokens: int = 4_000,
     ) -> None:
         self.max_characters = max_characters
         self.model_id = model_id
         self.max_concurrent_requests = max_concurrent_requests
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.max_input_tokens = max_input_tokens
+        self.section_tokens = section_tokens
+        self.document_paths: dict[str, str] = {}
+        self.latencies: dict[str, list[float]] = {"single": [], "map_reduce": []}
+        self.scheduler = RateLimitScheduler(
+            requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute
+        )
+
+        try:
+            self._encoding = tiktoken.encoding_for_model(model_id)
+        except KeyError:
+            self._encoding = tiktoken.get_encoding("cl100k_base")
+
+
+    @property
+    def prompt_version(self) -> str:
+        """Hash of the prompt templates and sectioning, changing whenever they are edited."""
+
+        templates = "".join(
+            [
+                self.SYSTEM_PROMPT_TEMPLATE,
+                self.USER_PROMPT_TEMPLATE,
+                self.MAP_PROMPT_TEMPLATE,
+                self.REDUCE_PROMPT_TEMPLATE,
+                f"{self.max_input_tokens}:{self.section_tokens}",
+            ]
+        )
+
+        return hashlib.sha256(templates.encode("utf-8")).hexdigest()[:16]
+
+
+    def stats(self) -> dict[str, dict[str, int | float]]:
+        """Summarize the paths taken by the documents and the latency of each path.
+
+        Returns:
+            dict[str, dict[str, int | float]]: Number of documents per path, and the count,
+                p50, p95 and max latencies in seconds of the attempts of each path.
+        """
+
+        path_counts = {path: 0 for path in self.latencies}
+        for path in self.document_paths.values():
+            path_counts[path] += 1
+
+        latency_seconds = {}
+        for path, latencies in self.latencies.items():
+            sorted_latencies = sorted(latencies)
+            latency_seconds[path] = {"attempts": len(sorted_latencies)}
+            if sorted_latencies:
+                latency_seconds[path].update(
+                    p50=round(_percentile(sorted_latencies, 0.50), 3),
+                    p95=round(_percentile(sorted_latencies, 0.95), 3),
+                    max=round(sorted_latencies[-1], 3),
+                )
+
+        return {"documents_per_path": path_counts, "latency_seconds": latency_seconds}
 
 
     def __call__(
@@ -102,9 +201,7 @@ class SummarizationAgent:
             f"Current process memory usage: {start_memory // (1024 * 1024)} MB"
         )
 
-        summarized_documents = await self.__process_batch(
-            documents, temperature, await_time_seconds=7
-        )
+        summarized_documents = await self.__process_batch(documents, temperature)
 
         documents_with_summaries = [
             doc for doc in summarized_documents if doc.summary is not None
@@ -116,12 +213,10 @@ class SummarizationAgent:
 
         if documents_without_summaries:
             logger.info(
-                f"Retrying {len(documents_without_summaries)} failed documents with increased await time..."
+                f"Retrying {len(documents_without_summaries)} failed documents..."
             )
 
-            retry_results = await self.__process_batch(
-                documents_without_summaries, temperature, await_time_seconds=20
-            )
+            retry_results = await self.__process_batch(documents_without_summaries, temperature)
             documents_with_summaries += retry_results
 
         end_memory = process.memory_info().rss
@@ -137,7 +232,10 @@ class SummarizationAgent:
         logger.info(
             f"Summarization completed: "
             f"{success_count}/{total_docs} succeeded ✓ | "
-            f"{failed_count}/{total_docs} failed ✗"
+            f"{failed_count}/{total_docs} failed ✗ | "
+            f"{sum(path == 'map_reduce' for path in self.document_paths.values())} map-reduced | "
+            f"{self.scheduler.throttle_count} rate limited | "
+            f"{self.scheduler.wait_seconds:.1f}s waiting for the rate limits"
         )
 
         return documents_with_summaries
@@ -148,14 +246,11 @@ class SummarizationAgent:
         self,
         documents: list[Document],
         temperature: float = 0.0,
-        await_time_seconds: int = 7,
     ) -> list[Document]:
         
         semaphore = asyncio.Semaphore(self.max_concurrent_requests)
         tasks = [
-            self.__summarize(
-                document=document, temperature=temperature, semaphore=semaphore, await_time_seconds=await_time_seconds
-            )
+            self.__summarize(document=document, temperature=temperature, semaphore=semaphore)
             for document in documents
         ]
 
@@ -179,46 +274,275 @@ class SummarizationAgent:
         document: Document,
         temperature: float = 0.0,
         semaphore: asyncio.Semaphore | None = None,
-        await_time_seconds: int = 7,
     ) -> Document:
-        
-        async def __process_documents():
-            try:
-                response = await acompletion(
-                    model = self.model_id,
-                    messages =[
-                        {
-                            "role": "system",
-                            "content": self.SYSTEM_PROMPT_TEMPLATE
-                        },
-                        {
-                            "role": "user",
-                            "content": self.USER_PROMPT_TEMPLATE.format(
-                                content=document.content, characters=self.max_characters
-                            )
-                        },
-                    ],
-                    stream = False,
-                    temperature = temperature,
+        """Summarize a document in a single call, or by sections if it is too long.
+
+        Args:
+            document: Document to summarize.
+            temperature: Sampling temperature for text generation.
+            semaphore: Semaphore limiting the concurrent requests, held per request.
+
+        Returns:
+            Document: The document, with its summary if it succeeded.
+        """
+
+        tokens = self._encoding.encode_ordinary(document.content)
+        path = "map_reduce" if len(tokens) > self.max_input_tokens else "single"
+        start_time = time.perf_counter()
+
+        if path == "single":
+            summary = await self.__complete(
+                self.USER_PROMPT_TEMPLATE.format(
+                    content=document.content, characters=self.max_characters
+                ),
+                document,
+                temperature,
+                semaphore,
+            )
+        else:
+            summary = await self.__map_reduce(document, tokens, temperature, semaphore)
+
+        self.document_paths[document.id] = path
+        self.latencies[path].append(time.perf_counter() - start_time)
+
+        if summary is None:
+            return document
+
+        return document.add_summary(summary)
+
+
+    async def __map_reduce(
+        self,
+        document: Document,
+        tokens: list[int],
+        temperature: float = 0.0,
+        semaphore: asyncio.Semaphore | None = None,
+    ) -> str | None:
+        """Summarize the sections of a long document in parallel, then merge their summaries.
+
+        Args:
+            document: Document to summarize.
+            tokens: Tokens of the document content.
+            temperature: Sampling temperature for text generation.
+            semaphore: Semaphore limiting the concurrent requests, held per request.
+
+        Returns:
+            str | None: Summary of the document, or None if a request failed.
+        """
+
+        sections = self.__split_sections(document.content, tokens)
+        logger.debug(f"Summarizing document {document.id} in {len(sections)} sections")
+
+        # Every section summary is a self-contained text the reduce step can combine
+        summaries = await asyncio.gather(
+            *[
+                self.__complete(
+                    self.MAP_PROMPT_TEMPLATE.format(
+                        index=index + 1,
+                        count=len(sections),
+                        title=document.metadata.title,
+                        content=section,
+                        characters=self.max_characters,
+                    ),
+                    document,
+                    temperature,
+                    semaphore,
                 )
+                for index, section in enumerate(sections)
+            ]
+        )
+        if any(summary is None for summary in summaries):
+            return None
 
-                await asyncio.sleep(await_time_seconds)
+        combined = "\n\n".join(
+            f"Section {index + 1}:\n{summary}" for index, summary in enumerate(summaries)
+        )
+
+        # Very long documents produce more section summaries than fit in a single reduce call
+        combined_tokens = self._encoding.encode_ordinary(combined)
+        if len(combined_tokens) > self.max_input_tokens and len(sections) > 1:
+            return await self.__map_reduce(
+                document.model_copy(update={"content": combined}),
+                combined_tokens,
+                temperature,
+                semaphore,
+            )
+
+        return await self.__complete(
+            self.REDUCE_PROMPT_TEMPLATE.format(
+                title=document.metadata.title, content=combined, characters=self.max_characters
+            ),
+            document,
+            temperature,
+            semaphore,
+        )
+
+
+    async def __complete(
+        self,
+        user_prompt: str,
+        document: Document,
+        temperature: float = 0.0,
+        semaphore: asyncio.Semaphore | None = None,
+    ) -> str | None:
+        """Send one completion request, paced by the rate limit scheduler.
+
+        Args:
+            user_prompt: User message of the request.
+            document: Document the request is for, for logging.
+            temperature: Sampling temperature for text generation.
+            semaphore: Semaphore limiting the concurrent requests.
+
+        Returns:
+            str | None: Generated text, or None if the request failed.
+        """
+
+        messages = [
+            {
+                "role": "system",
+                "content": self.SYSTEM_PROMPT_TEMPLATE
+            },
+            {
+                "role": "user",
+                "content": user_prompt
+            },
+        ]
+        estimated_tokens = self.__estimate_tokens(messages)
+
+        async def __process_request():
+            for attempt in range(self.max_rate_limit_retries + 1):
+                reserved_tokens = await self.scheduler.acquire(estimated_tokens)
+
+                try:
+                    response = await acompletion(
+                        model = self.model_id,
+                        messages = messages,
+                        stream = False,
+                        temperature = temperature,
+                    )
+
+                except RateLimitError as e:
+                    self.scheduler.throttle(_retry_after_seconds(e))
+                    logger.debug(
+                        f"Rate limited on document {document.id} "
+                        f"(attempt {attempt + 1}/{self.max_rate_limit_retries + 1})"
+                    )
+                    continue
+
+                except Exception as e:
+                    self.scheduler.release(reserved_tokens)
+                    logger.warning(f"Failed to summarize document {document.id}: {str(e)}")
+                    return None
+
+                usage = getattr(response, "usage", None)
+                self.scheduler.release(
+                    reserved_tokens,
+                    used_tokens=getattr(usage, "total_tokens", None),
+                    headers=getattr(response, "_hidden_params", {}).get("additional_headers"),
+                )
 
                 if not response.choices:
                     logger.warning(f"No summary generated for document {document.id}")
-                    return document
-                
-                summary: str = response.choices[0].message.content
+                    return None
+
+                return response.choices[0].message.content
+
+            logger.warning(f"Failed to summarize document {document.id}: rate limit retries exhausted")
+            return None
 
-                return document.add_summary(summary)
 
-            except Exception as e:
-                logger.warning(f"Failed to summarize document {document.id}: {str(e)}")
-                return document
-            
-        
         if semaphore:
             async with semaphore:
-                return await __process_documents()
-            
-        return await __process_documents()
\ No newline at end of file
+                return await __process_request()
+
+        return await __process_request()
+
+
+    def __split_sections(self, content: str, tokens: list[int]) -> list[str]:
+        """Split a long content into sections of at most `section_tokens` tokens.
+
+        Sections are packed from whole paragraphs and start at a markdown heading when the
+        current section is already half full. Paragraphs longer than a section are cut on
+        token boundaries.
+
+        Args:
+            content: Content to split.
+            tokens: Tokens of the content, to cut it evenly when it has no paragraphs.
+
+        Returns:
+            list[str]: Sections of the content, in order.
+        """
+
+        paragraphs = [paragraph for paragraph in content.split("\n\n") if paragraph.strip()]
+        if len(paragraphs) <= 1:
+            return [
+                self._encoding.decode(tokens[start : start + self.section_tokens])
+                for start in range(0, len(tokens), self.section_tokens)
+            ]
+
+        sections: list[str] = []
+        current: list[str] = []
+        current_tokens = 0
+
+        for paragraph in paragraphs:
+            paragraph_tokens = self._encoding.encode_ordinary(paragraph)
+
+            starts_new_section = current and (
+                current_tokens + len(paragraph_tokens) > self.section_tokens
+                or (paragraph.startswith("#") and current_tokens > self.section_tokens // 2)
+            )
+            if starts_new_section:
+                sections.append("\n\n".join(current))
+                current, current_tokens = [], 0
+
+            if len(paragraph_tokens) > self.section_tokens:
+                sections.extend(
+                    self._encoding.decode(paragraph_tokens[start : start + self.section_tokens])
+                    for start in range(0, len(paragraph_tokens), self.section_tokens)
+                )
+                continue
+
+            current.append(paragraph)
+            current_tokens += len(paragraph_tokens)
+
+        if current:
+            sections.append("\n\n".join(current))
+
+        return sections
+
+
+    def __estimate_tokens(self, messages: list[dict[str, str]]) -> int:
+        """Estimate the tokens a request counts against the tokens per minute limit.
+
+        Args:
+            messages: Chat messages of the request.
+
+        Returns:
+            int: Prompt tokens plus the longest expected summary.
+        """
+
+        # A few tokens of chat formatting per message, and about 3 characters per summary token
+        prompt_tokens = sum(
+            len(self._encoding.encode_ordinary(message["content"])) + 4 for message in messages
+        )
+
+        return prompt_tokens + self.max_characters // 3
+
+
+def _retry_after_seconds(error: Exception) -> float | None:
+    """Read the `Retry-After` delay of a rate limit error, if the provider sent one."""
+
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+
+    if headers.get("retry-after-ms"):
+        return parse_duration(f"{headers['retry-after-ms']}ms")
+
+    return parse_duration(headers.get("retry-after"))
+
+
+def _percentile(sorted_values: list[float], quantile: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+
+    index = max(0, min(len(sorted_values) - 1, round(quantile * len(sorted_values)) - 1))
+    return sorted_values[index]
\ No newline at end of file
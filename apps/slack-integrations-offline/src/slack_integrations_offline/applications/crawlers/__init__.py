@@ -1,3 +1,21 @@
+from .browser_pool import BrowserPool
 from .crawl4ai import Crawl4AICrawler
+from .frontier import BloomFilter, CrawlFrontier, UrlScope, normalize_url
+from .incremental import IncrementalCrawlTracker
+from .rate_limiter import AdaptiveRateLimiter, SharedRateLimit
+from .sharded import ShardedCrawler
+from .sitemap import SitemapCollector
 
-__all__ = ["Crawl4AICrawler"]
\ No newline at end of file
+__all__ = [
+    "AdaptiveRateLimiter",
+    "BloomFilter",
+    "BrowserPool",
+    "Crawl4AICrawler",
+    "CrawlFrontier",
+    "IncrementalCrawlTracker",
+    "ShardedCrawler",
+    "SharedRateLimit",
+    "SitemapCollector",
+    "UrlScope",
+    "normalize_url",
+]
\ No newline at end of file
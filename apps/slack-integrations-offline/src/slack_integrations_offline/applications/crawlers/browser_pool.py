@@ -0,0 +1,110 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from crawl4ai import AsyncWebCrawler
+from loguru import logger
+
+
+class _PooledBrowser:
+    """Browser of the pool with its usage counters."""
+
+    def __init__(self, crawler: AsyncWebCrawler) -> None:
+        self.crawler = crawler
+        self.page_count = 0
+        self.in_flight = 0
+        self.retired = False
+
+
+class BrowserPool:
+    """Headless browsers shared by the crawl workers and recycled after a number of pages.
+
+    Browsers are started on first use, up to `size` of them, and each page goes to the least
+    busy one. Long-lived Chromium processes grow in memory, so a browser that served
+    `pages_per_browser` pages stops taking new pages and is closed once its last page
+    completes; a fresh one is started when needed.
+
+    Attributes:
+        size: Maximum number of browsers running at once.
+        pages_per_browser: Number of pages after which a browser is recycled.
+        browser_kwargs: Keyword arguments of `AsyncWebCrawler`.
+        started_count: Number of browsers started.
+        recycled_count: Number of browsers closed after reaching `pages_per_browser`.
+    """
+
+    def __init__(self, size: int = 1, pages_per_browser: int = 500, **browser_kwargs) -> None:
+        self.size = size
+        self.pages_per_browser = pages_per_browser
+        self.browser_kwargs = browser_kwargs
+
+        self.started_count = 0
+        self.recycled_count = 0
+
+        self._browsers: list[_PooledBrowser] = []
+        self._lock = asyncio.Lock()
+
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[AsyncWebCrawler]:
+        """Borrow a browser for crawling one page.
+
+        Yields:
+            AsyncWebCrawler: Started browser.
+        """
+
+        async with self._lock:
+            browser = await self.__select()
+            browser.in_flight += 1
+            browser.page_count += 1
+            if browser.page_count >= self.pages_per_browser:
+                browser.retired = True
+
+        try:
+            yield browser.crawler
+
+        finally:
+            browser.in_flight -= 1
+            if browser.retired and browser.in_flight == 0 and browser in self._browsers:
+                self._browsers.remove(browser)
+                self.recycled_count += 1
+                logger.debug(f"Recycling browser after {browser.page_count} pages")
+                await self.__close_browser(browser)
+
+
+    async def close(self) -> None:
+        """Close every running browser."""
+
+        browsers, self._browsers = self._browsers, []
+        for browser in browsers:
+            await self.__close_browser(browser)
+
+
+    async def __select(self) -> _PooledBrowser:
+        """Pick the least busy browser, starting a new one while the pool is not full.
+
+        Returns:
+            _PooledBrowser: Browser the next page is sent to.
+        """
+
+        active = [browser for browser in self._browsers if not browser.retired]
+        idlest = min(active, key=lambda browser: browser.in_flight, default=None)
+
+        # Retired browsers finishing their last pages are replaced right away
+        if idlest is None or (idlest.in_flight > 0 and len(active) < self.size):
+            crawler = AsyncWebCrawler(**self.browser_kwargs)
+            await crawler.__aenter__()
+
+            idlest = _PooledBrowser(crawler)
+            self._browsers.append(idlest)
+            self.started_count += 1
+            logger.debug(f"Started browser {self.started_count} ({len(self._browsers)} running)")
+
+        return idlest
+
+
+    async def __close_browser(self, browser: _PooledBrowser) -> None:
+        try:
+            await browser.crawler.__aexit__(None, None, None)
+
+        except Exception as e:
+            logger.warning(f"Failed to close browser: {e}")
\ No newline at end of file
@@ -1,31 +1,132 @@
 import asyncio
-import os
-import psutil
+import random
+import time
+from datetime import datetime, timezone
 from loguru import logger
-from typing import List
+from typing import AsyncGenerator, Iterator
 
+import httpx
 from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
 from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
 
+from src.slack_integrations_offline.applications.crawlers.browser_pool import BrowserPool
+from src.slack_integrations_offline.applications.crawlers.frontier import (
+    CrawlFrontier,
+    normalize_url,
+)
+from src.slack_integrations_offline.applications.crawlers.http_fetcher import (
+    MARKDOWN_OPTIONS,
+    HttpPageFetcher,
+)
+from src.slack_integrations_offline.applications.crawlers.rate_limiter import AdaptiveRateLimiter
 from src.slack_integrations_offline.domain.document import Document, DocumentMetadata
-from src.slack_integrations_offline.utils import generate_random_hex
+from src.slack_integrations_offline.infrastructure.storage import CrawlFailure
+from src.slack_integrations_offline.utils import generate_document_id
 
 
+# Upper bounds in seconds of the page latency histogram buckets
+LATENCY_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+
+# Browser errors that will not go away by retrying
+PERMANENT_ERROR_PATTERNS = (
+    "err_name_not_resolved",
+    "err_cert",
+    "err_ssl",
+    "err_invalid_url",
+    "err_unknown_url_scheme",
+    "err_too_many_redirects",
+    "err_blocked_by",
+)
+
 
 class Crawl4AICrawler:
     """A crawler implementation using crawl4ai library for concurrent web crawling.
 
+    With the fast path enabled, each page is first fetched with a pooled HTTP client and
+    converted to markdown directly; only pages that are not static HTML or that need
+    JavaScript are rendered by a pool of headless browsers, started on first use.
+
+    The run configuration and markdown generator are built once and shared by every page.
+
     Attributes:
         max_concurrent_requests: Maximum number of concurrent HTTP requests allowed.
+        rate_limiter: Per-host adaptive rate limiter pacing the requests.
+        success_count: Number of pages crawled successfully by the last crawl.
+        failed_count: Number of pages that failed during the last crawl.
+        respect_crawl_delay: Whether to cap each host's rate to its `robots.txt` crawl delay.
+        validators: `etag` and `last_modified` response headers of the crawled pages, keyed by URL,
+            used to issue conditional requests on the next crawl.
+        page_timeout: Deadline in seconds for a single attempt at crawling a page.
+        max_retries: Maximum number of retries of a page after a transient failure.
+        retry_base_delay: Base delay in seconds of the jittered exponential backoff between retries.
+        max_retry_delay: Upper bound in seconds of the delay between retries.
+        failures: Failures of the last crawl, keyed by URL.
+        timeout_count: Number of attempts that hit the page timeout during the last crawl.
+        retry_count: Number of retries made during the last crawl.
+        latencies: Duration in seconds of every attempt made during the last crawl.
+        fast_path: Whether to try fetching pages over plain HTTP before using the browser.
+        http_fetcher: Fetcher used by the fast path.
+        http_page_count: Number of pages served by the fast path during the last crawl.
+        browser_page_count: Number of pages rendered by the browser during the last crawl.
+        browser_fallbacks: Number of pages the fast path handed to the browser, keyed by reason.
+        browser_pool_size: Maximum number of browsers running at once.
+        pages_per_browser: Number of pages after which a browser is recycled.
+        markdown_generator: Markdown generator shared by every page.
+        run_config: Crawl configuration shared by every page.
+        browsers_started: Number of browsers started during the last crawl.
+        browsers_recycled: Number of browsers recycled during the last crawl.
     """
 
-    def __init__(self, max_concurrent_requests:int = 10) -> None:
+    def __init__(
+        self,
+        max_concurrent_requests:int = 10,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        respect_crawl_delay: bool = True,
+        page_timeout: float = 60.0,
+        max_retries: int = 3,
+        retry_base_delay: float = 1.0,
+        max_retry_delay: float = 30.0,
+        fast_path: bool = True,
+        http_fetcher: HttpPageFetcher | None = None,
+        browser_pool_size: int = 1,
+        pages_per_browser: int = 500,
+    ) -> None:
         
         self.max_concurrent_requests = max_concurrent_requests
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.respect_crawl_delay = respect_crawl_delay
+        self.page_timeout = page_timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.max_retry_delay = max_retry_delay
+        self.validators: dict[str, dict[str, str]] = {}
+        self.success_count = 0
+        self.failed_count = 0
+        self.failures: dict[str, CrawlFailure] = {}
+        self.timeout_count = 0
+        self.retry_count = 0
+        self.latencies: list[float] = []
+        self.fast_path = fast_path
+        self.http_fetcher = http_fetcher or HttpPageFetcher()
+        self.http_page_count = 0
+        self.browser_page_count = 0
+        self.browser_fallbacks: dict[str, int] = {}
+        self.browser_pool_size = browser_pool_size
+        self.pages_per_browser = pages_per_browser
+        self.browsers_started = 0
+        self.browsers_recycled = 0
+
+        self.markdown_generator = DefaultMarkdownGenerator(options=MARKDOWN_OPTIONS)
+        self.run_config = CrawlerRunConfig(
+            markdown_generator=self.markdown_generator,
+            page_timeout=int(self.page_timeout * 1000),
+        )
 
 
     def __call__(self, urls: list[str]) -> list[Document]:
         """Crawl multiple URLs and extract their content as Document objects.
+
+        Collects every document in memory; use `stream` to process them as they complete.
     
         Args:
             urls: List of URLs to crawl.
@@ -44,8 +145,166 @@ class Crawl4AICrawler:
             return loop.run_until_complete(self.__crawl_batch(urls))
 
 
+    async def stream(
+        self, urls: list[str], frontier: CrawlFrontier | None = None
+    ) -> AsyncGenerator[Document, None]:
+        """Crawl URLs concurrently and yield documents as soon as each page completes.
+
+        A fixed pool of `max_concurrent_requests` workers pulls URLs and pushes documents
+        into a queue of the same size. When the consumer falls behind, workers wait, so the
+        number of documents held in memory is bounded by the concurrency, not by the site size.
+
+        With a frontier, the URLs seed it and the links of every crawled page are scheduled
+        through it, within its scope and budgets, until no new URL is found.
+    
+        Args:
+            urls: List of URLs to crawl.
+            frontier: Frontier scheduling the links of the crawled pages. Defaults to None,
+                which only crawls `urls`.
+        
+        Yields:
+            Document: Successfully crawled documents, in completion order.
+        """
+
+        logger.debug(f"Starting crawl of {len(urls)} URLs with {self.max_concurrent_requests} workers")
+
+        if self.respect_crawl_delay:
+            await self.rate_limiter.apply_crawl_delays(urls)
+
+        self._reset_counters()
+
+        if frontier is not None:
+            frontier.seed(urls)
+
+        pending_urls = iter(urls)
+        results: asyncio.Queue[Document | None] = asyncio.Queue(maxsize=self.max_concurrent_requests)
+
+        limits = httpx.Limits(
+            max_connections=self.max_concurrent_requests,
+            max_keepalive_connections=self.max_concurrent_requests,
+        )
+
+        # Browsers are bound to the event loop, so the pool lives as long as the stream
+        browser_pool = BrowserPool(
+            size=self.browser_pool_size,
+            pages_per_browser=self.pages_per_browser,
+            cache_mode=CacheMode.BYPASS,
+        )
+
+        async with httpx.AsyncClient(
+            follow_redirects=True, timeout=self.page_timeout, limits=limits
+        ) as client:
+            workers = asyncio.create_task(
+                self.__run_workers(frontier or pending_urls, client, browser_pool, results)
+            )
+
+            try:
+                while (document := await results.get()) is not None:
+                    yield document
+
+                # Surface worker errors once the queue is drained
+                await workers
+
+            finally:
+                workers.cancel()
+                await browser_pool.close()
+                self.browsers_started = browser_pool.started_count
+                self.browsers_recycled = browser_pool.recycled_count
+
+        total_count = self.success_count + self.failed_count
+
+        logger.info(
+            f"Crawling completed: "
+            f"{self.success_count}/{total_count} succeeded ✓ | "
+            f"{self.failed_count}/{total_count} failed ✗ | "
+            f"{self.timeout_count} timeouts | {self.retry_count} retries"
+        )
+        logger.info(
+            f"Fetch tiers: {self.http_page_count} pages over HTTP | "
+            f"{self.browser_page_count} pages rendered by {self.browsers_started} browser(s), "
+            f"{self.browsers_recycled} recycled"
+        )
+
+        for host, effective_rate in self.rate_limiter.effective_rates().items():
+            logger.info(
+                f"Effective request rate for {host}: {effective_rate:.2f} requests/s "
+                f"(limiter settled at {self.rate_limiter.hosts[host].rate:.2f} requests/s)"
+            )
+
+
+    def rate_summary(self) -> dict[str, dict[str, float] | int]:
+        """Summarize the request rates of the last crawl.
+
+        Returns:
+            dict[str, dict[str, float] | int]: Effective and final request rates keyed by host,
+                and the number of throttling responses received.
+        """
+
+        return {
+            "effective_requests_per_second": self.rate_limiter.effective_rates(),
+            "final_requests_per_second": self.rate_limiter.current_rates(),
+            "throttled_responses": sum(
+                host_limiter.throttle_count for host_limiter in self.rate_limiter.hosts.values()
+            ),
+        }
+
+
+    def latency_histogram(self) -> dict[str, int | float]:
+        """Summarize the latencies of the last crawl's attempts.
+
+        Returns:
+            dict[str, int | float]: Attempt count per latency bucket, keyed by the bucket's
+                upper bound, along with the p50, p95 and max latencies in seconds.
+        """
+
+        histogram: dict[str, int | float] = {f"le_{bound}s": 0 for bound in LATENCY_BUCKETS}
+        histogram[f"gt_{LATENCY_BUCKETS[-1]}s"] = 0
+
+        for latency in self.latencies:
+            bound = next((bound for bound in LATENCY_BUCKETS if latency <= bound), None)
+            histogram[f"le_{bound}s" if bound is not None else f"gt_{LATENCY_BUCKETS[-1]}s"] += 1
+
+        sorted_latencies = sorted(self.latencies)
+        if sorted_latencies:
+            histogram["p50_s"] = round(_percentile(sorted_latencies, 0.50), 3)
+            histogram["p95_s"] = round(_percentile(sorted_latencies, 0.95), 3)
+            histogram["max_s"] = round(sorted_latencies[-1], 3)
+
+        return histogram
+
+
+    def failure_reasons(self) -> dict[str, int]:
+        """Count the failures of the last crawl by reason.
+
+        Returns:
+            dict[str, int]: Number of failed URLs keyed by failure reason.
+        """
+
+        reasons: dict[str, int] = {}
+        for failure in self.failures.values():
+            reasons[failure.reason] = reasons.get(failure.reason, 0) + 1
+
+        return reasons
+
+
+    def _reset_counters(self) -> None:
+        """Reset the statistics of the previous crawl."""
+
+        self.success_count = 0
+        self.failed_count = 0
+        self.failures = {}
+        self.timeout_count = 0
+        self.retry_count = 0
+        self.latencies = []
+        self.http_page_count = 0
+        self.browser_page_count = 0
+        self.browser_fallbacks = {}
+        self.browsers_started = 0
+        self.browsers_recycled = 0
+
+
     async def __crawl_batch(self, urls:list[str]) -> list[Document]:
-        """Process a batch of URLs concurrently with semaphore-controlled crawling.
+        """Crawl a batch of URLs and collect the documents.
     
         Args:
             urls: List of URLs to crawl in batch.
@@ -54,116 +313,369 @@ class Crawl4AICrawler:
             list[Document]: List of successfully crawled documents, excluding failed attempts.
         """
 
-        process = psutil.Process(os.getpid())
-        start_memory = process.memory_info().rss
+        return [document async for document in self.stream(urls)]
 
-        logger.debug(
-            f"Starting crawl batch with {self.max_concurrent_requests} concurrent requests. "
-            f"Current process memory usage: {start_memory // (1024 * 1024)} MB"
-        )
 
+    async def __run_workers(
+        self,
+        pending_urls: Iterator[str] | CrawlFrontier,
+        client: httpx.AsyncClient,
+        browser_pool: BrowserPool,
+        results: asyncio.Queue,
+    ) -> None:
+        """Run the crawl workers, then signal the end of the stream with a None sentinel.
+    
+        Args:
+            pending_urls: Iterator of URLs or frontier shared by the workers.
+            client: Pooled HTTP client used by the fast path.
+            browser_pool: Browsers rendering the pages the fast path cannot handle.
+            results: Queue receiving the crawled documents.
+        """
 
-        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
-        final_results = []
+        async def next_url() -> tuple[str, int] | None:
+            if isinstance(pending_urls, CrawlFrontier):
+                return await pending_urls.get()
+
+            # Workers share the iterator; each `next` runs without yielding to the event loop
+            url = next(pending_urls, None)
+            return (url, 0) if url is not None else None
+
+        async def worker() -> None:
+            while (pending := await next_url()) is not None:
+                url, depth = pending
+                try:
+                    document = None
+                    if self.fast_path:
+                        document = await self.__fetch_static(url, client)
+
+                    # Permanent HTTP errors of the fast path are recorded and not rendered again
+                    if document is None and url not in self.failures:
+                        async with browser_pool.page() as crawler:
+                            document = await self.__crawl_url(url, crawler)
+
+                # One bad page must not take down the worker and the rest of the crawl
+                except Exception as e:
+                    logger.exception(f"Unexpected error while crawling {url}")
+                    self.__record_failure(url, reason="error", error=str(e), transient=False, attempts=1)
+                    document = None
+
+                if isinstance(pending_urls, CrawlFrontier):
+                    await pending_urls.task_done(depth, document.child_urls if document else [])
+
+                if document is None:
+                    self.failed_count += 1
+                else:
+                    self.success_count += 1
+                    await results.put(document)
 
-        async with AsyncWebCrawler(cache_mode = CacheMode.BYPASS) as crawler:
-            tasks = [
-                self.__crawl_url(url, crawler, semaphore)
-                for url in urls
-            ]
-            results = await asyncio.gather(*tasks)
-            final_results.extend(results)
-            
+        try:
+            await asyncio.gather(*[worker() for _ in range(self.max_concurrent_requests)])
 
-        end_memory = process.memory_info().rss
-        crawling_memory_diff = end_memory - start_memory
+        finally:
+            await results.put(None)
 
-        logger.debug(
-            f"Crawl batch completed. "
-            f"Final process memory usage: {end_memory // (1024 * 1024)} MB, "
-            f"Crawling memory diff: {crawling_memory_diff // (1024 * 1024)} MB"
-        )
 
-        successful_results = [result for result in final_results if result is not None]
+    async def __fetch_static(self, url: str, client: httpx.AsyncClient) -> Document | None:
+        """Fetch a page over plain HTTP and build its Document if it renders without JavaScript.
+    
+        Args:
+            url: URL to fetch.
+            client: Pooled HTTP client used for the request.
         
-        success_count = len(successful_results)
-        failed_count = len(final_results) - success_count
-        total_count = len(final_results)
+        Returns:
+            Document | None: Document built from the static HTML, or None if the page must be
+                rendered by the browser or failed permanently, in which case it is recorded
+                in `failures`.
+        """
 
-        logger.info(
-            f"Crawling completed: "
-            f"{success_count}/{total_count} succeeded ✓ | "
-            f"{failed_count}/{total_count} failed ✗"
+        await self.rate_limiter.acquire(url)
+
+        start_time = time.perf_counter()
+        try:
+            page = await asyncio.wait_for(
+                self.http_fetcher.fetch(url, client), timeout=self.page_timeout
+            )
+
+        # Failures are not final here, the browser tier retries the page
+        except (httpx.HTTPError, asyncio.TimeoutError) as e:
+            self.rate_limiter.record(url, status_code=None, latency=time.perf_counter() - start_time)
+            logger.debug(f"HTTP fetch of {url} failed, falling back to the browser: {e!r}")
+            self.__count_fallback("request_error")
+            return None
+
+        latency = time.perf_counter() - start_time
+        self.rate_limiter.record(
+            url,
+            status_code=page.status_code,
+            latency=latency,
+            retry_after=page.headers.get("retry-after"),
+        )
+
+        if page.failed:
+            reason, transient = _classify_failure(page.status_code, None)
+            logger.warning(f"Failed to crawl {url}: {reason}")
+            self.__record_failure(
+                url,
+                reason=reason,
+                error=f"HTTP {page.status_code}",
+                status_code=page.status_code,
+                transient=transient,
+                attempts=1,
+            )
+            return None
+
+        if page.needs_browser or page.markdown is None:
+            logger.debug(f"{url} needs the browser: {page.reason}")
+            self.__count_fallback(page.reason or "unknown")
+            return None
+
+        self.latencies.append(latency)
+        self.http_page_count += 1
+
+        return self.__make_document(
+            url,
+            content=page.markdown,
+            title=page.title,
+            properties=dict(page.metadata),
+            child_links=page.links,
+            response_headers=page.headers,
         )
 
-        return successful_results
+
+    def __count_fallback(self, reason: str) -> None:
+        self.browser_fallbacks[reason] = self.browser_fallbacks.get(reason, 0) + 1
 
 
     async def __crawl_url(
         self, 
         url:str,
         crawler:AsyncWebCrawler,
-        semaphore: asyncio.Semaphore,
     ) -> Document | None:
-        """Crawl a single URL and extract its content as a Document.
+        """Crawl a single URL, retrying transient failures with jittered exponential backoff.
     
         Args:
             url: URL to crawl.
             crawler: AsyncWebCrawler instance for performing the crawl operation.
-            semaphore: Semaphore for controlling concurrent request limits.
         
         Returns:
             Document | None: Document object with extracted content, or None if crawling failed.
         """
         
-        md_generator = DefaultMarkdownGenerator(
-            options={
-                "ignore_links": True,
-                "escape_html": False,
-                "ignore_images": True,
-            }
-        )
+        for attempt in range(1, self.max_retries + 2):
+            await self.rate_limiter.acquire(url)
+
+            start_time = time.perf_counter()
+            try:
+                # The browser's own page timeout does not cover every stage of a crawl
+                result = await asyncio.wait_for(
+                    crawler.arun(url=url, config=self.run_config), timeout=self.page_timeout
+                )
+
+            except asyncio.TimeoutError:
+                latency = time.perf_counter() - start_time
+                self.timeout_count += 1
+                self.rate_limiter.record(url, status_code=None, latency=latency)
+                reason, error, status_code, transient = (
+                    "timeout", f"No response within {self.page_timeout}s", None, True
+                )
+
+            except Exception as e:
+                latency = time.perf_counter() - start_time
+                self.rate_limiter.record(url, status_code=None, latency=latency)
+                status_code, error = None, f"{type(e).__name__}: {e}"
+                reason, transient = _classify_failure(status_code, error)
 
-        config = CrawlerRunConfig(
-            markdown_generator=md_generator
+            else:
+                latency = time.perf_counter() - start_time
+                response_headers = {
+                    key.lower(): value
+                    for key, value in ((result.response_headers if result else None) or {}).items()
+                }
+                status_code = result.status_code if result else None
+                self.rate_limiter.record(
+                    url,
+                    status_code=status_code,
+                    latency=latency,
+                    retry_after=response_headers.get("retry-after"),
+                )
+
+                if result and result.success and result.markdown is not None:
+                    self.latencies.append(latency)
+                    self.browser_page_count += 1
+                    return self.__build_document(url, result, response_headers)
+
+                error = result.error_message if result else "Empty crawl result"
+                reason, transient = _classify_failure(
+                    status_code, error, empty_content=bool(result and result.success)
+                )
+
+            self.latencies.append(latency)
+
+            if not transient or attempt > self.max_retries:
+                break
+
+            # Full jitter spreads the retries of concurrent workers hitting the same host
+            delay = random.uniform(
+                0, min(self.max_retry_delay, self.retry_base_delay * 2 ** (attempt - 1))
+            )
+            logger.debug(f"Retrying {url} in {delay:.2f}s after {reason} (attempt {attempt})")
+            self.retry_count += 1
+            await asyncio.sleep(delay)
+
+        logger.warning(f"Failed to crawl {url} after {attempt} attempt(s): {reason}")
+        self.__record_failure(
+            url,
+            reason=reason,
+            error=error,
+            status_code=status_code,
+            transient=transient,
+            attempts=attempt,
         )
 
-        async with semaphore:
-            result = await crawler.arun(url=url, config=config)
-            await asyncio.sleep(0.5)
+        return None
+
+
+    def __build_document(self, url: str, result, response_headers: dict[str, str]) -> Document:
+        """Build a Document from a successful crawl result.
+    
+        Args:
+            url: Crawled URL.
+            result: Successful crawl4ai result.
+            response_headers: Response headers with lowercased names.
+        
+        Returns:
+            Document: Document object with extracted content.
+        """
+
+        links = result.links or {}
+        child_links = [
+            link["href"]
+            for link in links.get("internal", []) + links.get("external", [])
+            if link.get("href")
+        ]
 
-            if not result or not result.success:
-                logger.warning(f"Failed to crawl {url}")
+        if result.metadata:
+            title = result.metadata.pop("title", "") or ""
+        else:
+            title = ""
+
+        return self.__make_document(
+            url,
+            content=str(result.markdown),
+            title=title,
+            properties=result.metadata or {},
+            child_links=child_links,
+            response_headers=response_headers,
+        )
 
-            if result.markdown is None:
-                logger.warning(f"Failed to crawl {url}")
 
-            
-            child_links = [
-                link["href"]
-                for link in result.links["internal"] + result.links["external"]
-            ]
-            child_links_count = len(child_links)
+    def __make_document(
+        self,
+        url: str,
+        content: str,
+        title: str,
+        properties: dict,
+        child_links: list[str],
+        response_headers: dict[str, str],
+    ) -> Document:
+        """Build a Document and remember the cache validators of its page.
+    
+        Args:
+            url: Crawled URL.
+            content: Markdown content of the page.
+            title: Title of the page.
+            properties: Page metadata.
+            child_links: URLs linked from the page.
+            response_headers: Response headers with lowercased names.
+        
+        Returns:
+            Document: Document object with extracted content.
+        """
 
-            logger.info(f"No. of child urls {child_links_count}")
+        # Links are stored canonical and deduplicated, without fragments or tracking parameters
+        child_links = list(
+            dict.fromkeys(
+                normalized_link
+                for link in child_links
+                if (normalized_link := normalize_url(link, base_url=url)) is not None
+            )
+        )
 
-            if result.metadata:
-                title = result.metadata.pop("title", "") or ""
-            else:
-                title = ""
+        self.validators[url] = {
+            name: response_headers[header]
+            for name, header in (("etag", "etag"), ("last_modified", "last-modified"))
+            if header in response_headers
+        }
+
+        logger.info(f"No. of child urls {len(child_links)}")
 
-            document_id = generate_random_hex(length=32)
+        # Derived from the canonical URL, so every crawl of a page yields the same document ID
+        document_id = generate_document_id(normalize_url(url) or url)
 
-            return Document(
+        return Document(
+            id = document_id,
+            metadata = DocumentMetadata(
                 id = document_id,
-                metadata = DocumentMetadata(
-                    id = document_id,
-                    url = url,
-                    title = title,
-                    properties = result.metadata or {},
-                ),
-                content = str(result.markdown),
-                child_urls= child_links,
-            )
+                url = url,
+                title = title,
+                properties = properties,
+            ),
+            content = content,
+            child_urls= child_links,
+        )
+
+
+    def __record_failure(
+        self,
+        url: str,
+        reason: str,
+        error: str | None,
+        transient: bool,
+        attempts: int,
+        status_code: int | None = None,
+    ) -> None:
+        self.failures[url] = CrawlFailure(
+            url=url,
+            reason=reason,
+            error=error,
+            status_code=status_code,
+            attempts=attempts,
+            transient=transient,
+            failed_at=datetime.now(timezone.utc),
+        )
+
+
+def _classify_failure(
+    status_code: int | None, error: str | None, empty_content: bool = False
+) -> tuple[str, bool]:
+    """Classify a failed crawl attempt.
+
+    Args:
+        status_code: HTTP status code of the response, None if no response was received.
+        error: Error message reported by the crawler, if any.
+        empty_content: Whether the crawl succeeded but produced no content.
+
+    Returns:
+        tuple[str, bool]: Failure reason and whether the failure is transient.
+    """
+
+    if empty_content:
+        return "no_content", False
+
+    if status_code is not None and status_code >= 400:
+        transient = status_code in (408, 425, 429) or status_code >= 500
+        return f"http_{status_code}", transient
+
+    normalized_error = (error or "").lower()
+    if any(pattern in normalized_error for pattern in PERMANENT_ERROR_PATTERNS):
+        return "browser_error", False
+
+    # Connection resets, navigation timeouts and crashed pages are worth another attempt
+    return "error", True
+
+
+def _percentile(sorted_values: list[float], quantile: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
 
-            
\ No newline at end of file
+    index = max(0, min(len(sorted_values) - 1, round(quantile * len(sorted_values)) - 1))
+    return sorted_values[index]
@@ -0,0 +1,360 @@
+import asyncio
+import hashlib
+import math
+import re
+from collections import deque
+from typing import Iterable
+from urllib.parse import parse_qsl, quote, urlencode, urljoin, urlsplit, urlunsplit
+
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMETER_PATTERN = re.compile(r"^(utm_\w+|gclid|fbclid|msclkid|mc_cid|mc_eid|ref_src)$")
+
+PERCENT_ESCAPE_PATTERN = re.compile(r"%[0-9a-fA-F]{2}")
+
+
+def normalize_url(url: str, base_url: str | None = None) -> str | None:
+    """Canonicalize a URL so that equivalent spellings compare equal.
+
+    Resolves the URL against `base_url`, lowercases the scheme and host, drops default ports,
+    credentials, fragments and tracking parameters, removes dot segments, sorts the query and
+    normalizes percent-encoding.
+
+    Args:
+        url: URL to normalize, possibly relative.
+        base_url: URL of the page the link was found on. Defaults to None.
+
+    Returns:
+        str | None: Canonical URL, or None if it is not a valid http(s) URL.
+    """
+
+    url = url.strip()
+    if base_url is not None:
+        url = urljoin(base_url, url)
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    host = parts.hostname.lower().rstrip(".")
+    netloc = host if port is None or port == DEFAULT_PORTS[scheme] else f"{host}:{port}"
+
+    path = _quote(_remove_dot_segments(parts.path or "/"))
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not TRACKING_PARAMETER_PATTERN.match(key)
+        )
+    )
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+class UrlScope:
+    """Hosts and path prefixes a frontier crawl is allowed to visit.
+
+    Attributes:
+        hosts: Allowed hosts, including the port if it is not the default one.
+        path_prefixes: Allowed path prefixes, "/" to allow the whole host. A prefix matches
+            whole path segments: "/docs" allows "/docs" and "/docs/guide", not "/docs-old".
+    """
+
+    def __init__(self, hosts: Iterable[str], path_prefixes: Iterable[str] = ("/",)) -> None:
+        self.hosts = {host.lower() for host in hosts}
+        self.path_prefixes = tuple(path_prefixes)
+
+
+    @classmethod
+    def from_prefixes(cls, url_prefixes: Iterable[str]) -> "UrlScope":
+        """Build a scope restricted to the hosts and paths of URL prefixes.
+
+        Args:
+            url_prefixes: URL prefixes, such as "https://docs.zenml.io/user-guide".
+
+        Returns:
+            UrlScope: Scope allowing the URLs starting with one of the prefixes.
+        """
+
+        hosts, path_prefixes = set(), []
+        for url_prefix in url_prefixes:
+            normalized = normalize_url(url_prefix)
+            if normalized is None:
+                raise ValueError(f"Invalid URL prefix '{url_prefix}'")
+
+            parts = urlsplit(normalized)
+            hosts.add(parts.netloc)
+            path_prefixes.append(parts.path)
+
+        return cls(hosts, path_prefixes)
+
+
+    def __contains__(self, url: str) -> bool:
+        parts = urlsplit(url)
+
+        return parts.netloc in self.hosts and any(
+            _is_path_within(parts.path, path_prefix) for path_prefix in self.path_prefixes
+        )
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set of strings.
+
+    Membership tests may return false positives at roughly `error_rate` once `capacity`
+    items were added, but never false negatives. Ten million URLs at a one in a million
+    error rate fit in about 36 MB, against several GB for a set of strings.
+
+    Attributes:
+        capacity: Number of items the filter is sized for.
+        error_rate: Target false positive rate at full capacity.
+        num_bits: Size of the bit array.
+        num_hashes: Number of bit positions set per item.
+        count: Number of distinct items added.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 1e-6) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+
+    def add(self, item: str) -> bool:
+        """Add an item to the filter.
+
+        Args:
+            item: Item to add.
+
+        Returns:
+            bool: True if the item was not in the filter yet.
+        """
+
+        is_new = False
+        for position in self.__positions(item):
+            byte_index, mask = position >> 3, 1 << (position & 7)
+            if not self._bits[byte_index] & mask:
+                self._bits[byte_index] |= mask
+                is_new = True
+
+        if is_new:
+            self.count += 1
+
+        return is_new
+
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7)) for position in self.__positions(item)
+        )
+
+
+    def __len__(self) -> int:
+        return self.count
+
+
+    def __positions(self, item: str) -> Iterable[int]:
+        # Double hashing derives every position from a single 128-bit digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first_hash = int.from_bytes(digest[:8], "little")
+        second_hash = int.from_bytes(digest[8:], "little") | 1
+
+        return ((first_hash + i * second_hash) % self.num_bits for i in range(self.num_hashes))
+
+
+class CrawlFrontier:
+    """Queue of URLs to crawl, fed by the links of the crawled pages.
+
+    URLs are normalized, kept within the scope, limited by link depth and by a page budget,
+    and deduplicated with a Bloom filter. Crawl workers take URLs with `get` and report the
+    links of each page with `task_done`; `get` returns None once the queue is empty and no
+    page is being crawled anymore.
+
+    Attributes:
+        scope: Hosts and paths the crawl may visit, None to allow any URL.
+        max_depth: Maximum number of links followed from a seed URL.
+        max_pages: Maximum number of URLs scheduled, None for no limit.
+        seen: Bloom filter of the URLs already scheduled.
+        scheduled_count: Number of URLs scheduled.
+        discovered_count: Number of scheduled URLs that were found through links.
+        duplicate_count: Number of URLs dropped because they were already scheduled.
+        out_of_scope_count: Number of URLs dropped because they are out of scope.
+        too_deep_count: Number of URLs dropped because of the depth limit.
+        over_budget_count: Number of URLs dropped because of the page budget.
+        invalid_count: Number of links that are not valid http(s) URLs.
+    """
+
+    def __init__(
+        self,
+        scope: UrlScope | None = None,
+        max_depth: int = 3,
+        max_pages: int | None = None,
+        seen: BloomFilter | None = None,
+    ) -> None:
+        self.scope = scope
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.seen = seen or BloomFilter(capacity=max(max_pages or 0, 1_000_000))
+
+        self.scheduled_count = 0
+        self.discovered_count = 0
+        self.duplicate_count = 0
+        self.out_of_scope_count = 0
+        self.too_deep_count = 0
+        self.over_budget_count = 0
+        self.invalid_count = 0
+
+        self._queue: deque[tuple[str, int]] = deque()
+        self._in_flight = 0
+        self._condition: asyncio.Condition | None = None
+        self._condition_loop: asyncio.AbstractEventLoop | None = None
+
+
+    def seed(self, urls: Iterable[str]) -> None:
+        """Schedule the starting URLs of the crawl at depth 0.
+
+        Args:
+            urls: Starting URLs, such as the ones listed by the sitemap.
+        """
+
+        for url in urls:
+            self.__schedule(url, depth=0)
+
+
+    async def get(self) -> tuple[str, int] | None:
+        """Take the next URL to crawl, waiting for in-flight pages to report their links.
+
+        Returns:
+            tuple[str, int] | None: URL and its depth, or None once the crawl is complete.
+        """
+
+        condition = self.__get_condition()
+
+        async with condition:
+            while not self._queue and self._in_flight > 0:
+                await condition.wait()
+
+            if not self._queue:
+                # Wake the other workers so they see the crawl is complete as well
+                condition.notify_all()
+                return None
+
+            self._in_flight += 1
+
+            return self._queue.popleft()
+
+
+    async def task_done(self, depth: int, child_urls: Iterable[str]) -> None:
+        """Report that a page was crawled and schedule its links.
+
+        Args:
+            depth: Depth of the crawled page.
+            child_urls: Links found on the page, empty if the crawl failed.
+        """
+
+        condition = self.__get_condition()
+
+        async with condition:
+            for url in child_urls:
+                if self.__schedule(url, depth=depth + 1):
+                    self.discovered_count += 1
+
+            self._in_flight -= 1
+            condition.notify_all()
+
+
+    def stats(self) -> dict[str, int]:
+        """Counters of the frontier, for reporting.
+
+        Returns:
+            dict[str, int]: Scheduled, discovered and dropped URL counts.
+        """
+
+        return {
+            "scheduled": self.scheduled_count,
+            "discovered": self.discovered_count,
+            "duplicates": self.duplicate_count,
+            "out_of_scope": self.out_of_scope_count,
+            "too_deep": self.too_deep_count,
+            "over_budget": self.over_budget_count,
+            "invalid": self.invalid_count,
+        }
+
+
+    def __schedule(self, url: str, depth: int) -> bool:
+        normalized_url = normalize_url(url)
+
+        if normalized_url is None:
+            self.invalid_count += 1
+        elif depth > self.max_depth:
+            self.too_deep_count += 1
+        elif self.scope is not None and normalized_url not in self.scope:
+            self.out_of_scope_count += 1
+        elif normalized_url in self.seen:
+            self.duplicate_count += 1
+        elif self.max_pages is not None and self.scheduled_count >= self.max_pages:
+            self.over_budget_count += 1
+        else:
+            self.seen.add(normalized_url)
+            self._queue.append((normalized_url, depth))
+            self.scheduled_count += 1
+            return True
+
+        return False
+
+
+    def __get_condition(self) -> asyncio.Condition:
+        # asyncio conditions are bound to one event loop, and the frontier may outlive it
+        loop = asyncio.get_running_loop()
+        if self._condition_loop is not loop:
+            self._condition = asyncio.Condition()
+            self._condition_loop = loop
+
+        return self._condition
+
+
+def _remove_dot_segments(path: str) -> str:
+    """Resolve "." and ".." path segments."""
+
+    if "." not in path:
+        return path
+
+    output: list[str] = []
+    for segment in path.split("/"):
+        if segment == "..":
+            if len(output) > 1:
+                output.pop()
+        elif segment != ".":
+            output.append(segment)
+
+    normalized_path = "/".join(output)
+    if path.endswith(("/.", "/..")):
+        normalized_path += "/"
+
+    return normalized_path or "/"
+
+
+def _quote(path: str) -> str:
+    """Percent-encode unsafe characters and uppercase the existing escapes."""
+
+    path = quote(path, safe="/%:@!$&'()*+,;=~")
+
+    return PERCENT_ESCAPE_PATTERN.sub(lambda match: match.group(0).upper(), path)
+
+
+def _is_path_within(path: str, path_prefix: str) -> bool:
+    """Whether a path equals a prefix or lies below it, on a path segment boundary."""
+
+    path_prefix = path_prefix.rstrip("/")
+
+    return not path_prefix or path == path_prefix or path.startswith(path_prefix + "/")
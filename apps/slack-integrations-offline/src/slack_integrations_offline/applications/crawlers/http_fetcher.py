@@ -0,0 +1,227 @@
+import asyncio
+import re
+from html.parser import HTMLParser
+from urllib.parse import urldefrag, urljoin
+
+import httpx
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+from pydantic import BaseModel, Field
+
+
+# Markdown options shared by the HTTP fast path and the browser crawl
+MARKDOWN_OPTIONS = {
+    "ignore_links": True,
+    "escape_html": False,
+    "ignore_images": True,
+}
+
+# Messages shown to clients that do not run JavaScript
+JAVASCRIPT_REQUIRED_PATTERN = re.compile(
+    r"(enable|requires?|turn on|need)\s+javascript|javascript\s+(is\s+)?(required|disabled)",
+    re.IGNORECASE,
+)
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# Client errors a browser may get past, such as bot blocks or throttling; the other 4xx
+# responses are final and rendering the page would fail the same way
+BROWSER_RETRY_STATUS_CODES = {403, 408, 425, 429}
+
+
+class HttpFetchResult(BaseModel):
+    """Outcome of fetching a page without a browser.
+
+    Attributes:
+        url: Final URL of the page, after redirects.
+        status_code: HTTP status code of the response.
+        headers: Response headers with lowercased names.
+        markdown: Markdown converted from the page, None if the page needs the browser.
+        title: Title of the page.
+        metadata: `<meta>` tags of the page, keyed by name or property.
+        links: Absolute URLs of the links of the page.
+        needs_browser: Whether the page must be rendered by the browser.
+        failed: Whether the server answered with a permanent error, so the page should not
+            be rendered by the browser either.
+        reason: Why the page needs the browser or failed, if it does.
+    """
+
+    url: str
+    status_code: int
+    headers: dict[str, str] = Field(default_factory=dict)
+    markdown: str | None = None
+    title: str = ""
+    metadata: dict[str, str] = Field(default_factory=dict)
+    links: list[str] = Field(default_factory=list)
+    needs_browser: bool = False
+    failed: bool = False
+    reason: str | None = None
+
+
+class HttpPageFetcher:
+    """Fetch static pages with a plain HTTP client and convert them to markdown.
+
+    Most documentation pages are served as complete HTML, so a GET and an HTML to markdown
+    conversion give the same content as a headless browser at a fraction of the cost. Pages
+    that are not HTML, that render almost no text, or that ask for JavaScript are flagged
+    so the caller can render them with the browser instead. Permanent client errors such as
+    404 or 410 are flagged as failed, since the browser would get the same answer.
+
+    Attributes:
+        min_text_chars: Minimum number of non-whitespace characters a page must render
+            without JavaScript to be accepted.
+        max_content_bytes: Pages larger than this are left to the browser.
+        markdown_generator: Markdown generator converting the fetched HTML.
+    """
+
+    def __init__(
+        self,
+        min_text_chars: int = 200,
+        max_content_bytes: int = 5 * 1024 * 1024,
+        markdown_options: dict | None = None,
+    ) -> None:
+        self.min_text_chars = min_text_chars
+        self.max_content_bytes = max_content_bytes
+        self.markdown_generator = DefaultMarkdownGenerator(
+            options=markdown_options or MARKDOWN_OPTIONS
+        )
+
+
+    async def fetch(self, url: str, client: httpx.AsyncClient) -> HttpFetchResult:
+        """Fetch a page and convert it to markdown if it renders without JavaScript.
+
+        Args:
+            url: URL to fetch.
+            client: Pooled HTTP client used for the request.
+
+        Returns:
+            HttpFetchResult: Converted page, or a result flagged with `needs_browser` or `failed`.
+
+        Raises:
+            httpx.HTTPError: If the request fails.
+        """
+
+        async with client.stream("GET", url) as response:
+            headers = {key.lower(): value for key, value in response.headers.items()}
+            page = HttpFetchResult(
+                url=str(response.url), status_code=response.status_code, headers=headers
+            )
+
+            status_code = response.status_code
+            if 400 <= status_code < 500 and status_code not in BROWSER_RETRY_STATUS_CODES:
+                return page.model_copy(update={"failed": True, "reason": "http_error"})
+
+            if status_code >= 400:
+                return page.model_copy(update={"needs_browser": True, "reason": "http_error"})
+
+            content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+            if content_type not in HTML_CONTENT_TYPES:
+                return page.model_copy(update={"needs_browser": True, "reason": "not_html"})
+
+            if int(headers.get("content-length") or 0) > self.max_content_bytes:
+                return page.model_copy(update={"needs_browser": True, "reason": "too_large"})
+
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body.extend(chunk)
+                if len(body) > self.max_content_bytes:
+                    return page.model_copy(update={"needs_browser": True, "reason": "too_large"})
+
+            html = bytes(body).decode(response.encoding or "utf-8", errors="replace")
+
+        # html2text is pure Python; run it off the event loop so other fetches keep flowing
+        return await asyncio.to_thread(self.__convert, page, html)
+
+
+    def __convert(self, page: HttpFetchResult, html: str) -> HttpFetchResult:
+        """Convert the HTML of a page to markdown and detect whether it needs JavaScript.
+
+        Args:
+            page: Fetched page without content.
+            html: HTML of the page.
+
+        Returns:
+            HttpFetchResult: Page with its markdown, title, metadata and links.
+        """
+
+        parser = _PageParser()
+        parser.feed(html)
+        parser.close()
+
+        base_url = urljoin(page.url, parser.base_href) if parser.base_href else page.url
+        links = list(
+            dict.fromkeys(
+                urldefrag(urljoin(base_url, href)).url
+                for href in parser.hrefs
+                if not href.startswith(("#", "javascript:", "mailto:", "tel:"))
+            )
+        )
+
+        # Passed positionally: the HTML argument was renamed across crawl4ai releases
+        markdown = self.markdown_generator.generate_markdown(
+            html, base_url=base_url, citations=False
+        ).raw_markdown
+        text_chars = len("".join(markdown.split()))
+
+        update = {
+            "title": parser.title.strip(),
+            "metadata": parser.metadata,
+            "links": links,
+        }
+
+        if text_chars < self.min_text_chars:
+            update.update(needs_browser=True, reason="little_text")
+        elif text_chars < 4 * self.min_text_chars and JAVASCRIPT_REQUIRED_PATTERN.search(
+            parser.noscript_text
+        ):
+            update.update(needs_browser=True, reason="javascript_required")
+        else:
+            update["markdown"] = markdown
+
+        return page.model_copy(update=update)
+
+
+class _PageParser(HTMLParser):
+    """Collect the title, `<meta>` tags, links and `<noscript>` text of an HTML page."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+
+        self.title = ""
+        self.metadata: dict[str, str] = {}
+        self.hrefs: list[str] = []
+        self.base_href: str | None = None
+        self.noscript_text = ""
+
+        self._in_title = False
+        self._in_noscript = False
+
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = {name: value or "" for name, value in attrs}
+
+        if tag == "title":
+            self._in_title = True
+        elif tag == "noscript":
+            self._in_noscript = True
+        elif tag == "a" and attributes.get("href"):
+            self.hrefs.append(attributes["href"].strip())
+        elif tag == "base" and attributes.get("href") and self.base_href is None:
+            self.base_href = attributes["href"].strip()
+        elif tag == "meta":
+            name = attributes.get("name") or attributes.get("property")
+            if name and "content" in attributes:
+                self.metadata[name.lower()] = attributes["content"]
+
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+        elif tag == "noscript":
+            self._in_noscript = False
+
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+        elif self._in_noscript:
+            self.noscript_text += data
\ No newline at end of file
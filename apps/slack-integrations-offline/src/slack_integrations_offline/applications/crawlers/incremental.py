@@ -0,0 +1,255 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import httpx
+from loguru import logger
+
+from src.slack_integrations_offline.applications.crawlers.rate_limiter import AdaptiveRateLimiter
+from src.slack_integrations_offline.domain.document import Document
+from src.slack_integrations_offline.domain.sitemap import SitemapEntry
+from src.slack_integrations_offline.infrastructure.storage.crawl_ledger import (
+    CrawlLedger,
+    CrawlLedgerEntry,
+)
+
+
+class IncrementalCrawlTracker:
+    """Decide which URLs need a recrawl and which crawled documents actually changed.
+
+    URLs are skipped when their sitemap `lastmod` matches the ledger, or when a conditional
+    request (`If-None-Match` / `If-Modified-Since`) answers 304 Not Modified. Conditional
+    requests are paced by the crawler's rate limiter, crawl delays included. After crawling,
+    documents whose content hash matches the ledger are dropped.
+
+    Attributes:
+        ledger: Crawl ledger holding the state of previous crawls.
+        max_concurrent_requests: Maximum number of concurrent conditional requests.
+        timeout: Timeout in seconds of each conditional request.
+        rate_limiter: Per-host rate limiter shared with the crawler, if any.
+        respect_crawl_delay: Whether to cap the rate to the `robots.txt` crawl delay.
+        skipped_by_lastmod: Number of URLs skipped because their `lastmod` is unchanged.
+        not_modified: Number of URLs skipped because the server answered 304.
+        missing_documents: Number of unchanged URLs crawled again because their document
+            is missing from the previous crawl output.
+        unchanged_content: Number of crawled documents whose content did not change.
+        new_documents: Number of crawled URLs missing from the ledger.
+        changed_documents: Number of crawled documents whose content changed.
+    """
+
+    def __init__(
+        self,
+        ledger: CrawlLedger,
+        max_concurrent_requests: int = 10,
+        timeout: float = 10.0,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        respect_crawl_delay: bool = True,
+    ) -> None:
+
+        self.ledger = ledger
+        self.max_concurrent_requests = max_concurrent_requests
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.respect_crawl_delay = respect_crawl_delay
+
+        self.skipped_by_lastmod = 0
+        self.not_modified = 0
+        self.missing_documents = 0
+        self.unchanged_content = 0
+        self.new_documents = 0
+        self.changed_documents = 0
+
+        self._lastmods: dict[str, str | None] = {}
+        self._restored_urls: set[str] = set()
+
+
+    def select(
+        self, entries: list[SitemapEntry], stored_document_ids: set[str] | None = None
+    ) -> list[SitemapEntry]:
+        """Select the sitemap entries that may have changed since the last crawl.
+
+        Args:
+            entries: Sitemap entries to check.
+            stored_document_ids: IDs of the documents of the previous crawl output. Unchanged
+                URLs whose document is not among them are crawled again, since nothing could
+                be carried over for them. Defaults to None, which trusts the ledger.
+
+        Returns:
+            list[SitemapEntry]: Entries that must be crawled.
+        """
+
+        self._lastmods = {entry.url: entry.lastmod for entry in entries}
+
+        candidates = []
+        for entry in entries:
+            previous = self.ledger.get(entry.url)
+
+            if previous is None or previous.content_hash is None:
+                candidates.append(entry)
+            elif stored_document_ids is not None and previous.document_id not in stored_document_ids:
+                self.missing_documents += 1
+                self._restored_urls.add(entry.url)
+                candidates.append(entry)
+            elif entry.lastmod is not None and entry.lastmod == previous.lastmod:
+                self.skipped_by_lastmod += 1
+            else:
+                candidates.append(entry)
+
+        try:
+            loop = asyncio.get_running_loop()
+
+        except RuntimeError:
+            selected = asyncio.run(self.__filter_not_modified(candidates))
+
+        else:
+            selected = loop.run_until_complete(self.__filter_not_modified(candidates))
+
+        logger.info(
+            f"Incremental crawl: {len(selected)}/{len(entries)} URLs to crawl | "
+            f"{self.skipped_by_lastmod} unchanged lastmod | {self.not_modified} not modified | "
+            f"{self.missing_documents} missing from the previous output"
+        )
+
+        return selected
+
+
+    def record(
+        self, document: Document, validators: dict[str, dict[str, str]]
+    ) -> Document | None:
+        """Record a crawled document in the ledger and keep it only if it is new or changed.
+
+        Args:
+            document: Crawled document.
+            validators: `etag` and `last_modified` response headers of the crawled pages, keyed by URL.
+
+        Returns:
+            Document | None: The document, or None if its content did not change and the
+                previous crawl output still holds it.
+        """
+
+        url = document.metadata.url
+        content_hash = document.content_hash
+        previous = self.ledger.get(url)
+        page_validators = validators.get(url, {})
+
+        self.ledger.update(
+            CrawlLedgerEntry(
+                url=url,
+                document_id=document.id,
+                lastmod=self._lastmods.get(url),
+                etag=page_validators.get("etag"),
+                last_modified=page_validators.get("last_modified"),
+                content_hash=content_hash,
+                last_success_at=datetime.now(timezone.utc),
+            )
+        )
+
+        if previous is None:
+            self.new_documents += 1
+        elif previous.content_hash == content_hash:
+            if url in self._restored_urls:
+                return document
+
+            self.unchanged_content += 1
+            return None
+        else:
+            self.changed_documents += 1
+
+        return document
+
+
+    async def __filter_not_modified(self, entries: list[SitemapEntry]) -> list[SitemapEntry]:
+        """Drop the entries for which a conditional request answers 304 Not Modified.
+
+        Args:
+            entries: Sitemap entries to check.
+
+        Returns:
+            list[SitemapEntry]: Entries that were modified or could not be validated.
+        """
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        if self.rate_limiter is not None and self.respect_crawl_delay:
+            await self.rate_limiter.apply_crawl_delays([entry.url for entry in entries])
+
+        async with httpx.AsyncClient(follow_redirects=True, timeout=self.timeout) as client:
+            modified = await asyncio.gather(
+                *[self.__is_modified(entry, client, semaphore) for entry in entries]
+            )
+
+        return [entry for entry, is_modified in zip(entries, modified) if is_modified]
+
+
+    async def __is_modified(
+        self,
+        entry: SitemapEntry,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+    ) -> bool:
+        """Check a URL with a conditional request built from its ledger validators.
+
+        Args:
+            entry: Sitemap entry to check.
+            client: HTTP client used for the request.
+            semaphore: Semaphore for controlling concurrent request limits.
+
+        Returns:
+            bool: False if the server confirmed the page is unchanged, True otherwise.
+        """
+
+        previous = self.ledger.get(entry.url)
+        if previous is None or previous.content_hash is None or entry.url in self._restored_urls:
+            return True
+
+        headers = {}
+        if previous.etag:
+            headers["If-None-Match"] = previous.etag
+        if previous.last_modified:
+            headers["If-Modified-Since"] = previous.last_modified
+
+        if not headers:
+            return True
+
+        async with semaphore:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(entry.url)
+
+            start_time = time.perf_counter()
+            try:
+                # Only the status and headers are needed, the body is never read
+                async with client.stream("GET", entry.url, headers=headers) as response:
+                    status_code = response.status_code
+                    retry_after = response.headers.get("retry-after")
+
+            except httpx.HTTPError as e:
+                logger.debug(f"Conditional request failed for {entry.url}: {e}")
+                if self.rate_limiter is not None:
+                    self.rate_limiter.record(
+                        entry.url, status_code=None, latency=time.perf_counter() - start_time
+                    )
+
+                return True
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(
+                    entry.url,
+                    status_code=status_code,
+                    latency=time.perf_counter() - start_time,
+                    retry_after=retry_after,
+                )
+
+        if status_code != 304:
+            return True
+
+        self.not_modified += 1
+        self.ledger.update(
+            previous.model_copy(
+                update={
+                    "lastmod": entry.lastmod,
+                    "last_success_at": datetime.now(timezone.utc),
+                }
+            )
+        )
+
+        return False
\ No newline at end of file
@@ -0,0 +1,387 @@
+import asyncio
+import multiprocessing
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+from loguru import logger
+
+
+# Responses telling the client to slow down
+THROTTLE_STATUS_CODES = {429, 503}
+
+
+class HostRateLimiter:
+    """Token bucket pacing the requests sent to a single host, adjusted with AIMD.
+
+    The refill rate grows additively after fast successful responses and shrinks
+    multiplicatively on throttling responses or slow ones, at most once per round trip:
+    responses to requests sent before the last decrease reflect the old rate, so a burst of
+    concurrent throttling responses only halves the rate once. A `Retry-After` header
+    pauses the host entirely until the given time.
+
+    Attributes:
+        host: Host the limiter applies to.
+        rate: Current number of requests allowed per second.
+        min_rate: Lower bound of the rate, lowered along with `max_rate`.
+        max_rate: Upper bound of the rate, lowered by a `robots.txt` crawl delay.
+        burst: Maximum number of tokens accumulated while idle.
+        request_count: Number of requests let through.
+        throttle_count: Number of throttling responses received.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        burst: float = 1.0,
+    ) -> None:
+        self.host = host
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+
+        self.request_count = 0
+        self.throttle_count = 0
+
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._decreased_at = float("-inf")
+        self._first_request_at: float | None = None
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+
+
+    async def acquire(self) -> None:
+        """Wait until a request to the host is allowed."""
+
+        # asyncio locks are bound to one event loop, and the limiter may outlive it
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                elif self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    break
+                else:
+                    await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+        self.request_count += 1
+        if self._first_request_at is None:
+            self._first_request_at = time.monotonic()
+
+
+    def limit_rate(self, max_rate: float) -> None:
+        """Cap the rate, for instance to honor a `robots.txt` crawl delay.
+
+        Args:
+            max_rate: New upper bound of the rate.
+        """
+
+        # The floor must not raise the rate back above what the host allows
+        self.max_rate = min(self.max_rate, max_rate)
+        self.min_rate = min(self.min_rate, self.max_rate)
+        self.rate = min(self.rate, self.max_rate)
+
+
+    def increase(self, additive_increase: float) -> None:
+        self.rate = min(self.max_rate, self.rate + additive_increase)
+
+
+    def decrease(self, multiplicative_decrease: float, sent_at: float) -> bool:
+        """Decrease the rate, unless it was already decreased after the request was sent.
+
+        Args:
+            multiplicative_decrease: Factor applied to the rate.
+            sent_at: Monotonic time the request triggering the decrease was sent at.
+
+        Returns:
+            bool: Whether the rate was decreased.
+        """
+
+        if sent_at < self._decreased_at:
+            return False
+
+        self.rate = max(self.min_rate, self.rate * multiplicative_decrease)
+        self._decreased_at = time.monotonic()
+
+        return True
+
+
+    def block(self, seconds: float) -> None:
+        """Pause every request to the host for the given duration.
+
+        Args:
+            seconds: Pause duration in seconds.
+        """
+
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+
+    @property
+    def effective_rate(self) -> float:
+        """Average number of requests per second since the first request."""
+
+        if self._first_request_at is None or self.request_count < 2:
+            return 0.0
+
+        elapsed_seconds = time.monotonic() - self._first_request_at
+        return (self.request_count - 1) / max(elapsed_seconds, 1e-9)
+
+
+class SharedRateLimit:
+    """Global request rate shared by every process of a sharded crawl.
+
+    The time of the next free request slot lives in shared memory. Each request reserves
+    the next slot under an inter-process lock, then sleeps until it, so the combined rate
+    of all processes never exceeds `rate`.
+
+    Attributes:
+        rate: Maximum number of requests per second across all processes.
+    """
+
+    def __init__(self, rate: float, context: multiprocessing.context.BaseContext | None = None) -> None:
+        context = context or multiprocessing.get_context()
+
+        self.rate = rate
+        self._next_slot = context.Value("d", 0.0, lock=False)
+        self._lock = context.Lock()
+
+
+    async def acquire(self) -> None:
+        """Wait until the global rate allows another request."""
+
+        # Wall-clock time, since monotonic clocks are not comparable across processes everywhere
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next_slot.value)
+            self._next_slot.value = slot + 1.0 / self.rate
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class AdaptiveRateLimiter:
+    """Per-host rate limiting for the crawler, driven by response status and latency.
+
+    Each host gets its own token bucket starting at `initial_rate`. Fast successful
+    responses add `additive_increase` requests per second, while 429/503 responses or
+    responses slower than `target_latency` multiply the rate by `multiplicative_decrease`.
+    `Retry-After` headers pause the host for at most `max_retry_after` seconds, and
+    `robots.txt` crawl delays cap its rate.
+
+    When several processes crawl the same hosts, each limiter gets a `rate_share` of every
+    per-host rate, and a `global_limit` caps the requests of all processes combined.
+
+    Attributes:
+        initial_rate: Starting number of requests per second for each host.
+        min_rate: Lower bound of the per-host rate.
+        max_rate: Upper bound of the per-host rate.
+        additive_increase: Requests per second added after each fast successful response,
+            scaled by `rate_share`.
+        multiplicative_decrease: Factor applied to the rate after throttling or slow responses.
+        target_latency: Response time in seconds above which the rate is decreased.
+        max_retry_after: Longest pause in seconds a `Retry-After` header can impose on a host.
+        rate_share: Fraction of each per-host rate available to this limiter.
+        global_limit: Request rate shared with other processes, if any.
+        hosts: Rate limiters keyed by host.
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = 2.0,
+        min_rate: float = 0.2,
+        max_rate: float = 20.0,
+        additive_increase: float = 0.5,
+        multiplicative_decrease: float = 0.5,
+        target_latency: float = 5.0,
+        rate_share: float = 1.0,
+        global_limit: SharedRateLimit | None = None,
+        max_retry_after: float = 300.0,
+    ) -> None:
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.target_latency = target_latency
+        self.max_retry_after = max_retry_after
+        self.rate_share = rate_share
+        self.global_limit = global_limit
+
+        self.hosts: dict[str, HostRateLimiter] = {}
+
+
+    async def acquire(self, url: str) -> None:
+        """Wait until a request to the host of a URL is allowed.
+
+        Args:
+            url: URL about to be requested.
+        """
+
+        await self.__get_host(url).acquire()
+
+        if self.global_limit is not None:
+            await self.global_limit.acquire()
+
+
+    def record(
+        self,
+        url: str,
+        status_code: int | None,
+        latency: float,
+        retry_after: str | None = None,
+    ) -> None:
+        """Adjust the rate of a host from the outcome of a request.
+
+        Args:
+            url: Requested URL.
+            status_code: HTTP status code of the response, None if no response was received.
+            latency: Response time in seconds.
+            retry_after: Value of the `Retry-After` response header, if any.
+        """
+
+        host_limiter = self.__get_host(url)
+        sent_at = time.monotonic() - latency
+
+        if retry_after is not None:
+            delay = _parse_retry_after(retry_after)
+            if delay is not None:
+                # A far-future date would otherwise pause the host for the rest of the crawl
+                host_limiter.block(min(delay, self.max_retry_after))
+
+        if status_code in THROTTLE_STATUS_CODES:
+            host_limiter.throttle_count += 1
+            if host_limiter.decrease(self.multiplicative_decrease, sent_at):
+                logger.warning(
+                    f"{host_limiter.host} answered {status_code}, "
+                    f"slowing down to {host_limiter.rate:.2f} requests/s"
+                )
+        elif latency > self.target_latency:
+            host_limiter.decrease(self.multiplicative_decrease, sent_at)
+        elif status_code is not None and status_code < 400:
+            host_limiter.increase(self.additive_increase * self.rate_share)
+
+
+    async def apply_crawl_delays(self, urls: list[str], user_agent: str = "*") -> None:
+        """Cap the rate of each host to the crawl delay or request rate of its `robots.txt`.
+
+        Args:
+            urls: URLs about to be crawled.
+            user_agent: User agent the `robots.txt` rules are read for. Defaults to "*".
+        """
+
+        origins = {
+            f"{parts.scheme}://{parts.netloc}" for parts in map(urlsplit, urls) if parts.netloc
+        }
+
+        async with httpx.AsyncClient(follow_redirects=True, timeout=10.0) as client:
+            await asyncio.gather(
+                *[self.__apply_crawl_delay(origin, client, user_agent) for origin in origins]
+            )
+
+
+    def effective_rates(self) -> dict[str, float]:
+        """Average number of requests per second sent to each host.
+
+        Returns:
+            dict[str, float]: Effective request rate keyed by host.
+        """
+
+        return {host: round(limiter.effective_rate, 3) for host, limiter in self.hosts.items()}
+
+
+    def current_rates(self) -> dict[str, float]:
+        """Rate each host limiter has converged to.
+
+        Returns:
+            dict[str, float]: Allowed requests per second keyed by host.
+        """
+
+        return {host: round(limiter.rate, 3) for host, limiter in self.hosts.items()}
+
+
+    async def __apply_crawl_delay(
+        self, origin: str, client: httpx.AsyncClient, user_agent: str
+    ) -> None:
+        robots_url = f"{origin}/robots.txt"
+
+        try:
+            response = await client.get(robots_url)
+            response.raise_for_status()
+
+        except httpx.HTTPError as e:
+            logger.debug(f"Could not read {robots_url}: {e}")
+            return
+
+        robot_parser = RobotFileParser(robots_url)
+        robot_parser.parse(response.text.splitlines())
+
+        crawl_delay = robot_parser.crawl_delay(user_agent)
+        request_rate = robot_parser.request_rate(user_agent)
+
+        max_rates = []
+        if crawl_delay:
+            max_rates.append(1.0 / float(crawl_delay))
+        if request_rate and request_rate.seconds:
+            max_rates.append(request_rate.requests / request_rate.seconds)
+
+        if max_rates:
+            host_limiter = self.__get_host(origin)
+            host_limiter.limit_rate(min(max_rates) * self.rate_share)
+            logger.info(
+                f"{robots_url} limits crawling to {host_limiter.max_rate:.2f} requests/s"
+            )
+
+
+    def __get_host(self, url: str) -> HostRateLimiter:
+        host = urlsplit(url).netloc
+
+        if host not in self.hosts:
+            self.hosts[host] = HostRateLimiter(
+                host=host,
+                rate=self.initial_rate * self.rate_share,
+                min_rate=self.min_rate * self.rate_share,
+                max_rate=self.max_rate * self.rate_share,
+            )
+
+        return self.hosts[host]
+
+
+def _parse_retry_after(retry_after: str) -> float | None:
+    """Parse a `Retry-After` header given either in seconds or as an HTTP date."""
+
+    retry_after = retry_after.strip()
+    if retry_after.isdigit():
+        return float(retry_after)
+
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+
+    # Dates in "-0000" are parsed as naive datetimes, but HTTP dates are always in UTC
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
\ No newline at end of file
@@ -0,0 +1,363 @@
+import asyncio
+import multiprocessing
+import queue
+import traceback
+import zlib
+from typing import AsyncGenerator
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from src.slack_integrations_offline.applications.crawlers.crawl4ai import Crawl4AICrawler
+from src.slack_integrations_offline.applications.crawlers.frontier import CrawlFrontier
+from src.slack_integrations_offline.applications.crawlers.rate_limiter import (
+    AdaptiveRateLimiter,
+    SharedRateLimit,
+)
+from src.slack_integrations_offline.domain.document import Document
+from src.slack_integrations_offline.infrastructure.storage import CrawlFailure
+
+
+SHARD_KEYS = ("host", "path")
+
+
+class ShardedCrawler(Crawl4AICrawler):
+    """Crawl URLs across several processes, each running its own `Crawl4AICrawler`.
+
+    URLs are partitioned by a stable hash of their host or of their path. Every process has
+    its own event loop, browser and pool of `max_concurrent_requests` workers, so markdown
+    conversion and page processing use one core per process. Documents are sent back to the
+    parent process and yielded from `stream`, so they reach the same document sink.
+
+    With path sharding, processes crawl the same hosts, so each one gets `1 / num_processes`
+    of every per-host rate. An optional global rate caps the requests of all processes combined.
+
+    Attributes:
+        num_processes: Number of crawling processes.
+        shard_by: Partitioning key, either "host" or "path".
+        global_requests_per_second: Maximum number of requests per second across all
+            processes, None for no global limit.
+        host_rates: Request statistics reported by the processes, keyed by host.
+    """
+
+    def __init__(
+        self,
+        num_processes: int = 2,
+        shard_by: str = "path",
+        global_requests_per_second: float | None = None,
+        **crawler_kwargs,
+    ) -> None:
+        if shard_by not in SHARD_KEYS:
+            raise ValueError(f"Unsupported shard key '{shard_by}', expected one of {SHARD_KEYS}")
+
+        super().__init__(**crawler_kwargs)
+
+        self.num_processes = num_processes
+        self.shard_by = shard_by
+        self.global_requests_per_second = global_requests_per_second
+        self.host_rates: dict[str, dict[str, float]] = {}
+
+
+    async def stream(
+        self, urls: list[str], frontier: CrawlFrontier | None = None
+    ) -> AsyncGenerator[Document, None]:
+        """Crawl URLs in worker processes and yield documents as soon as each page completes.
+
+        Args:
+            urls: List of URLs to crawl.
+            frontier: Not supported, since links found by one process may belong to another
+                process's shard.
+
+        Yields:
+            Document: Successfully crawled documents, in completion order.
+
+        Raises:
+            ValueError: If a frontier is given.
+            RuntimeError: If a crawling process fails.
+        """
+
+        if frontier is not None:
+            raise ValueError("Frontier crawling is not supported by the sharded crawler")
+
+        self._reset_counters()
+        self.host_rates = {}
+
+        shards = [shard for shard in shard_urls(urls, self.num_processes, self.shard_by) if shard]
+        logger.info(
+            f"Starting sharded crawl of {len(urls)} URLs with {len(shards)} processes "
+            f"(sharded by {self.shard_by})"
+        )
+
+        # Browsers and event loops do not survive a fork, so processes are spawned
+        context = multiprocessing.get_context("spawn")
+        global_limit = (
+            SharedRateLimit(self.global_requests_per_second, context=context)
+            if self.global_requests_per_second
+            else None
+        )
+        messages = context.Queue(maxsize=self.max_concurrent_requests * max(len(shards), 1))
+
+        processes = [
+            context.Process(
+                target=_crawl_shard,
+                args=(index, shard, self.__shard_config(len(shards)), global_limit, messages),
+                daemon=True,
+            )
+            for index, shard in enumerate(shards)
+        ]
+        for process in processes:
+            process.start()
+
+        finished: set[int] = set()
+        try:
+            while len(finished) < len(processes):
+                exited: list[int] = []
+                try:
+                    pending = [await asyncio.to_thread(messages.get, True, 1.0)]
+
+                except queue.Empty:
+                    exited = self.__exited_shards(processes, finished)
+                    if not exited:
+                        continue
+
+                    # A shard may report its end and exit between the timeout and the exit check
+                    pending = _drain(messages)
+
+                for kind, index, payload in pending:
+                    if kind == "document":
+                        document = Document.model_validate_json(payload["document"])
+                        self.validators[document.metadata.url] = payload["validators"]
+                        yield document
+
+                    elif kind == "stats":
+                        self.__merge_stats(payload)
+
+                    elif kind == "error":
+                        raise RuntimeError(f"Crawl shard {index} failed:\n{payload}")
+
+                    elif kind == "done":
+                        finished.add(index)
+
+                for index in exited:
+                    if index not in finished:
+                        raise RuntimeError(
+                            f"Crawl shard {index} exited with code {processes[index].exitcode} "
+                            "before finishing"
+                        )
+
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+        total_count = self.success_count + self.failed_count
+
+        logger.info(
+            f"Sharded crawling completed: "
+            f"{self.success_count}/{total_count} succeeded ✓ | "
+            f"{self.failed_count}/{total_count} failed ✗ | "
+            f"{self.http_page_count} over HTTP | {self.browser_page_count} rendered"
+        )
+
+
+    def rate_summary(self) -> dict[str, dict[str, float] | int]:
+        """Summarize the request rates of the last crawl, summed over the processes.
+
+        Returns:
+            dict[str, dict[str, float] | int]: Effective and final request rates keyed by host,
+                and the number of throttling responses received.
+        """
+
+        return {
+            "effective_requests_per_second": {
+                host: round(rates["effective_rate"], 3) for host, rates in self.host_rates.items()
+            },
+            "final_requests_per_second": {
+                host: round(rates["rate"], 3) for host, rates in self.host_rates.items()
+            },
+            "throttled_responses": int(
+                sum(rates["throttle_count"] for rates in self.host_rates.values())
+            ),
+        }
+
+
+    def __shard_config(self, num_shards: int) -> dict:
+        """Build the settings of the crawler run by each process.
+
+        Args:
+            num_shards: Number of processes sharing the hosts.
+
+        Returns:
+            dict: Keyword arguments of the rate limiter and of the crawler.
+        """
+
+        return {
+            "rate_limiter": {
+                "initial_rate": self.rate_limiter.initial_rate,
+                "min_rate": self.rate_limiter.min_rate,
+                "max_rate": self.rate_limiter.max_rate,
+                "additive_increase": self.rate_limiter.additive_increase,
+                "multiplicative_decrease": self.rate_limiter.multiplicative_decrease,
+                "target_latency": self.rate_limiter.target_latency,
+                "max_retry_after": self.rate_limiter.max_retry_after,
+                # A host is crawled by a single process when sharding by host
+                "rate_share": 1.0 if self.shard_by == "host" else 1.0 / num_shards,
+            },
+            "crawler": {
+                "max_concurrent_requests": self.max_concurrent_requests,
+                "respect_crawl_delay": self.respect_crawl_delay,
+                "page_timeout": self.page_timeout,
+                "max_retries": self.max_retries,
+                "retry_base_delay": self.retry_base_delay,
+                "max_retry_delay": self.max_retry_delay,
+                "fast_path": self.fast_path,
+                "http_fetcher": self.http_fetcher,
+                "browser_pool_size": self.browser_pool_size,
+                "pages_per_browser": self.pages_per_browser,
+            },
+        }
+
+
+    def __merge_stats(self, stats: dict) -> None:
+        self.success_count += stats["success_count"]
+        self.failed_count += stats["failed_count"]
+        self.timeout_count += stats["timeout_count"]
+        self.retry_count += stats["retry_count"]
+        self.latencies.extend(stats["latencies"])
+        self.http_page_count += stats["http_page_count"]
+        self.browser_page_count += stats["browser_page_count"]
+        self.browsers_started += stats["browsers_started"]
+        self.browsers_recycled += stats["browsers_recycled"]
+
+        for reason, count in stats["browser_fallbacks"].items():
+            self.browser_fallbacks[reason] = self.browser_fallbacks.get(reason, 0) + count
+
+        for failure in stats["failures"]:
+            failure = CrawlFailure.model_validate(failure)
+            self.failures[failure.url] = failure
+
+        for host, rates in stats["host_rates"].items():
+            merged = self.host_rates.setdefault(
+                host, {"effective_rate": 0.0, "rate": 0.0, "throttle_count": 0}
+            )
+            for name, value in rates.items():
+                merged[name] += value
+
+
+    def __exited_shards(
+        self, processes: list[multiprocessing.Process], finished: set[int]
+    ) -> list[int]:
+        """Find the processes that exited before their end was received.
+
+        Returns:
+            list[int]: Indexes of the exited processes whose shard is not finished.
+        """
+
+        return [
+            index
+            for index, process in enumerate(processes)
+            if index not in finished and process.exitcode is not None
+        ]
+
+
+def shard_urls(urls: list[str], num_shards: int, shard_by: str = "path") -> list[list[str]]:
+    """Partition URLs with a hash that is stable across processes and runs.
+
+    Args:
+        urls: URLs to partition.
+        num_shards: Number of partitions.
+        shard_by: Partitioning key, either "host" or "path". Defaults to "path".
+
+    Returns:
+        list[list[str]]: URLs of each partition.
+    """
+
+    shards: list[list[str]] = [[] for _ in range(num_shards)]
+
+    for url in urls:
+        parts = urlsplit(url)
+        key = parts.netloc if shard_by == "host" else f"{parts.netloc}{parts.path}"
+        shards[zlib.crc32(key.encode("utf-8")) % num_shards].append(url)
+
+    return shards
+
+
+def _drain(messages: multiprocessing.Queue) -> list[tuple]:
+    """Take every message already in a queue without waiting."""
+
+    drained = []
+    while True:
+        try:
+            drained.append(messages.get_nowait())
+        except queue.Empty:
+            return drained
+
+
+def _crawl_shard(
+    index: int,
+    urls: list[str],
+    config: dict,
+    global_limit: SharedRateLimit | None,
+    messages: multiprocessing.Queue,
+) -> None:
+    """Crawl one shard of URLs and send the documents and statistics to the parent process.
+
+    Args:
+        index: Index of the shard.
+        urls: URLs of the shard.
+        config: Keyword arguments of the rate limiter and of the crawler.
+        global_limit: Request rate shared with the other processes, if any.
+        messages: Queue receiving `(kind, index, payload)` messages.
+    """
+
+    try:
+        rate_limiter = AdaptiveRateLimiter(**config["rate_limiter"], global_limit=global_limit)
+        crawler = Crawl4AICrawler(rate_limiter=rate_limiter, **config["crawler"])
+
+        async def crawl() -> None:
+            async for document in crawler.stream(urls):
+                payload = {
+                    "document": document.model_dump_json(),
+                    "validators": crawler.validators.get(document.metadata.url, {}),
+                }
+                # A full queue blocks this thread only, the crawl workers keep going
+                await asyncio.to_thread(messages.put, ("document", index, payload))
+
+        asyncio.run(crawl())
+
+        messages.put(
+            (
+                "stats",
+                index,
+                {
+                    "success_count": crawler.success_count,
+                    "failed_count": crawler.failed_count,
+                    "timeout_count": crawler.timeout_count,
+                    "retry_count": crawler.retry_count,
+                    "latencies": crawler.latencies,
+                    "http_page_count": crawler.http_page_count,
+                    "browser_page_count": crawler.browser_page_count,
+                    "browsers_started": crawler.browsers_started,
+                    "browsers_recycled": crawler.browsers_recycled,
+                    "browser_fallbacks": crawler.browser_fallbacks,
+                    "failures": [
+                        failure.model_dump(mode="json") for failure in crawler.failures.values()
+                    ],
+                    "host_rates": {
+                        host: {
+                            "effective_rate": host_limiter.effective_rate,
+                            "rate": host_limiter.rate,
+                            "throttle_count": host_limiter.throttle_count,
+                        }
+                        for host, host_limiter in rate_limiter.hosts.items()
+                    },
+                },
+            )
+        )
+
+    except Exception:
+        messages.put(("error", index, traceback.format_exc()))
+
+    finally:
+        messages.put(("done", index, None))
\ No newline at end of file
@@ -0,0 +1,318 @@
+import asyncio
+import zlib
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+from xml.etree import ElementTree
+
+import httpx
+from loguru import logger
+
+from src.slack_integrations_offline.applications.crawlers.frontier import UrlScope, normalize_url
+from src.slack_integrations_offline.domain.sitemap import SitemapEntry
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class SitemapCollector:
+    """Collect the URLs of a site from its sitemaps.
+
+    Sitemaps are discovered from `robots.txt`, falling back to `sitemap.xml` and then to the
+    legacy `sitemap-pages.xml`. Sitemap indexes are followed recursively and the child
+    sitemaps of an index are fetched concurrently. Responses are parsed incrementally while
+    they stream in, gzip-compressed sitemaps are decompressed on the fly, and processed
+    elements are released right away, so memory stays bounded on large sitemaps. Sitemaps
+    declared in `robots.txt` usually cover the whole host, so only the entries within the
+    URL prefix are kept.
+
+    Attributes:
+        max_concurrent_requests: Maximum number of sitemaps fetched concurrently.
+        timeout: Timeout in seconds of each sitemap request.
+        max_depth: Maximum nesting depth of sitemap indexes.
+        sitemap_count: Number of sitemaps parsed successfully during the last collection.
+        failed_sitemap_count: Number of sitemaps that could not be fetched or parsed.
+        out_of_prefix_count: Number of entries dropped because they are outside the URL prefix.
+    """
+
+    FALLBACK_SITEMAP_PATHS = ("sitemap.xml", "sitemap-pages.xml")
+
+    def __init__(
+        self, max_concurrent_requests: int = 10, timeout: float = 30.0, max_depth: int = 5
+    ) -> None:
+
+        self.max_concurrent_requests = max_concurrent_requests
+        self.timeout = timeout
+        self.max_depth = max_depth
+
+        self.sitemap_count = 0
+        self.failed_sitemap_count = 0
+        self.out_of_prefix_count = 0
+
+
+    def __call__(self, url_prefix: str) -> list[SitemapEntry]:
+        """Collect the sitemap entries of the site hosting a URL prefix.
+
+        Args:
+            url_prefix: Base URL of the site.
+
+        Returns:
+            list[SitemapEntry]: Entries of every sitemap within the URL prefix, without
+                duplicate URLs.
+
+        Raises:
+            ValueError: If no sitemap could be fetched.
+        """
+
+        try:
+            loop = asyncio.get_running_loop()
+
+        except RuntimeError:
+            return asyncio.run(self.__collect(url_prefix))
+
+        else:
+            return loop.run_until_complete(self.__collect(url_prefix))
+
+
+    async def __collect(self, url_prefix: str) -> list[SitemapEntry]:
+        """Discover the root sitemaps and collect the entries of the whole sitemap tree.
+
+        Args:
+            url_prefix: Base URL of the site.
+
+        Returns:
+            list[SitemapEntry]: Entries of every sitemap within the URL prefix, without
+                duplicate URLs.
+        """
+
+        self.sitemap_count = 0
+        self.failed_sitemap_count = 0
+        self.out_of_prefix_count = 0
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        entries: dict[str, SitemapEntry] = {}
+
+        async with httpx.AsyncClient(follow_redirects=True, timeout=self.timeout) as client:
+            declared_sitemaps = await self.__discover_sitemaps(url_prefix, client)
+
+            # Try the conventional locations in turn until one of them can be read
+            candidates = [declared_sitemaps] if declared_sitemaps else []
+            candidates += [
+                [urljoin(url_prefix.rstrip("/") + "/", path)]
+                for path in self.FALLBACK_SITEMAP_PATHS
+            ]
+
+            for root_sitemaps in candidates:
+                await self.__walk(root_sitemaps, entries, client, semaphore)
+                if self.sitemap_count > 0:
+                    break
+
+        if self.sitemap_count == 0:
+            raise ValueError(f"No sitemap could be fetched for {url_prefix}")
+
+        scope = UrlScope.from_prefixes([url_prefix])
+        in_scope_entries = [
+            entry for entry in entries.values() if (normalize_url(entry.url) or "") in scope
+        ]
+        self.out_of_prefix_count = len(entries) - len(in_scope_entries)
+
+        logger.info(
+            f"Collected {len(in_scope_entries)} URLs from {self.sitemap_count} sitemaps "
+            f"({self.failed_sitemap_count} failed) | "
+            f"{self.out_of_prefix_count} URLs outside {url_prefix} dropped"
+        )
+
+        return in_scope_entries
+
+
+    async def __walk(
+        self,
+        sitemap_urls: list[str],
+        entries: dict[str, SitemapEntry],
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        """Walk a sitemap tree breadth first, fetching each level concurrently.
+
+        Args:
+            sitemap_urls: Root sitemaps of the tree.
+            entries: Receives the page entries, keyed by URL. The first entry of a URL wins.
+            client: HTTP client used for the requests.
+            semaphore: Semaphore for controlling concurrent request limits.
+        """
+
+        seen_sitemaps: set[str] = set()
+
+        for _ in range(self.max_depth + 1):
+            sitemap_urls = [url for url in dict.fromkeys(sitemap_urls) if url not in seen_sitemaps]
+            if not sitemap_urls:
+                return
+
+            seen_sitemaps.update(sitemap_urls)
+            results = await asyncio.gather(
+                *[self.__parse_sitemap(url, client, semaphore) for url in sitemap_urls]
+            )
+
+            sitemap_urls = []
+            for result in results:
+                if result is None:
+                    continue
+
+                page_entries, child_sitemaps = result
+                for entry in page_entries:
+                    entries.setdefault(entry.url, entry)
+                sitemap_urls.extend(child_sitemaps)
+
+        if sitemap_urls:
+            logger.warning(
+                f"Ignoring {len(sitemap_urls)} sitemaps nested deeper than {self.max_depth} levels"
+            )
+
+
+    async def __discover_sitemaps(self, url_prefix: str, client: httpx.AsyncClient) -> list[str]:
+        """Read the sitemap locations declared in the site's `robots.txt`.
+
+        Args:
+            url_prefix: Base URL of the site.
+            client: HTTP client used for the request.
+
+        Returns:
+            list[str]: Declared sitemap URLs, empty if `robots.txt` is missing or declares none.
+        """
+
+        parts = urlsplit(url_prefix)
+        robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+
+        try:
+            response = await client.get(robots_url)
+            response.raise_for_status()
+
+        except httpx.HTTPError as e:
+            logger.debug(f"Could not read {robots_url}: {e}")
+            return []
+
+        robot_parser = RobotFileParser(robots_url)
+        robot_parser.parse(response.text.splitlines())
+        sitemap_urls = robot_parser.site_maps() or []
+
+        logger.info(f"Found {len(sitemap_urls)} sitemaps in {robots_url}")
+        return sitemap_urls
+
+
+    async def __parse_sitemap(
+        self,
+        sitemap_url: str,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+    ) -> tuple[list[SitemapEntry], list[str]] | None:
+        """Stream a sitemap or sitemap index and parse it incrementally.
+
+        Args:
+            sitemap_url: URL of the sitemap.
+            client: HTTP client used for the request.
+            semaphore: Semaphore for controlling concurrent request limits.
+
+        Returns:
+            tuple[list[SitemapEntry], list[str]] | None: Page entries and child sitemap URLs,
+                or None if the sitemap could not be fetched or parsed.
+        """
+
+        parser = ElementTree.XMLPullParser(events=("start", "end"))
+        root = None
+        decompressor = None
+        page_entries: list[SitemapEntry] = []
+        child_sitemaps: list[str] = []
+
+        async with semaphore:
+            try:
+                async with client.stream("GET", sitemap_url) as response:
+                    response.raise_for_status()
+
+                    # httpx undoes Content-Encoding; `.xml.gz` files are still gzip on the wire
+                    async for chunk in response.aiter_bytes():
+                        if decompressor is None:
+                            decompressor = (
+                                zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+                                if chunk.startswith(GZIP_MAGIC)
+                                else False
+                            )
+                        if decompressor:
+                            chunk = decompressor.decompress(chunk)
+
+                        parser.feed(chunk)
+                        root = self.__read_events(parser, root, page_entries, child_sitemaps)
+
+                parser.close()
+                self.__read_events(parser, root, page_entries, child_sitemaps)
+
+            except (httpx.HTTPError, ElementTree.ParseError, zlib.error) as e:
+                logger.warning(f"Failed to read sitemap {sitemap_url}: {e}")
+                self.failed_sitemap_count += 1
+                return None
+
+        self.sitemap_count += 1
+        logger.debug(
+            f"Parsed sitemap {sitemap_url}: {len(page_entries)} URLs, {len(child_sitemaps)} child sitemaps"
+        )
+
+        return page_entries, child_sitemaps
+
+
+    def __read_events(
+        self,
+        parser: ElementTree.XMLPullParser,
+        root: ElementTree.Element | None,
+        page_entries: list[SitemapEntry],
+        child_sitemaps: list[str],
+    ) -> ElementTree.Element | None:
+        """Consume the pending parser events, collecting `<url>` and `<sitemap>` elements.
+
+        Args:
+            parser: Incremental parser fed with the sitemap bytes.
+            root: Root element, or None until it has been seen.
+            page_entries: Receives the parsed page entries.
+            child_sitemaps: Receives the URLs of nested sitemaps.
+
+        Returns:
+            ElementTree.Element | None: Root element of the document.
+        """
+
+        for event, element in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = element
+                continue
+
+            tag = _local_name(element.tag)
+            if tag not in ("url", "sitemap"):
+                continue
+
+            fields = {_local_name(child.tag): (child.text or "").strip() for child in element}
+            location = fields.get("loc")
+
+            if location and tag == "url":
+                page_entries.append(
+                    SitemapEntry(
+                        url=location,
+                        lastmod=fields.get("lastmod") or None,
+                        priority=_parse_priority(fields.get("priority")),
+                    )
+                )
+            elif location:
+                child_sitemaps.append(location)
+
+            # Drop processed elements so the parsed tree never grows
+            if root is not None:
+                root.clear()
+
+        return root
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_priority(priority: str | None) -> float | None:
+    try:
+        return float(priority) if priority else None
+    except ValueError:
+        return None
\ No newline at end of file
@@ -0,0 +1,4 @@
+from .boilerplate import BoilerplateDetector, strip_boilerplate
+from .deduplication import NearDuplicateDetector, deduplicate_documents
+
+__all__ = ["BoilerplateDetector", "NearDuplicateDetector", "deduplicate_documents", "strip_boilerplate"]
\ No newline at end of file
@@ -0,0 +1,261 @@
+import hashlib
+import re
+from collections import Counter
+from typing import Iterable, Iterator
+
+import numpy as np
+import tiktoken
+from loguru import logger
+
+from src.slack_integrations_offline.domain.document import Document
+
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Runs of blank lines left behind once boilerplate lines are removed
+BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+
+CODE_FENCES = ("```", "~~~")
+
+# Thematic breaks, setext underlines and table separator rows such as "| --- | :---: |"
+RULE_PATTERN = re.compile(r"^\|?[\s:|*_=-]*[-*_=]{3,}[\s:|*_=-]*$")
+
+# Lines made of markdown markup only, such as bare list or blockquote markers
+MARKUP_ONLY_PATTERN = re.compile(r"^[\W_]*$")
+
+
+class BoilerplateDetector:
+    """Find the markdown lines repeated across a large fraction of the pages of a crawl.
+
+    Navigation menus, sidebars, version pickers and footers are rendered into the markdown of
+    every page they appear on. Counting, for each normalized line, the number of pages that
+    contain it separates them from the content: a line found on at least `min_page_fraction`
+    of the pages, and on at least `min_pages` of them, is boilerplate. Only runs of at least
+    `min_run_lines` consecutive boilerplate lines, blank lines aside, are removed: repeated
+    blocks are boilerplate, while a single repeated sentence may well be content.
+
+    Lines of fenced code blocks are never counted nor removed, since the same imports and
+    snippets legitimately appear on many pages, and neither is structural markdown: headings,
+    table rows, thematic breaks and bare list markers, which structure the page for
+    summarization and chunking and would leave broken tables behind.
+
+    Attributes:
+        min_page_fraction: Fraction of the pages a line must appear on to be boilerplate.
+        min_pages: Minimum number of pages a line must appear on to be boilerplate.
+        min_line_characters: Shorter normalized lines are ignored.
+        min_run_lines: Minimum number of consecutive boilerplate lines removed as a block.
+        page_count: Number of pages the detector was fitted on.
+        boilerplate_hashes: Hashes of the boilerplate lines.
+        removed_lines: Number of times each boilerplate line was removed, keyed by its text.
+    """
+
+    def __init__(
+        self,
+        min_page_fraction: float = 0.2,
+        min_pages: int = 10,
+        min_line_characters: int = 3,
+        min_run_lines: int = 2,
+    ) -> None:
+        if not 0.0 < min_page_fraction <= 1.0:
+            raise ValueError(f"The page fraction must be in (0, 1], got {min_page_fraction}")
+
+        self.min_page_fraction = min_page_fraction
+        self.min_pages = min_pages
+        self.min_line_characters = min_line_characters
+        self.min_run_lines = min_run_lines
+
+        self.page_count = 0
+        self.boilerplate_hashes: set[int] = set()
+        self.removed_lines: Counter[str] = Counter()
+
+
+    def fit(self, texts: Iterable[str]) -> "BoilerplateDetector":
+        """Count the pages each line appears on and select the boilerplate lines.
+
+        Args:
+            texts: Markdown content of every page of the crawl.
+
+        Returns:
+            BoilerplateDetector: The fitted detector.
+        """
+
+        page_hashes = []
+        for text in texts:
+            hashes = {line_hash for _, line_hash, _ in self.__candidate_lines(text)}
+            page_hashes.append(np.fromiter(hashes, dtype=np.uint64, count=len(hashes)))
+
+        self.page_count = len(page_hashes)
+        self.removed_lines = Counter()
+
+        if not page_hashes:
+            self.boilerplate_hashes = set()
+            return self
+
+        # One sort over every (page, line) pair is far lighter than a dictionary of counters
+        hashes, page_counts = np.unique(np.concatenate(page_hashes), return_counts=True)
+        min_count = max(self.min_pages, self.min_page_fraction * self.page_count)
+        self.boilerplate_hashes = set(hashes[page_counts >= min_count].tolist())
+
+        logger.info(
+            f"Found {len(self.boilerplate_hashes)} boilerplate lines repeated on at least "
+            f"{min_count:.0f}/{self.page_count} pages"
+        )
+
+        return self
+
+
+    def strip(self, text: str) -> str:
+        """Remove the blocks of boilerplate lines of a page.
+
+        Args:
+            text: Markdown content of the page.
+
+        Returns:
+            str: Content without its boilerplate blocks.
+        """
+
+        if not self.boilerplate_hashes:
+            return text
+
+        lines = text.split("\n")
+        removed_indices = set()
+        run: list[tuple[int, str]] = []
+
+        for index, line_hash, normalized_line in self.__candidate_lines(text):
+            if line_hash not in self.boilerplate_hashes:
+                self.__remove_run(run, removed_indices)
+                run = []
+                continue
+
+            # Only blank lines may separate the lines of a block
+            if run and any(lines[between].strip() for between in range(run[-1][0] + 1, index)):
+                self.__remove_run(run, removed_indices)
+                run = []
+
+            run.append((index, normalized_line))
+
+        self.__remove_run(run, removed_indices)
+
+        if not removed_indices:
+            return text
+
+        kept = "\n".join(line for index, line in enumerate(lines) if index not in removed_indices)
+
+        return BLANK_LINES_PATTERN.sub("\n\n", kept).strip()
+
+
+    def __candidate_lines(self, text: str) -> Iterator[tuple[int, int, str]]:
+        """Yield the lines of a page that may be boilerplate.
+
+        Args:
+            text: Markdown content of a page.
+
+        Yields:
+            tuple[int, int, str]: Index, 64-bit hash and normalized text of each line.
+        """
+
+        lines = text.split("\n")
+        in_code_block = False
+        in_table = False
+
+        for index, line in enumerate(lines):
+            normalized_line = WHITESPACE_PATTERN.sub(" ", line).strip().lower()
+
+            if normalized_line.startswith(CODE_FENCES):
+                in_code_block = not in_code_block
+                continue
+
+            # Tables without outer pipes start with a header row followed by a separator row
+            next_line = lines[index + 1].strip() if index + 1 < len(lines) else ""
+            if "|" in normalized_line and (in_table or _is_table_separator(next_line)):
+                in_table = True
+                continue
+
+            in_table = False
+
+            if (
+                in_code_block
+                or normalized_line.startswith(("#", "|"))
+                or len(normalized_line) < self.min_line_characters
+                or RULE_PATTERN.match(normalized_line)
+                or MARKUP_ONLY_PATTERN.match(normalized_line)
+            ):
+                continue
+
+            line_hash = int.from_bytes(
+                hashlib.blake2b(normalized_line.encode("utf-8"), digest_size=8).digest(), "little"
+            )
+
+            yield index, line_hash, normalized_line
+
+
+    def __remove_run(self, run: list[tuple[int, str]], removed_indices: set[int]) -> None:
+        """Mark a run of consecutive boilerplate lines for removal if it forms a block.
+
+        Args:
+            run: Index and normalized text of each line of the run.
+            removed_indices: Indices of the lines to remove, updated in place.
+        """
+
+        if len(run) < self.min_run_lines:
+            return
+
+        for index, normalized_line in run:
+            removed_indices.add(index)
+            self.removed_lines[normalized_line] += 1
+
+
+def _is_table_separator(line: str) -> bool:
+    return "|" in line and RULE_PATTERN.match(line) is not None
+
+
+def strip_boilerplate(
+    documents: Iterable[Document],
+    detector: BoilerplateDetector,
+    encoding: tiktoken.Encoding | None = None,
+) -> tuple[list[Document], dict[str, int]]:
+    """Fit a boilerplate detector on a crawl and strip the boilerplate of every document.
+
+    The size of the documents before and after stripping is measured in the same pass, so
+    lazily loaded documents are read only once.
+
+    Args:
+        documents: Documents of the crawl.
+        detector: Boilerplate detector, fitted on `documents`.
+        encoding: Tokenizer measuring the tokens saved, None to count characters only.
+
+    Returns:
+        tuple[list[Document], dict[str, int]]: Documents with their boilerplate lines removed,
+            in the same order, and the number of documents changed and of characters, and
+            tokens if an encoding is given, before and after stripping.
+    """
+
+    documents = list(documents)
+    detector.fit(document.content for document in documents)
+
+    stats = {"documents_changed": 0, "characters_before": 0, "characters_after": 0}
+    if encoding is not None:
+        stats.update(tokens_before=0, tokens_after=0)
+
+    stripped = []
+    for document in documents:
+        content = detector.strip(document.content)
+        tokens_before = len(encoding.encode_ordinary(document.content)) if encoding else 0
+
+        stats["characters_before"] += len(document.content)
+        stats["characters_after"] += len(content)
+
+        if content != document.content:
+            stats["documents_changed"] += 1
+            tokens_after = len(encoding.encode_ordinary(content)) if encoding else 0
+            document = document.model_copy(update={"content": content})
+        else:
+            tokens_after = tokens_before
+
+        if encoding is not None:
+            stats["tokens_before"] += tokens_before
+            stats["tokens_after"] += tokens_after
+
+        stripped.append(document)
+
+    return stripped, stats
@@ -0,0 +1,271 @@
+import re
+import zlib
+from typing import Iterable
+from urllib.parse import urlsplit
+
+import numpy as np
+from loguru import logger
+
+from src.slack_integrations_offline.domain.document import Document
+
+
+# Words of the normalized markdown; punctuation and markup are ignored
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Multiply-shift hashing keeps the upper 32 bits of a 64-bit product
+HASH_BITS = np.uint64(32)
+
+
+class NearDuplicateDetector:
+    """Group documents whose normalized markdown is nearly identical, with MinHash and LSH.
+
+    Each document is reduced to the set of hashed word `shingle_size`-grams of its
+    normalized markdown, summarized by a MinHash signature of `num_permutations` values.
+    Locality-sensitive hashing buckets the signatures by bands, so only documents sharing a
+    band are compared, and pairs whose estimated Jaccard similarity reaches `threshold` are
+    merged into clusters. Signatures are computed with numpy, so the cost per document is a
+    handful of vectorized operations and the comparison cost grows with the number of
+    duplicates rather than quadratically with the corpus.
+
+    Attributes:
+        threshold: Minimum estimated Jaccard similarity for two documents to be duplicates.
+        num_permutations: Number of MinHash values per signature.
+        shingle_size: Number of consecutive words per shingle.
+        num_bands: Number of LSH bands.
+        rows_per_band: Number of MinHash values per LSH band.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        num_permutations: int = 128,
+        shingle_size: int = 5,
+        seed: int = 42,
+    ) -> None:
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"The similarity threshold must be in (0, 1], got {threshold}")
+
+        self.threshold = threshold
+        self.num_permutations = num_permutations
+        self.shingle_size = shingle_size
+        self.num_bands, self.rows_per_band = _optimal_bands(threshold, num_permutations)
+
+        random_state = np.random.default_rng(seed)
+        # Odd multipliers make the multiply-shift hash functions pairwise independent
+        self._multipliers = random_state.integers(1, 2**63, num_permutations, dtype=np.uint64) | np.uint64(1)
+        self._offsets = random_state.integers(0, 2**63, num_permutations, dtype=np.uint64)
+
+
+    def signature(self, text: str) -> np.ndarray | None:
+        """Compute the MinHash signature of a text.
+
+        Args:
+            text: Markdown content.
+
+        Returns:
+            np.ndarray | None: Signature of `num_permutations` unsigned 32-bit values, or None
+                if the text has no words, since empty pages would all share one signature.
+        """
+
+        shingles = self.__shingles(text)
+        if shingles.size == 0:
+            return None
+
+        # Overflowing uint64 arithmetic is the intended modulo 2**64, computed in place
+        hashed = np.multiply.outer(shingles, self._multipliers)
+        hashed += self._offsets
+
+        # The shift is monotonic, so it is applied to the minimums only
+        return (hashed.min(axis=0) >> HASH_BITS).astype(np.uint32)
+
+
+    def find_clusters(self, signatures: list[np.ndarray | None]) -> list[list[int]]:
+        """Group near-duplicate signatures.
+
+        Args:
+            signatures: MinHash signatures, one per document. Documents without a signature
+                are never clustered.
+
+        Returns:
+            list[list[int]]: Indices of the documents of each cluster with at least two
+                documents, in ascending order.
+        """
+
+        # Positions in the signature matrix map back to document indices
+        document_indices = [
+            index for index, signature in enumerate(signatures) if signature is not None
+        ]
+        if not document_indices:
+            return []
+
+        matrix = np.stack([signatures[index] for index in document_indices])
+        parents = list(range(len(document_indices)))
+
+        def find(index: int) -> int:
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+
+        for band in range(self.num_bands):
+            columns = slice(band * self.rows_per_band, (band + 1) * self.rows_per_band)
+            buckets: dict[bytes, int] = {}
+
+            for index, band_values in enumerate(matrix[:, columns]):
+                key = band_values.tobytes()
+                first_index = buckets.setdefault(key, index)
+                if first_index == index:
+                    continue
+
+                first_root, root = find(first_index), find(index)
+                if first_root != root and self.similarity(matrix[first_index], matrix[index]) >= self.threshold:
+                    parents[max(first_root, root)] = min(first_root, root)
+
+        clusters: dict[int, list[int]] = {}
+        for index, document_index in enumerate(document_indices):
+            clusters.setdefault(find(index), []).append(document_index)
+
+        return [members for members in clusters.values() if len(members) > 1]
+
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """Estimate the Jaccard similarity of two documents from their signatures.
+
+        Args:
+            first: Signature of the first document.
+            second: Signature of the second document.
+
+        Returns:
+            float: Fraction of equal MinHash values.
+        """
+
+        return float(np.count_nonzero(first == second)) / len(first)
+
+
+    def __shingles(self, text: str) -> np.ndarray:
+        """Hash the distinct word shingles of a text.
+
+        Args:
+            text: Markdown content.
+
+        Returns:
+            np.ndarray: Unique 32-bit shingle hashes stored as uint64.
+        """
+
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        if not tokens:
+            return np.empty(0, dtype=np.uint64)
+
+        token_hashes = np.fromiter(
+            (zlib.crc32(token.encode("utf-8")) for token in tokens), dtype=np.uint64, count=len(tokens)
+        )
+
+        # Short documents are a single shingle
+        size = min(self.shingle_size, len(tokens))
+        windows = np.lib.stride_tricks.sliding_window_view(token_hashes, size)
+
+        with np.errstate(over="ignore"):
+            shingles = np.zeros(len(windows), dtype=np.uint64)
+            for position in range(size):
+                shingles = shingles * np.uint64(1_000_003) + windows[:, position]
+
+        return np.unique(shingles & np.uint64(0xFFFFFFFF))
+
+
+def deduplicate_documents(
+    documents: Iterable[Document], detector: NearDuplicateDetector
+) -> tuple[list[Document], list[list[str]]]:
+    """Keep one canonical document per group of near-duplicates and record the others as aliases.
+
+    The canonical document of a group is the one with the fewest path segments, then the
+    shortest URL, which drops versioned paths, print views and other variants in favor of
+    the plain page. The URLs of the other documents are added to its `aliases`.
+
+    Args:
+        documents: Documents to deduplicate.
+        detector: Near-duplicate detector.
+
+    Returns:
+        tuple[list[Document], list[list[str]]]: Deduplicated documents in their original order,
+            and the URLs of each duplicate group, canonical URL first.
+    """
+
+    documents = list(documents)
+    signatures = [detector.signature(document.content) for document in documents]
+    clusters = detector.find_clusters(signatures)
+
+    aliases_by_index: dict[int, list[str]] = {}
+    dropped: set[int] = set()
+    groups: list[list[str]] = []
+
+    for members in clusters:
+        members = sorted(members, key=lambda index: _canonical_rank(documents[index].metadata.url))
+        canonical, duplicates = members[0], members[1:]
+
+        aliases_by_index[canonical] = [
+            alias
+            for index in duplicates
+            for alias in [documents[index].metadata.url, *documents[index].metadata.aliases]
+        ]
+        dropped.update(duplicates)
+        groups.append([documents[index].metadata.url for index in members])
+
+    deduplicated = []
+    for index, document in enumerate(documents):
+        if index in dropped:
+            continue
+
+        if index in aliases_by_index:
+            aliases = list(dict.fromkeys(document.metadata.aliases + aliases_by_index[index]))
+            document = document.model_copy(
+                update={"metadata": document.metadata.model_copy(update={"aliases": aliases})}
+            )
+
+        deduplicated.append(document)
+
+    logger.info(
+        f"Near-duplicate detection: {len(documents)} documents | "
+        f"{sum(signature is None for signature in signatures)} without words, kept as is | "
+        f"{len(clusters)} duplicate groups | "
+        f"{len(dropped)} duplicates removed"
+    )
+
+    return deduplicated, groups
+
+
+def _canonical_rank(url: str) -> tuple[int, int, str]:
+    """Sort key preferring short, shallow URLs without a query string."""
+
+    parts = urlsplit(url)
+
+    return (len(parts.path.rstrip("/").split("/")) + bool(parts.query), len(url), url)
+
+
+def _optimal_bands(threshold: float, num_permutations: int) -> tuple[int, int]:
+    """Pick the LSH bands whose similarity cutoff is closest below the threshold.
+
+    A pair of documents with Jaccard similarity `s` shares at least one band with probability
+    `1 - (1 - s**r)**b`, which rises steeply around `(1 / b) ** (1 / r)`. Keeping that cutoff
+    just below the threshold favors recall; false positives are removed by the exact
+    signature comparison.
+
+    Args:
+        threshold: Similarity threshold.
+        num_permutations: Number of MinHash values per signature.
+
+    Returns:
+        tuple[int, int]: Number of bands and rows per band.
+    """
+
+    candidates = [
+        (num_bands, num_permutations // num_bands)
+        for num_bands in range(1, num_permutations + 1)
+        if num_permutations % num_bands == 0
+    ]
+    below = [
+        candidate for candidate in candidates
+        if (1 / candidate[0]) ** (1 / candidate[1]) <= threshold
+    ]
+
+    return max(below or candidates, key=lambda candidate: (1 / candidate[0]) ** (1 / candidate[1]))
\ No newline at end of file
@@ -3,6 +3,7 @@ from typing import Callable
 
 from src.slack_integrations_offline.domain.document import Document
 from src.slack_integrations_offline.applications.agents.summarization import SummarizationAgent
+from src.slack_integrations_offline.infrastructure.storage import SummaryCache, summary_cache_key
 
 
 class SummarizationGenerator:
@@ -15,6 +16,12 @@ class SummarizationGenerator:
         summarization_max_characters: Maximum character length for generated summaries.
         max_workers: Maximum number of concurrent workers for parallel processing.
         min_document_length: Minimum character length for documents to be summarized.
+        requests_per_minute: Requests per minute allowed by the provider, until its headers tell otherwise.
+        tokens_per_minute: Tokens per minute allowed by the provider, until its headers tell otherwise.
+        max_input_tokens: Documents with more content tokens are summarized by sections.
+        rate_limit_stats: Rate limiting counters of the last summarization run.
+        path_stats: Documents per summarization path and their latencies in the last run.
+        cache: Summary cache consulted before calling the language model, if any.
         pregeneration_filters: List of filter functions applied before summarization.
         postgeneration_filters: List of filter functions applied after summarization.
     """
@@ -25,11 +32,21 @@ class SummarizationGenerator:
         summarization_max_characters: int,
         max_workers: int = 10,
         min_document_length: int = 50,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 200_000,
+        cache: SummaryCache | None = None,
+        max_input_tokens: int = 12_000,
     ) -> None:
         self.summarization_model = summarization_model
         self.summarization_max_characters = summarization_max_characters
         self.max_workers = max_workers
         self.min_document_length = min_document_length
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_input_tokens = max_input_tokens
+        self.rate_limit_stats: dict[str, float | int] = {}
+        self.path_stats: dict[str, dict] = {}
+        self.cache = cache
 
         self.pregeneration_filters: list[Callable[[Document], bool]] = [
             lambda document: len(document.content) > self.min_document_length
@@ -128,6 +145,9 @@ class SummarizationGenerator:
         self, documents: list[Document], temperature: float = 0.0
     ) -> list[Document]:
         """Execute the summarization process using SummarizationAgent.
+
+        Documents whose summary is in the cache for the same content, model, prompts, length
+        and temperature are not sent to the agent, and new summaries are added to the cache.
     
         Args:
             documents: List of documents to summarize.
@@ -140,12 +160,57 @@ class SummarizationGenerator:
         summarization_agent = SummarizationAgent(
             max_characters=self.summarization_max_characters,
             model_id=self.summarization_model,
-            max_concurrent_requests=self.max_workers
+            max_concurrent_requests=self.max_workers,
+            requests_per_minute=self.requests_per_minute,
+            tokens_per_minute=self.tokens_per_minute,
+            max_input_tokens=self.max_input_tokens,
         )
 
+        cached_documents: list[Document] = []
+        cache_keys: dict[str, str] = {}
+        if self.cache is not None:
+            cache_keys = {
+                document.id: summary_cache_key(
+                    content_hash=document.content_hash,
+                    model_id=self.summarization_model,
+                    prompt_version=summarization_agent.prompt_version,
+                    max_characters=self.summarization_max_characters,
+                    temperature=temperature,
+                )
+                for document in documents
+            }
+            cached_summaries = self.cache.get_many(list(cache_keys.values()))
+
+            cached_documents = [
+                document.add_summary(cached_summaries[cache_keys[document.id]])
+                for document in documents
+                if cache_keys[document.id] in cached_summaries
+            ]
+            documents = [
+                document for document in documents if cache_keys[document.id] not in cached_summaries
+            ]
+
+            logger.info(
+                f"Found {len(cached_documents)} summaries in the cache, {len(documents)} to generate"
+            )
+
         logger.info(f"Summarizing {len(documents)} documents with temperature {temperature}")
 
-        summarized_documents = summarization_agent(documents, temperature)
+        summarized_documents = summarization_agent(documents, temperature) if documents else []
+        self.rate_limit_stats = summarization_agent.scheduler.stats()
+        self.path_stats = summarization_agent.stats()
+
+        if self.cache is not None:
+            self.cache.put_many(
+                {
+                    cache_keys[doc.id]: doc.summary
+                    for doc in summarized_documents
+                    if doc.summary is not None
+                },
+                model_id=self.summarization_model,
+            )
+
+        summarized_documents = cached_documents + summarized_documents
 
         valid_summarized_documents = [
             doc for doc in summarized_documents if doc.summary is not None
@@ -1,3 +1,4 @@
 from .document import Document, DocumentMetadata
+from .sitemap import SitemapEntry
 
-__all__ = ["Document", "DocumentMetadata"]
\ No newline at end of file
+__all__ = ["Document", "DocumentMetadata", "SitemapEntry"]
\ No newline at end of file
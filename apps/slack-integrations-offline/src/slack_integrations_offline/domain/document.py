@@ -1,9 +1,15 @@
 import json
 
 from pathlib import Path
-from pydantic import BaseModel, Field
+from typing import Any
 
-from src.slack_integrations_offline.utils import generate_random_hex
+from pydantic import BaseModel, Field, computed_field, model_validator
+
+from src.slack_integrations_offline.utils import (
+    compute_content_hash,
+    generate_document_id,
+    generate_random_hex,
+)
 
 
 class DocumentMetadata(BaseModel):
@@ -14,12 +20,14 @@ class DocumentMetadata(BaseModel):
         url: Source URL of the document.
         title: Title of the document.
         properties: Additional metadata properties as key-value pairs.
+        aliases: Other URLs serving the same content, merged by near-duplicate detection.
     """
 
     id: str
     url: str
     title: str
     properties: dict
+    aliases: list[str] = Field(default_factory=list)
 
 
 class Document(BaseModel):
@@ -28,12 +36,15 @@ class Document(BaseModel):
     Represents a crawled or extracted document with its content, metadata, summary, and relationships.
     
     Attributes:
-        id: Unique identifier for the document, auto-generated as 32-character hex string.
+        id: Unique identifier for the document, a 32-character hex string derived from the
+            URL when not given, so the same page keeps its identity across crawls.
         metadata: DocumentMetadata object containing document information.
         content: Main text content of the document.
         summary: Optional generated summary of the document content.
         content_quality_score: Optional quality score for the content.
         child_urls: List of child URLs discovered within the document.
+        content_hash: SHA-256 hex digest of the content, serialized with the document so
+            later stages can skip documents whose content did not change.
     """
 
     id: str = Field(default_factory=lambda: generate_random_hex(length=32))
@@ -44,6 +55,37 @@ class Document(BaseModel):
     child_urls: list[str] = Field(default_factory=list)
 
 
+    @model_validator(mode="before")
+    @classmethod
+    def derive_id_from_url(cls, data: Any) -> Any:
+        """Derive a missing document ID from the URL of the document.
+    
+        Args:
+            data: Raw input of the model.
+        
+        Returns:
+            Any: Input with an `id` stable for the document URL, when it had none.
+        """
+
+        if not isinstance(data, dict) or data.get("id"):
+            return data
+
+        metadata = data.get("metadata")
+        url = metadata.get("url") if isinstance(metadata, dict) else getattr(metadata, "url", None)
+        if url:
+            data = {**data, "id": generate_document_id(url)}
+
+        return data
+
+
+    @computed_field
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 hex digest of the content."""
+
+        return compute_content_hash(self.content)
+
+
     @classmethod
     def from_file(cls, file_path: Path) -> "Document":
         """Load a Document instance from a JSON file.
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class SitemapEntry(BaseModel):
+    """A URL listed in a sitemap, together with its sitemap metadata.
+    
+    Attributes:
+        url: Location of the page.
+        lastmod: Last modification date declared by the sitemap, if any.
+        priority: Priority relative to the other URLs of the site, between 0.0 and 1.0, if declared.
+    """
+
+    url: str
+    lastmod: str | None = None
+    priority: float | None = None
\ No newline at end of file
@@ -1,27 +1,86 @@
+import hashlib
+import json
 import os
+import shutil
 import tempfile
+import threading
 import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from itertools import batched
 from pathlib import Path
 from typing import Union
 
 import boto3
 import botocore
 import botocore.config
+from boto3.s3.transfer import TransferConfig
 from loguru import logger
+from pydantic import BaseModel
 
 from src.slack_integrations_offline.config import settings
 
 
+MANIFEST_FILE_NAME = "manifest.json"
+
+# Maximum number of keys of a single DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
+
+class S3SyncResult(BaseModel):
+    """Summary of an incremental folder sync to S3.
+    
+    Attributes:
+        manifest_key: S3 key of the manifest describing the synced folder.
+        uploaded_objects: Number of objects uploaded.
+        uploaded_bytes: Number of bytes uploaded.
+        skipped_objects: Number of files skipped because their content already exists remotely.
+        skipped_bytes: Number of bytes skipped.
+        deleted_objects: Number of objects deleted because the new manifest no longer uses them.
+    """
+
+    manifest_key: str
+    uploaded_objects: int = 0
+    uploaded_bytes: int = 0
+    skipped_objects: int = 0
+    skipped_bytes: int = 0
+    deleted_objects: int = 0
+
+
+class S3DownloadResult(BaseModel):
+    """Summary of a folder restored from an incremental S3 sync.
+    
+    Attributes:
+        manifest_key: S3 key of the manifest describing the restored folder.
+        downloaded_objects: Number of files downloaded.
+        downloaded_bytes: Number of bytes downloaded.
+        skipped_objects: Number of files skipped because an identical local copy exists.
+        skipped_bytes: Number of bytes skipped.
+        removed_objects: Number of local files removed because they are not in the manifest.
+    """
+
+    manifest_key: str
+    downloaded_objects: int = 0
+    downloaded_bytes: int = 0
+    skipped_objects: int = 0
+    skipped_bytes: int = 0
+    removed_objects: int = 0
+
+
 class S3Client:
     """Client for interacting with AWS S3 storage for file operations.
     
     Handles uploading folders as zip archives, bucket management, and presigned URL generation.
+
+    Archives are streamed straight into a parallel multipart upload by default, so
+    compression and network transfer overlap and no temporary zip is written to disk.
+    Folders can also be synced incrementally as content-addressed objects with a manifest.
+    Both layouts can be restored locally, using unsigned requests for public buckets.
     
     Attributes:
         bucket_name: Name of the S3 bucket to interact with.
         region: AWS region for the S3 bucket.
         no_sign_request: Whether to use unsigned requests for public buckets.
-        s3_client: Boto3 S3 client instance for API operations.
+        s3_client: Boto3 S3 client instance for API operations, shared by concurrent transfers.
     """
 
     def __init__(
@@ -29,19 +88,24 @@ class S3Client:
         bucket_name: str, 
         no_sign_request: bool = False,
         region: str = settings.AWS_DEFAULT_REGION,
+        max_pool_connections: int = 32,
     ) -> None:
         
         self.bucket_name = bucket_name
         self.region = region
         self.no_sign_request = no_sign_request
 
+        # Boto3 clients are thread-safe; size the connection pool for concurrent transfers
+        client_config = botocore.config.Config(max_pool_connections=max_pool_connections)
+
         if no_sign_request:
             # Use unsigned mode for public buckets
             self.s3_client = boto3.client(
                 "s3",
                 region_name = self.region,
-                config = botocore.config.Config(signature_version=botocore.UNSIGNED)
-
+                config = client_config.merge(
+                    botocore.config.Config(signature_version=botocore.UNSIGNED)
+                ),
             )
 
         else:
@@ -51,15 +115,27 @@ class S3Client:
             region_name = self.region,
             aws_access_key_id = settings.AWS_ACCESS_KEY,
             aws_secret_access_key = settings.AWS_SECRET_KEY,
+            config = client_config,
             )
 
     
-    def upload_folder(self, local_path: Union[str, Path], s3_prefix: str = "") -> str:
+    def upload_folder(
+        self,
+        local_path: Union[str, Path],
+        s3_prefix: str = "",
+        streaming: bool = True,
+        part_size_mb: int = 16,
+        max_concurrency: int = 8,
+    ) -> str:
         """Upload a local folder to S3 as a compressed zip archive.
     
         Args:
             local_path: Path to the local folder to upload.
             s3_prefix: S3 prefix path where the zip file will be stored.
+            streaming: Stream the archive into a multipart upload instead of writing a temporary
+                zip file first. Defaults to True.
+            part_size_mb: Size of each multipart upload part in MB, at least 5. Defaults to 16.
+            max_concurrency: Maximum number of parts uploaded in parallel. Defaults to 8.
         
         Returns:
             str: S3 key path of the uploaded zip file.
@@ -76,23 +152,28 @@ class S3Client:
         if not local_path.is_dir():
             raise NotADirectoryError(f"Local path is not a directory: {local_path}")
         
+        zip_filename = f"{local_path.name}.zip"
+        s3_key = f"{s3_prefix.rstrip('/')}/{zip_filename}".lstrip("/")
 
-        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as temp_zip:
-            with zipfile.ZipFile(temp_zip.name, "w", zipfile.ZIP_DEFLATED) as zip_file:
-                # walk through all files in the directory 
-                for root, _, files in os.walk(local_path):
-                    for file_name in files:
-                        file_path = Path(root) / file_name
-                    
-                        zip_file.write(file_path, file_path.relative_to(local_path))
+        logger.debug(
+            f"Uploading {local_path} to {self.bucket_name} with key {s3_key}"
+        )
 
+        if streaming:
+            with MultipartUploadWriter(
+                s3_client=self.s3_client,
+                bucket_name=self.bucket_name,
+                s3_key=s3_key,
+                part_size=part_size_mb * 1024 * 1024,
+                max_concurrency=max_concurrency,
+                extra_args={"ACL": "public-read"},
+            ) as upload_stream:
+                self.__write_zip_archive(local_path, upload_stream)
 
-            zip_filename = f"{local_path.name}.zip"
-            s3_key = f"{s3_prefix.rstrip('/')}/{zip_filename}".lstrip("/")
+            return s3_key
 
-            logger.debug(
-                f"Uploading {local_path} to {self.bucket_name} with key {s3_key}"
-            )
+        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as temp_zip:
+            self.__write_zip_archive(local_path, temp_zip.name)
 
             self.s3_client.upload_file(
                 temp_zip.name, 
@@ -108,6 +189,371 @@ class S3Client:
         return s3_key
 
 
+    def sync_folder(
+        self,
+        local_path: Union[str, Path],
+        s3_prefix: str = "",
+        max_concurrency: int = 16,
+        delete_orphans: bool = True,
+    ) -> S3SyncResult:
+        """Incrementally sync a local folder to S3 as content-addressed objects.
+
+        Every file is stored under `<s3_prefix>/objects/<sha256>`, and files whose hash
+        already exists remotely are skipped. A manifest at `<s3_prefix>/manifest.json`
+        maps each relative file path to its hash and size, so the folder can be restored.
+        Only files with the same bytes are skipped, so the folder should be written
+        deterministically, e.g. with a bucketed `JsonlDocumentStore`.
+    
+        Args:
+            local_path: Path to the local folder to sync.
+            s3_prefix: S3 prefix path where the objects and the manifest will be stored.
+            max_concurrency: Maximum number of files hashed and uploaded in parallel. Defaults to 16.
+            delete_orphans: Whether to delete the objects no longer referenced by the new
+                manifest once it is written. Defaults to True.
+        
+        Returns:
+            S3SyncResult: Keys, object and byte counts of uploaded and skipped files.
+        """
+
+        self.__create_bucket_if_doesnt_exist()
+
+        local_path = Path(local_path)
+
+        if not local_path.is_dir():
+            raise NotADirectoryError(f"Local path is not a directory: {local_path}")
+
+        s3_prefix = s3_prefix.rstrip("/")
+        objects_prefix = f"{s3_prefix}/objects/".lstrip("/")
+        result = S3SyncResult(manifest_key=f"{s3_prefix}/{MANIFEST_FILE_NAME}".lstrip("/"))
+
+        file_paths = {
+            file_path.relative_to(local_path).as_posix(): file_path
+            for file_path in sorted(local_path.rglob("*"))
+            if file_path.is_file()
+        }
+
+        existing_keys = self.__list_keys(objects_prefix)
+        manifest_files = {}
+        pending_uploads: dict[str, Path] = {}
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            digests = executor.map(compute_sha256, file_paths.values())
+
+            for (relative_path, file_path), digest in zip(file_paths.items(), digests):
+                size = file_path.stat().st_size
+                manifest_files[relative_path] = {"sha256": digest, "size": size}
+
+                object_key = f"{objects_prefix}{digest}"
+                if object_key in existing_keys or object_key in pending_uploads:
+                    result.skipped_objects += 1
+                    result.skipped_bytes += size
+                else:
+                    pending_uploads[object_key] = file_path
+                    result.uploaded_objects += 1
+                    result.uploaded_bytes += size
+
+            # Each upload runs single-threaded; concurrency comes from the executor
+            transfer_config = TransferConfig(use_threads=False)
+            uploads = [
+                executor.submit(
+                    self.s3_client.upload_file,
+                    str(file_path),
+                    self.bucket_name,
+                    object_key,
+                    ExtraArgs={"ACL": "public-read"},
+                    Config=transfer_config,
+                )
+                for object_key, file_path in pending_uploads.items()
+            ]
+
+            for upload in uploads:
+                upload.result()
+
+        self.s3_client.put_object(
+            Bucket=self.bucket_name,
+            Key=result.manifest_key,
+            Body=json.dumps({"files": manifest_files}, indent=4).encode("utf-8"),
+            ContentType="application/json",
+            ACL="public-read",
+        )
+
+        if delete_orphans:
+            referenced_keys = {
+                f"{objects_prefix}{entry['sha256']}" for entry in manifest_files.values()
+            }
+            result.deleted_objects = self.__delete_keys(sorted(existing_keys - referenced_keys))
+
+        logger.info(
+            f"Synced {local_path} to {self.bucket_name}/{s3_prefix}: "
+            f"{result.uploaded_objects} objects uploaded ({result.uploaded_bytes} bytes) | "
+            f"{result.skipped_objects} objects skipped ({result.skipped_bytes} bytes) | "
+            f"{result.deleted_objects} orphan objects deleted"
+        )
+
+        return result
+
+
+    def download_folder(
+        self,
+        s3_key: str,
+        local_path: Union[str, Path],
+        part_size_mb: int = 16,
+        max_concurrency: int = 8,
+    ) -> Path:
+        """Download a zip archive uploaded by `upload_folder` and extract it into a local folder.
+
+        The archive is read through concurrent ranged GETs and extracted while it downloads,
+        so it is never written to disk as a whole. Zip CRC-32 checksums are verified for every
+        extracted file. The archive is extracted into a fresh directory that replaces the local
+        folder once complete, so no stale file of a previous download is left behind.
+    
+        Args:
+            s3_key: S3 key of the zip archive.
+            local_path: Folder where the archive is extracted.
+            part_size_mb: Size of each ranged GET in MB. Defaults to 16.
+            max_concurrency: Maximum number of ranged GETs in flight. Defaults to 8.
+        
+        Returns:
+            Path: Path of the local folder.
+        """
+
+        local_path = Path(local_path)
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        extract_path = Path(
+            tempfile.mkdtemp(prefix=f".{local_path.name}.", suffix=".download", dir=local_path.parent)
+        )
+
+        logger.debug(f"Downloading {self.bucket_name}/{s3_key} into {local_path}")
+
+        try:
+            with RangedDownloadReader(
+                s3_client=self.s3_client,
+                bucket_name=self.bucket_name,
+                s3_key=s3_key,
+                part_size=part_size_mb * 1024 * 1024,
+                max_concurrency=max_concurrency,
+            ) as download_stream:
+                with zipfile.ZipFile(download_stream) as zip_file:
+                    members = zip_file.infolist()
+                    zip_file.extractall(extract_path)
+
+            _replace_directory(extract_path, local_path)
+
+        except BaseException:
+            shutil.rmtree(extract_path, ignore_errors=True)
+            raise
+
+        logger.info(
+            f"Extracted {len(members)} files ({download_stream.size} bytes downloaded) "
+            f"from {self.bucket_name}/{s3_key} into {local_path}"
+        )
+
+        return local_path
+
+
+    def download_shards(
+        self,
+        local_path: Union[str, Path],
+        s3_prefix: str = "",
+        max_concurrency: int = 16,
+    ) -> S3DownloadResult:
+        """Restore a folder synced by `sync_folder`, verifying each file against the manifest.
+
+        Local files that already match the manifest hash are kept, and missing or changed
+        files are downloaded concurrently into a staging directory next to the folder. Only
+        once every download is verified are they moved into place and the files not listed
+        in the manifest removed, so a failed restore leaves the folder as it was.
+    
+        Args:
+            local_path: Folder to restore.
+            s3_prefix: S3 prefix where the objects and the manifest are stored.
+            max_concurrency: Maximum number of files hashed and downloaded in parallel. Defaults to 16.
+        
+        Returns:
+            S3DownloadResult: Object and byte counts of downloaded, skipped and removed files.
+        
+        Raises:
+            ValueError: If a manifest entry points outside `local_path`, or if a downloaded
+                file does not match its manifest checksum.
+        """
+
+        local_path = Path(local_path)
+        local_path.mkdir(parents=True, exist_ok=True)
+
+        s3_prefix = s3_prefix.rstrip("/")
+        objects_prefix = f"{s3_prefix}/objects/".lstrip("/")
+        result = S3DownloadResult(manifest_key=f"{s3_prefix}/{MANIFEST_FILE_NAME}".lstrip("/"))
+
+        response = self.s3_client.get_object(Bucket=self.bucket_name, Key=result.manifest_key)
+        manifest_files: dict[str, dict] = json.loads(response["Body"].read())["files"]
+
+        # The manifest may come from a public bucket, so its paths are not trusted
+        for relative_path in manifest_files:
+            _resolve_within(local_path, relative_path)
+
+        def is_up_to_date(relative_path: str) -> bool:
+            file_path = local_path / relative_path
+            entry = manifest_files[relative_path]
+
+            return (
+                file_path.is_file()
+                and file_path.stat().st_size == entry["size"]
+                and compute_sha256(file_path) == entry["sha256"]
+            )
+
+        staging_path = Path(
+            tempfile.mkdtemp(prefix=f".{local_path.name}.", suffix=".download", dir=local_path.parent)
+        )
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                pending_downloads = []
+                for relative_path, up_to_date in zip(
+                    manifest_files, executor.map(is_up_to_date, manifest_files)
+                ):
+                    entry = manifest_files[relative_path]
+
+                    if up_to_date:
+                        result.skipped_objects += 1
+                        result.skipped_bytes += entry["size"]
+                    else:
+                        pending_downloads.append(
+                            executor.submit(
+                                self.__download_object,
+                                f"{objects_prefix}{entry['sha256']}",
+                                staging_path / relative_path,
+                                entry["sha256"],
+                            )
+                        )
+                        result.downloaded_objects += 1
+                        result.downloaded_bytes += entry["size"]
+
+                for download in pending_downloads:
+                    download.result()
+
+            for staged_path in sorted(staging_path.rglob("*")):
+                if staged_path.is_file():
+                    destination = local_path / staged_path.relative_to(staging_path)
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(staged_path, destination)
+
+        finally:
+            shutil.rmtree(staging_path, ignore_errors=True)
+
+        for file_path in sorted(local_path.rglob("*")):
+            relative_path = file_path.relative_to(local_path).as_posix()
+            if file_path.is_file() and relative_path not in manifest_files:
+                file_path.unlink()
+                result.removed_objects += 1
+
+        logger.info(
+            f"Restored {local_path} from {self.bucket_name}/{s3_prefix}: "
+            f"{result.downloaded_objects} objects downloaded ({result.downloaded_bytes} bytes) | "
+            f"{result.skipped_objects} objects skipped ({result.skipped_bytes} bytes) | "
+            f"{result.removed_objects} stale files removed"
+        )
+
+        return result
+
+
+    def __download_object(self, s3_key: str, destination: Path, expected_sha256: str) -> None:
+        """Stream an object into a local file, checking its SHA-256 before moving it in place.
+    
+        Args:
+            s3_key: S3 key of the object to download.
+            destination: Local file path to write.
+            expected_sha256: Hex digest the object content must match.
+        
+        Raises:
+            ValueError: If the downloaded content does not match the expected digest.
+        """
+
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = destination.with_name(f".{destination.name}.download")
+
+        digest = hashlib.sha256()
+        body = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)["Body"]
+
+        with open(temp_path, "wb") as f:
+            for chunk in body.iter_chunks(chunk_size=1024 * 1024):
+                digest.update(chunk)
+                f.write(chunk)
+
+        if digest.hexdigest() != expected_sha256:
+            temp_path.unlink()
+            raise ValueError(
+                f"Checksum mismatch for {self.bucket_name}/{s3_key}: "
+                f"expected {expected_sha256}, got {digest.hexdigest()}"
+            )
+
+        os.replace(temp_path, destination)
+
+
+    def __list_keys(self, s3_prefix: str) -> set[str]:
+        """List every object key under a prefix.
+    
+        Args:
+            s3_prefix: S3 prefix to list.
+        
+        Returns:
+            set[str]: Keys of the objects found.
+        """
+
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+
+        return {
+            s3_object["Key"]
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=s3_prefix)
+            for s3_object in page.get("Contents", [])
+        }
+
+
+    def __delete_keys(self, s3_keys: list[str]) -> int:
+        """Delete objects in batches of the maximum size of a `DeleteObjects` request.
+    
+        Args:
+            s3_keys: Keys of the objects to delete.
+        
+        Returns:
+            int: Number of objects deleted.
+        
+        Raises:
+            RuntimeError: If some objects could not be deleted.
+        """
+
+        for batch in batched(s3_keys, DELETE_BATCH_SIZE):
+            response = self.s3_client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={"Objects": [{"Key": s3_key} for s3_key in batch], "Quiet": True},
+            )
+
+            if response.get("Errors"):
+                raise RuntimeError(
+                    f"Failed to delete {len(response['Errors'])} objects from {self.bucket_name}: "
+                    f"{response['Errors'][0]}"
+                )
+
+        return len(s3_keys)
+
+
+    def __write_zip_archive(self, local_path: Path, destination) -> None:
+        """Write every file under a folder into a deflate-compressed zip archive.
+    
+        Args:
+            local_path: Path to the local folder to archive.
+            destination: File path or writable file object receiving the archive. Non-seekable
+                streams are supported.
+        """
+
+        with zipfile.ZipFile(destination, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            # walk through all files in the directory 
+            for root, _, files in os.walk(local_path):
+                for file_name in files:
+                    file_path = Path(root) / file_name
+                
+                    zip_file.write(file_path, file_path.relative_to(local_path))
+
+
     def __create_bucket_if_doesnt_exist(self) -> None:
         """Check if the S3 bucket exists and create it if it doesn't.
     
@@ -148,3 +594,340 @@ class S3Client:
         return url
 
 
+
+
+
+def compute_sha256(file_path: Path) -> str:
+    """Compute the SHA-256 hex digest of a file, reading it in chunks.
+    
+    Args:
+        file_path: Path of the file to hash.
+    
+    Returns:
+        str: Hex digest of the file content.
+    """
+
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _resolve_within(root: Path, relative_path: str) -> Path:
+    """Resolve a relative path, rejecting paths that escape the root directory.
+    
+    Args:
+        root: Directory the path must stay within.
+        relative_path: Path relative to `root`, as listed in a manifest.
+    
+    Returns:
+        Path: Resolved absolute path.
+    
+    Raises:
+        ValueError: If the path is absolute or resolves outside `root`.
+    """
+
+    root = root.resolve()
+    path = (root / relative_path).resolve()
+
+    if Path(relative_path).is_absolute() or not path.is_relative_to(root) or path == root:
+        raise ValueError(f"Manifest entry '{relative_path}' points outside of {root}")
+
+    return path
+
+
+def _replace_directory(source: Path, destination: Path) -> None:
+    """Move a directory in place of another one, removing the replaced directory.
+    
+    Args:
+        source: Directory to move.
+        destination: Directory to replace, which may not exist.
+    """
+
+    replaced_path = None
+    if destination.exists():
+        replaced_path = destination.with_name(f"{source.name}.old")
+        os.replace(destination, replaced_path)
+
+    os.replace(source, destination)
+
+    if replaced_path is not None:
+        shutil.rmtree(replaced_path)
+
+
+class MultipartUploadWriter:
+    """Write-only, non-seekable file object that streams its bytes into an S3 multipart upload.
+
+    Bytes are buffered until a part is full, and full parts are uploaded by a thread pool
+    while the caller keeps writing. The number of parts in flight is bounded by
+    `max_concurrency`, so memory usage stays around `part_size * (max_concurrency + 1)`.
+    The upload is completed on `close()` and aborted if the context exits with an error.
+
+    Attributes:
+        bucket_name: Name of the destination S3 bucket.
+        s3_key: Key of the destination object.
+        part_size: Size of each uploaded part in bytes.
+        bytes_written: Total number of bytes written so far.
+    """
+
+    MIN_PART_SIZE = 5 * 1024 * 1024
+
+    def __init__(
+        self,
+        s3_client,
+        bucket_name: str,
+        s3_key: str,
+        part_size: int = 16 * 1024 * 1024,
+        max_concurrency: int = 8,
+        extra_args: dict | None = None,
+    ) -> None:
+        if part_size < self.MIN_PART_SIZE:
+            raise ValueError(f"Part size must be at least {self.MIN_PART_SIZE} bytes.")
+
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.s3_key = s3_key
+        self.part_size = part_size
+        self.bytes_written = 0
+
+        self._buffer = bytearray()
+        self._parts: list[Future] = []
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._in_flight = threading.BoundedSemaphore(max_concurrency)
+        self._closed = False
+
+        response = self.s3_client.create_multipart_upload(
+            Bucket=self.bucket_name, Key=self.s3_key, **(extra_args or {})
+        )
+        self._upload_id = response["UploadId"]
+
+
+    def __enter__(self) -> "MultipartUploadWriter":
+        return self
+
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+    def writable(self) -> bool:
+        return True
+
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self.bytes_written += len(data)
+
+        while len(self._buffer) >= self.part_size:
+            self.__submit_part(bytes(self._buffer[: self.part_size]))
+            del self._buffer[: self.part_size]
+
+        return len(data)
+
+
+    def flush(self) -> None:
+        pass
+
+
+    def close(self) -> None:
+        """Upload the remaining bytes and complete the multipart upload."""
+
+        if self._closed:
+            return
+
+        try:
+            # S3 requires at least one part, which may be smaller than the minimum part size
+            if self._buffer or not self._parts:
+                self.__submit_part(bytes(self._buffer))
+                self._buffer.clear()
+
+            parts = [part.result() for part in self._parts]
+
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=self.s3_key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+
+        except Exception:
+            self.abort()
+            raise
+
+        finally:
+            self._executor.shutdown(wait=True)
+            self._closed = True
+
+        logger.debug(
+            f"Completed multipart upload of {self.bytes_written} bytes in {len(parts)} parts "
+            f"to {self.bucket_name}/{self.s3_key}"
+        )
+
+
+    def abort(self) -> None:
+        """Abort the multipart upload and discard the uploaded parts."""
+
+        if self._closed:
+            return
+
+        wait(self._parts)
+        self._executor.shutdown(wait=True)
+        self._closed = True
+
+        self.s3_client.abort_multipart_upload(
+            Bucket=self.bucket_name, Key=self.s3_key, UploadId=self._upload_id
+        )
+        logger.warning(f"Aborted multipart upload to {self.bucket_name}/{self.s3_key}")
+
+
+    def __submit_part(self, data: bytes) -> None:
+        self._in_flight.acquire()
+
+        part_number = len(self._parts) + 1
+        part = self._executor.submit(self.__upload_part, part_number, data)
+        part.add_done_callback(lambda _: self._in_flight.release())
+
+        self._parts.append(part)
+
+
+    def __upload_part(self, part_number: int, data: bytes) -> dict:
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket_name,
+            Key=self.s3_key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+
+class RangedDownloadReader:
+    """Read-only, seekable file object that reads an S3 object through concurrent ranged GETs.
+
+    The object is split into fixed-size parts. Reading a part prefetches the following ones
+    in a thread pool, so consumers reading mostly forward, such as `zipfile`, overlap their
+    processing with the network transfer. Parts behind the current position are dropped,
+    keeping memory usage around `part_size * (max_concurrency + 1)`.
+
+    Attributes:
+        bucket_name: Name of the source S3 bucket.
+        s3_key: Key of the source object.
+        part_size: Size of each ranged GET in bytes.
+        size: Size of the object in bytes.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        bucket_name: str,
+        s3_key: str,
+        part_size: int = 16 * 1024 * 1024,
+        max_concurrency: int = 8,
+    ) -> None:
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.s3_key = s3_key
+        self.part_size = part_size
+
+        self._max_concurrency = max_concurrency
+        self._position = 0
+        self._parts: dict[int, Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+        response = self.s3_client.head_object(Bucket=self.bucket_name, Key=self.s3_key)
+        self.size = response["ContentLength"]
+        self._etag = response["ETag"]
+
+
+    def __enter__(self) -> "RangedDownloadReader":
+        return self
+
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+    def readable(self) -> bool:
+        return True
+
+
+    def seekable(self) -> bool:
+        return True
+
+
+    def tell(self) -> int:
+        return self._position
+
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_SET:
+            position = offset
+        elif whence == os.SEEK_CUR:
+            position = self._position + offset
+        elif whence == os.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+
+        self._position = position
+        return self._position
+
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None or size < 0:
+            size = self.size - self._position
+
+        end = min(self._position + size, self.size)
+        chunks = []
+
+        while self._position < end:
+            part_index = self._position // self.part_size
+            part = self.__get_part(part_index)
+
+            offset = self._position - part_index * self.part_size
+            chunk = part[offset : offset + end - self._position]
+
+            chunks.append(chunk)
+            self._position += len(chunk)
+
+        return b"".join(chunks)
+
+
+    def close(self) -> None:
+        for part in self._parts.values():
+            part.cancel()
+
+        self._parts.clear()
+        self._executor.shutdown(wait=True)
+
+
+    def __get_part(self, part_index: int) -> bytes:
+        for stale_index in [index for index in self._parts if index < part_index]:
+            self._parts.pop(stale_index).cancel()
+
+        last_index = (self.size - 1) // self.part_size
+        for index in range(part_index, min(part_index + self._max_concurrency, last_index + 1)):
+            if index not in self._parts:
+                self._parts[index] = self._executor.submit(self.__download_part, index)
+
+        return self._parts[part_index].result()
+
+
+    def __download_part(self, part_index: int) -> bytes:
+        start = part_index * self.part_size
+        end = min(start + self.part_size, self.size) - 1
+
+        # Pin the ETag so an object replaced mid-download fails instead of mixing versions
+        response = self.s3_client.get_object(
+            Bucket=self.bucket_name,
+            Key=self.s3_key,
+            Range=f"bytes={start}-{end}",
+            IfMatch=self._etag,
+        )
+
+        return response["Body"].read()
@@ -0,0 +1,3 @@
+from .documents import DocumentListMaterializer, LazyDocumentList
+
+__all__ = ["DocumentListMaterializer", "LazyDocumentList"]
\ No newline at end of file
@@ -0,0 +1,206 @@
+import gzip
+import json
+import os
+import zlib
+from typing import Any, Callable, ClassVar, Generator, IO
+
+from zenml.enums import ArtifactType
+from zenml.materializers.base_materializer import BaseMaterializer
+from zenml.metadata.metadata_types import MetadataType, StorageSize
+
+from src.slack_integrations_offline.domain.document import Document
+
+
+INDEX_FILE_NAME = "documents.jsonl.gz"
+CONTENTS_FILE_NAME = "contents.bin"
+
+
+class LazyDocumentList(list):
+    """List of documents whose content is read from the artifact store only when accessed.
+
+    Length, indexing and iteration work directly on the lightweight index. Iteration reads
+    contents sequentially, one document at a time. Any other list operation first loads
+    every document into memory, after which the object behaves like a regular list.
+
+    Attributes:
+        entries: Index entries holding each document without its content and the position
+            of its compressed content in the contents file.
+    """
+
+    def __init__(
+        self, entries: list[dict], contents_path: str, open_file: Callable[[str, str], IO]
+    ) -> None:
+        super().__init__()
+        self.entries = entries
+        self._contents_path = contents_path
+        self._open_file = open_file
+        self._materialized = False
+
+
+    def __len__(self) -> int:
+        if self._materialized:
+            return super().__len__()
+
+        return len(self.entries)
+
+
+    def __iter__(self) -> Generator[Document, None, None]:
+        if self._materialized:
+            yield from super().__iter__()
+            return
+
+        with self._open_file(self._contents_path, "rb") as contents_file:
+            for entry in self.entries:
+                yield self.__build_document(entry, contents_file)
+
+
+    def __getitem__(self, index: int | slice) -> Document | list[Document]:
+        if self._materialized:
+            return super().__getitem__(index)
+
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        entry = self.entries[index]
+        with self._open_file(self._contents_path, "rb") as contents_file:
+            return self.__build_document(entry, contents_file)
+
+
+    def __reduce__(self) -> tuple:
+        return (list, (list(iter(self)),))
+
+
+    def materialize(self) -> None:
+        """Load every document into memory so the object behaves like a regular list."""
+
+        if not self._materialized:
+            documents = list(iter(self))
+            self._materialized = True
+            super().extend(documents)
+
+
+    def __build_document(self, entry: dict, contents_file: IO) -> Document:
+        contents_file.seek(entry["offset"])
+        content = zlib.decompress(contents_file.read(entry["length"])).decode("utf-8")
+
+        return Document.model_validate({**entry["document"], "content": content})
+
+
+def _materializing(method_name: str) -> Callable:
+    list_method = getattr(list, method_name)
+
+    def method(self: LazyDocumentList, *args, **kwargs) -> Any:
+        self.materialize()
+        return list_method(self, *args, **kwargs)
+
+    method.__name__ = method_name
+    return method
+
+
+for _method_name in (
+    "__contains__", "__delitem__", "__eq__", "__iadd__", "__add__", "__mul__", "__ne__",
+    "__repr__", "__reversed__", "__setitem__", "append", "clear", "copy", "count",
+    "extend", "index", "insert", "pop", "remove", "reverse", "sort",
+):
+    setattr(LazyDocumentList, _method_name, _materializing(_method_name))
+
+
+class DocumentListMaterializer(BaseMaterializer):
+    """ZenML materializer storing `list[Document]` artifacts as a compact index plus contents file.
+
+    The index is a gzip-compressed JSONL file holding every document without its content.
+    Contents are compressed individually and appended to a single binary file, so a
+    document's content can be read on its own without decompressing the others.
+
+    Not registered globally, as it would replace the built-in materializer of every
+    `list`. Steps opt in with `@step(output_materializers=DocumentListMaterializer)`.
+    """
+
+    ASSOCIATED_TYPES: ClassVar[tuple[type[Any], ...]] = (list,)
+    ASSOCIATED_ARTIFACT_TYPE: ClassVar[ArtifactType] = ArtifactType.DATA
+    SKIP_REGISTRATION: ClassVar[bool] = True
+
+    COMPRESSION_LEVEL: ClassVar[int] = 3
+
+
+    def load(self, data_type: type[Any]) -> LazyDocumentList:
+        """Load the document index and defer reading contents until they are accessed.
+
+        Args:
+            data_type: Type of the artifact to load.
+
+        Returns:
+            LazyDocumentList: Documents backed by the artifact store.
+        """
+
+        with self.artifact_store.open(os.path.join(self.uri, INDEX_FILE_NAME), "rb") as f:
+            entries = [json.loads(line) for line in gzip.decompress(f.read()).splitlines()]
+
+        return LazyDocumentList(
+            entries=entries,
+            contents_path=os.path.join(self.uri, CONTENTS_FILE_NAME),
+            open_file=self.artifact_store.open,
+        )
+
+
+    def save(self, data: list[Document]) -> None:
+        """Write the documents as an index file and a contents file.
+
+        Args:
+            data: Documents to store.
+        """
+
+        offset = 0
+        index_lines = []
+
+        with self.artifact_store.open(os.path.join(self.uri, CONTENTS_FILE_NAME), "wb") as f:
+            for document in data:
+                compressed_content = zlib.compress(
+                    document.content.encode("utf-8"), self.COMPRESSION_LEVEL
+                )
+                f.write(compressed_content)
+
+                index_lines.append(
+                    json.dumps(
+                        {
+                            "document": document.model_dump(exclude={"content"}),
+                            "offset": offset,
+                            "length": len(compressed_content),
+                        },
+                        ensure_ascii=False,
+                    )
+                )
+                offset += len(compressed_content)
+
+        with self.artifact_store.open(os.path.join(self.uri, INDEX_FILE_NAME), "wb") as f:
+            f.write(
+                gzip.compress(
+                    "\n".join(index_lines).encode("utf-8"), self.COMPRESSION_LEVEL
+                )
+            )
+
+
+    def extract_metadata(self, data: list[Document]) -> dict[str, MetadataType]:
+        """Extract document count and content sizes.
+
+        Args:
+            data: Documents being stored.
+
+        Returns:
+            dict[str, MetadataType]: Artifact metadata.
+        """
+
+        content_bytes = sum(len(document.content.encode("utf-8")) for document in data)
+        compressed_content_bytes = self.artifact_store.size(
+            os.path.join(self.uri, CONTENTS_FILE_NAME)
+        )
+
+        metadata: dict[str, MetadataType] = {
+            "count": len(data),
+            "content_size": StorageSize(content_bytes),
+        }
+
+        if compressed_content_bytes is not None:
+            metadata["compressed_content_size"] = StorageSize(compressed_content_bytes)
+
+        return metadata
@@ -1,4 +1,5 @@
-from .service import MongoDBService
+from .client import close_mongodb_clients, get_mongodb_client
+from .service import DocumentStream, IngestionResult, MongoDBService
 from .indexes import MongodbIndex
 
-__all__=['MongoDBService', 'MongodbIndex']
\ No newline at end of file
+__all__=['close_mongodb_clients', 'get_mongodb_client', 'DocumentStream', 'IngestionResult', 'MongoDBService', 'MongodbIndex']
\ No newline at end of file
@@ -0,0 +1,67 @@
+import atexit
+import threading
+
+from loguru import logger
+from pymongo import MongoClient
+
+from src.slack_integrations_offline.config import settings
+
+
+_clients: dict[str, MongoClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_mongodb_client(mongodb_uri: str = settings.MONGODB_URI) -> MongoClient:
+    """Get the process-wide MongoClient for a connection URI, creating it on first use.
+
+    MongoClient is thread-safe and owns its own connection pool, so a single instance per
+    URI is shared by every service, index manager and vector store in the process.
+    
+    Args:
+        mongodb_uri: MongoDB connection URI. Defaults to settings.MONGODB_URI.
+    
+    Returns:
+        MongoClient: Shared, connected client for the URI.
+    """
+
+    with _clients_lock:
+        client = _clients.get(mongodb_uri)
+
+        if client is None:
+            try:
+                client = MongoClient(
+                    mongodb_uri,
+                    appname="slack_integrations",
+                    maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+                    minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+                    serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+                    connectTimeoutMS=settings.MONGODB_CONNECT_TIMEOUT_MS,
+                )
+                client.admin.command("ping")
+
+            except Exception as e:
+                logger.error(f"Failed to connect to MongoDB: {e}")
+                raise
+
+            _clients[mongodb_uri] = client
+            logger.info(
+                f"Created shared MongoDB client with max pool size {settings.MONGODB_MAX_POOL_SIZE}"
+            )
+
+        return client
+
+
+def close_mongodb_clients() -> None:
+    """Close every shared MongoClient. Registered to run at interpreter exit.
+
+    Nothing is logged, since the logging sinks may already be closed at exit.
+    """
+
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+
+        _clients.clear()
+
+
+atexit.register(close_mongodb_clients)
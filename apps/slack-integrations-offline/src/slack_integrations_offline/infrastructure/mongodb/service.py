@@ -1,14 +1,76 @@
-from typing import Generic, Type, TypeVar
+import random
+import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import batched
+from typing import Any, Generator, Generic, Iterator, Type, TypeVar
 from bson import ObjectId
 
 from loguru import logger
-from pydantic import BaseModel
-from pymongo import MongoClient, errors
+from pydantic import BaseModel, TypeAdapter
+from pymongo import ASCENDING, InsertOne, ReplaceOne, errors
 
 from src.slack_integrations_offline.config import settings
+from src.slack_integrations_offline.infrastructure.mongodb.client import get_mongodb_client
 
 T = TypeVar("T", bound=BaseModel)
 
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+
+class IngestionResult(BaseModel):
+    """Summary of a bulk ingestion into a MongoDB collection.
+    
+    Attributes:
+        inserted_count: Number of documents inserted, including upserted ones.
+        updated_count: Number of existing documents replaced.
+        failed_count: Number of documents that could not be written.
+        unchanged_count: Number of documents skipped because their stored content hash matches.
+        elapsed_seconds: Wall-clock duration of the ingestion.
+        documents_per_second: Ingestion throughput over all written documents.
+    """
+
+    inserted_count: int = 0
+    updated_count: int = 0
+    failed_count: int = 0
+    unchanged_count: int = 0
+    elapsed_seconds: float = 0.0
+    documents_per_second: float = 0.0
+
+
+class DocumentStream(Generic[T]):
+    """Iterator over the documents of a `MongoDBService.stream_documents` cursor.
+
+    Each stream tracks its own position, so concurrent streams of one service can be
+    resumed independently.
+
+    Attributes:
+        last_id: `_id` of the last document yielded, to pass as `start_after` when resuming.
+            Documents keep their own stored `id`, so the cursor `_id` is only available here.
+    """
+
+    def __init__(self, documents: Iterator[tuple[str | None, T]]) -> None:
+        self.last_id: str | None = None
+
+        self._documents = documents
+
+
+    def __iter__(self) -> "DocumentStream[T]":
+        return self
+
+
+    def __next__(self) -> T:
+        _id, document = next(self._documents)
+        self.last_id = _id
+
+        return document
+
+
+    def close(self) -> None:
+        """Close the underlying cursor."""
+
+        self._documents.close()
+
 
 class MongoDBService(Generic[T]):
     """Generic service for MongoDB operations with Pydantic model support.
@@ -20,9 +82,10 @@ class MongoDBService(Generic[T]):
         collection_name: Name of the MongoDB collection.
         database_name: Name of the MongoDB database.
         mongodb_uri: MongoDB connection URI.
-        client: MongoClient instance for database connection.
+        client: Shared MongoClient instance for database connection.
         database: MongoDB database instance.
         collection: MongoDB collection instance.
+        projection: Default MongoDB projection limiting fetched fields to the model fields.
     """
 
     def __init__(
@@ -39,8 +102,7 @@ class MongoDBService(Generic[T]):
         self.mongodb_uri = mongodb_uri
 
         try: 
-            self.client = MongoClient(mongodb_uri, appname="slack_integrations")
-            self.client.admin.command("ping")
+            self.client = get_mongodb_client(mongodb_uri)
 
         except Exception as e:
             logger.error(f"Failed to initialize MongoDBService: {e}")
@@ -49,6 +111,9 @@ class MongoDBService(Generic[T]):
         self.database = self.client[database_name]
         self.collection = self.database[collection_name]
 
+        # Only fetch fields the model knows about; `id` falls back to `_id` when not stored
+        self.projection = {field: 1 for field in model.model_fields}
+
         logger.info(
             f"Connected to MongoDB instance:\n URI: {mongodb_uri}\n Database: {database_name}\n Collection: {collection_name}"
         )
@@ -64,7 +129,7 @@ class MongoDBService(Generic[T]):
     
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        """Exit context manager and close database connection.
+        """Exit context manager and release the database connection.
     
         Args:
             exc_type: Exception type if an exception occurred.
@@ -95,36 +160,233 @@ class MongoDBService(Generic[T]):
             raise
 
     
-    def ingest_documents(self, documents: list[T]) -> None:
-        """Insert multiple Pydantic model documents into the collection.
+    def delete_missing(self, documents: list[T], upsert_key: str) -> int:
+        """Delete the stored documents whose key is not among the given documents.
+
+        Used after an upsert ingestion of the full document set, so documents of pages
+        removed from the source do not linger in the collection.
     
         Args:
-            documents: List of Pydantic model instances to insert.
+            documents: Pydantic model instances to keep.
+            upsert_key: Dotted field path identifying documents, e.g. "metadata.url".
         
         Returns:
-            None
+            int: Number of documents deleted.
         
         Raises:
-            ValueError: If documents are not valid Pydantic models.
-            errors.PyMongoError: If insertion operation fails.
+            errors.PyMongoError: If deletion operation fails.
         """
-        
-        try:
-            if not documents or not all(isinstance(doc, BaseModel) for doc in documents):
-                raise ValueError("Documents must be a list of Pydantic models.")
-            
-            dict_documents = [ doc.model_dump() for doc in documents]
 
-            for doc in dict_documents:
-                doc.pop("_id", None)
+        top_level_field = upsert_key.split(".")[0]
+        keys = [
+            _get_field(document.model_dump(include={top_level_field}), upsert_key)
+            for document in documents
+        ]
 
-            self.collection.insert_many(dict_documents)
-            logger.debug(f"Inserted {len(documents)} documents into MongoDB.")
+        try:
+            result = self.collection.delete_many({upsert_key: {"$nin": keys}})
+            logger.debug(f"Deleted {result.deleted_count} documents missing from {len(keys)} keys.")
 
         except errors.PyMongoError as e:
-            logger.error(f"Error inserting documents: {e}")
+            logger.error(f"Error deleting missing documents: {e}")
             raise
 
+        return result.deleted_count
+
+
+    def ingest_documents(
+        self,
+        documents: list[T],
+        batch_size: int = 500,
+        max_workers: int = 4,
+        upsert_key: str | None = None,
+        max_retries: int = 3,
+        skip_unchanged: bool = False,
+    ) -> IngestionResult:
+        """Write multiple Pydantic model documents into the collection in parallel bulk batches.
+
+        Batches are sent as unordered bulk writes, so an invalid document only fails itself
+        instead of aborting the rest of the batch. When `upsert_key` is set, documents
+        replace the existing document with the same key value instead of being inserted,
+        and with `skip_unchanged` documents whose stored `content_hash` is identical are
+        not written at all.
+    
+        Args:
+            documents: List of Pydantic model instances to write.
+            batch_size: Number of documents per bulk write. Defaults to 500.
+            max_workers: Maximum number of batches in flight at the same time. Defaults to 4.
+            upsert_key: Dotted field path used to match existing documents, e.g. "metadata.url". Defaults to None.
+            max_retries: Maximum number of retries per batch on transient errors. Defaults to 3.
+            skip_unchanged: Whether to skip documents whose `content_hash` matches the stored
+                document with the same `upsert_key`. Defaults to False.
+        
+        Returns:
+            IngestionResult: Inserted, updated, unchanged and failed counts with the ingestion throughput.
+        
+        Raises:
+            ValueError: If documents are not valid Pydantic models, or if `skip_unchanged` is
+                set without an `upsert_key`.
+        """
+        
+        if not documents or not all(isinstance(doc, BaseModel) for doc in documents):
+            raise ValueError("Documents must be a list of Pydantic models.")
+
+        if skip_unchanged and not upsert_key:
+            raise ValueError("Skipping unchanged documents requires an upsert key.")
+        
+        if upsert_key:
+            self.collection.create_index(upsert_key)
+
+        start_time = time.perf_counter()
+        result = IngestionResult()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self.__write_batch, list(batch), upsert_key, max_retries, skip_unchanged
+                )
+                for batch in batched(documents, batch_size)
+            ]
+
+            for future in as_completed(futures):
+                batch_result = future.result()
+                result.inserted_count += batch_result.inserted_count
+                result.updated_count += batch_result.updated_count
+                result.failed_count += batch_result.failed_count
+                result.unchanged_count += batch_result.unchanged_count
+
+        result.elapsed_seconds = time.perf_counter() - start_time
+        written_count = result.inserted_count + result.updated_count
+        result.documents_per_second = written_count / max(result.elapsed_seconds, 1e-9)
+
+        logger.debug(
+            f"Ingested {len(documents)} documents into MongoDB: "
+            f"{result.inserted_count} inserted | {result.updated_count} updated | "
+            f"{result.unchanged_count} unchanged | {result.failed_count} failed | {result.documents_per_second:.1f} docs/s"
+        )
+
+        return result
+
+
+    def __write_batch(
+        self,
+        documents: list[T],
+        upsert_key: str | None,
+        max_retries: int,
+        skip_unchanged: bool = False,
+    ) -> IngestionResult:
+        """Write a single batch with an unordered bulk write, retrying transient errors.
+
+        Inserted documents keep the `_id` assigned on the first attempt, so a retry after a
+        partially applied batch reports the already written documents as duplicates, which
+        are counted as inserted rather than failed.
+    
+        Args:
+            documents: Batch of Pydantic model instances to write.
+            upsert_key: Dotted field path used to match existing documents, or None to insert.
+            max_retries: Maximum number of retries on transient errors.
+            skip_unchanged: Whether to skip documents whose stored `content_hash` is identical.
+        
+        Returns:
+            IngestionResult: Inserted, updated, unchanged and failed counts for the batch.
+        """
+
+        dict_documents = [doc.model_dump() for doc in documents]
+
+        for doc in dict_documents:
+            doc.pop("_id", None)
+
+        unchanged_count = 0
+        if skip_unchanged:
+            changed_documents = self.__drop_unchanged(dict_documents, upsert_key)
+            unchanged_count = len(dict_documents) - len(changed_documents)
+            dict_documents = changed_documents
+
+            if not dict_documents:
+                return IngestionResult(unchanged_count=unchanged_count)
+
+        if upsert_key:
+            operations = [
+                ReplaceOne({upsert_key: _get_field(doc, upsert_key)}, doc, upsert=True)
+                for doc in dict_documents
+            ]
+        else:
+            operations = [InsertOne(doc) for doc in dict_documents]
+
+        for attempt in range(max_retries + 1):
+            try:
+                bulk_result = self.collection.bulk_write(operations, ordered=False)
+
+                return IngestionResult(
+                    inserted_count=bulk_result.inserted_count + bulk_result.upserted_count,
+                    updated_count=bulk_result.matched_count,
+                    unchanged_count=unchanged_count,
+                )
+
+            except errors.BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                already_written = [
+                    error for error in write_errors
+                    if attempt > 0 and not upsert_key and error.get("code") == DUPLICATE_KEY_ERROR_CODE
+                ]
+                failed_count = len(write_errors) - len(already_written)
+
+                if failed_count:
+                    logger.error(
+                        f"Failed to write {failed_count} documents in batch: {write_errors[0].get('errmsg')}"
+                    )
+
+                return IngestionResult(
+                    inserted_count=e.details.get("nInserted", 0) + e.details.get("nUpserted", 0) + len(already_written),
+                    updated_count=e.details.get("nMatched", 0),
+                    failed_count=failed_count,
+                    unchanged_count=unchanged_count,
+                )
+
+            except errors.PyMongoError as e:
+                is_transient = isinstance(e, errors.ConnectionFailure) or e.has_error_label(
+                    "RetryableWriteError"
+                )
+
+                if not is_transient or attempt == max_retries:
+                    logger.error(f"Error writing batch of {len(documents)} documents: {e}")
+                    return IngestionResult(
+                        failed_count=len(dict_documents), unchanged_count=unchanged_count
+                    )
+
+                backoff_seconds = min(2 ** attempt, 30) * random.uniform(0.5, 1.5)
+                logger.warning(
+                    f"Transient error writing batch (attempt {attempt + 1}/{max_retries}), "
+                    f"retrying in {backoff_seconds:.1f}s: {e}"
+                )
+                time.sleep(backoff_seconds)
+
+
+    def __drop_unchanged(self, documents: list[dict], upsert_key: str) -> list[dict]:
+        """Drop the documents whose stored version has the same content hash.
+    
+        Args:
+            documents: Batch of document dictionaries to write.
+            upsert_key: Dotted field path matching the stored documents.
+        
+        Returns:
+            list[dict]: Documents that are new or whose content changed.
+        """
+
+        keys = [_get_field(doc, upsert_key) for doc in documents]
+        stored_hashes = {
+            _get_field(stored, upsert_key): stored.get("content_hash")
+            for stored in self.collection.find(
+                {upsert_key: {"$in": keys}}, projection={upsert_key: 1, "content_hash": 1, "_id": 0}
+            )
+        }
+
+        return [
+            doc
+            for key, doc in zip(keys, documents)
+            if doc.get("content_hash") is None or stored_hashes.get(key) != doc["content_hash"]
+        ]
+
 
     def fetch_documents(self, limit: int | None = None, query: dict = None) -> list[T]:
         """Fetch documents from collection and parse them into Pydantic models.
@@ -137,14 +399,79 @@ class MongoDBService(Generic[T]):
             list[T]: List of parsed Pydantic model instances.
         """
         
-        try:
-            documents = list(self.collection.find(query).limit(limit or 0))
-            logger.debug(f"Fetched {len(documents)} documents with query: {query}")
+        documents = list(self.stream_documents(query=query, limit=limit))
+        logger.debug(f"Fetched {len(documents)} documents with query: {query}")
+
+        return documents
 
-            return self.__parsed_documents(documents)
+
+    def stream_documents(
+        self,
+        query: dict | None = None,
+        limit: int | None = None,
+        batch_size: int = 100,
+        projection: dict | None = None,
+        start_after: str | None = None,
+    ) -> "DocumentStream[T]":
+        """Stream documents from collection as parsed Pydantic models.
+
+        Documents are read through a server-side cursor sorted by `_id`, so only one
+        batch is held in memory at a time and an interrupted run can be resumed from
+        the `last_id` of the returned stream.
+    
+        Args:
+            query: MongoDB query filter dictionary. Defaults to None.
+            limit: Maximum number of documents to stream. None for no limit. Defaults to None.
+            batch_size: Number of documents fetched from the server per round trip. Defaults to 100.
+            projection: MongoDB projection restricting the returned fields. Defaults to the model fields.
+            start_after: `_id` of the last processed document, as recorded in the `last_id`
+                of a previous stream; only documents after it are streamed. Defaults to None.
         
-        except Exception as e:
-            logger.error(f"Error fetching documents: {e}")
+        Returns:
+            DocumentStream[T]: Iterator over the parsed Pydantic model instances in ascending
+                `_id` order, with its own resume token.
+        
+        Raises:
+            errors.PyMongoError: If the cursor fails while streaming.
+        """
+
+        return DocumentStream(
+            self.__stream_with_ids(query, limit, batch_size, projection, start_after)
+        )
+
+
+    def __stream_with_ids(
+        self,
+        query: dict | None,
+        limit: int | None,
+        batch_size: int,
+        projection: dict | None,
+        start_after: str | None,
+    ) -> Generator[tuple[str | None, T], None, None]:
+        """Stream parsed documents along with their `_id`, see `stream_documents`."""
+
+        query = query or {}
+        if start_after is not None:
+            query = {"$and": [query, {"_id": {"$gt": ObjectId(start_after)}}]}
+
+        try:
+            cursor = (
+                self.collection.find(
+                    query, projection=projection or self.projection, batch_size=batch_size
+                )
+                .sort("_id", ASCENDING)
+                .limit(limit or 0)
+            )
+
+            with cursor:
+                for batch in batched(cursor, batch_size):
+                    # Decoding drops `_id`, so the resume tokens are taken beforehand
+                    ids = [str(doc["_id"]) if "_id" in doc else None for doc in batch]
+
+                    yield from zip(ids, self.__parsed_documents(list(batch)))
+
+        except errors.PyMongoError as e:
+            logger.error(f"Error streaming documents: {e}")
             raise
 
     
@@ -158,19 +485,7 @@ class MongoDBService(Generic[T]):
             list[T]: List of validated Pydantic model instances.
         """
         
-        parsed_documents = []
-        for doc in documents:
-            for key, value in doc.items():
-                if isinstance(value, ObjectId):
-                    doc[key] = str(value)
-
-            _id = doc.pop("_id", None)
-            doc["id"] = _id
-
-            parsed_doc = self.model.model_validate(doc)
-            parsed_documents.append(parsed_doc)
-        
-        return parsed_documents
+        return decode_documents(self.model, documents)
     
 
     def get_collection_count(self) -> int:
@@ -192,7 +507,65 @@ class MongoDBService(Generic[T]):
 
         
     def close(self) -> None:
-        """Close the MongoDB client connection."""
+        """Release the MongoDB client connection.
+
+        The client is shared across the process, so it is kept open for reuse and only
+        closed at interpreter exit by `close_mongodb_clients`.
+        """
         
-        self.client.close()
-        logger.debug("Closed MongoDB connection.")
\ No newline at end of file
+        logger.debug("Released MongoDB connection.")
+
+
+def _get_field(document: dict, field_path: str) -> Any:
+    """Resolve a dotted field path such as "metadata.url" inside a document dictionary.
+    
+    Args:
+        document: Document dictionary to read from.
+        field_path: Dot-separated path to the field.
+    
+    Returns:
+        Any: Value stored at the field path.
+    """
+
+    value = document
+    for key in field_path.split("."):
+        value = value[key]
+
+    return value
+
+
+
+def decode_documents(model: Type[T], documents: list[dict]) -> list[T]:
+    """Decode raw MongoDB documents into validated Pydantic model instances in a single pass.
+
+    `_id` is converted to the string `id` field of documents stored without one, and the
+    whole list is validated at once through a cached `TypeAdapter`.
+    
+    Args:
+        model: Pydantic model type to decode into.
+        documents: List of raw MongoDB document dictionaries. Modified in place.
+    
+    Returns:
+        list[T]: List of validated Pydantic model instances.
+    """
+
+    for doc in documents:
+        _id = doc.pop("_id", None)
+        if _id is not None and not doc.get("id"):
+            doc["id"] = str(_id)
+
+    return _get_list_adapter(model).validate_python(documents)
+
+
+@lru_cache(maxsize=None)
+def _get_list_adapter(model: Type[T]) -> TypeAdapter:
+    """Get the cached `TypeAdapter` validating a list of the given model.
+    
+    Args:
+        model: Pydantic model type of the list items.
+    
+    Returns:
+        TypeAdapter: Adapter for `list[model]`.
+    """
+
+    return TypeAdapter(list[model])
@@ -0,0 +1,25 @@
+from .crawl_ledger import CrawlFailure, CrawlFailureLedger, CrawlLedger, CrawlLedgerEntry
+from .document_store import (
+    DocumentStore,
+    DocumentWriter,
+    JsonDocumentStore,
+    JsonlDocumentStore,
+    ShardMemoryMonitor,
+    get_document_store,
+)
+from .summary_cache import SummaryCache, summary_cache_key
+
+__all__ = [
+    "CrawlFailure",
+    "CrawlFailureLedger",
+    "CrawlLedger",
+    "CrawlLedgerEntry",
+    "DocumentStore",
+    "DocumentWriter",
+    "JsonDocumentStore",
+    "JsonlDocumentStore",
+    "ShardMemoryMonitor",
+    "SummaryCache",
+    "get_document_store",
+    "summary_cache_key",
+]
\ No newline at end of file
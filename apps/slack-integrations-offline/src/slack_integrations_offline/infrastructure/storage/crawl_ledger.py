@@ -0,0 +1,194 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from loguru import logger
+from pydantic import BaseModel, TypeAdapter
+
+
+class CrawlLedgerEntry(BaseModel):
+    """Crawl state of a single URL, used to decide whether it must be crawled again.
+
+    Attributes:
+        url: Crawled URL.
+        document_id: ID of the document produced for the URL, kept stable across crawls.
+        lastmod: Sitemap `lastmod` value seen at the last successful crawl.
+        etag: `ETag` response header of the last successful crawl.
+        last_modified: `Last-Modified` response header of the last successful crawl.
+        content_hash: SHA-256 hex digest of the extracted content.
+        last_success_at: Time of the last successful crawl or validation.
+    """
+
+    url: str
+    document_id: str
+    lastmod: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+    last_success_at: datetime | None = None
+
+
+class CrawlLedger:
+    """Per-URL crawl state persisted as a JSON file between incremental crawls.
+
+    Attributes:
+        path: Path of the ledger file.
+        entries: Ledger entries keyed by URL.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.entries: dict[str, CrawlLedgerEntry] = {}
+
+        if self.path.exists():
+            raw_entries = json.loads(self.path.read_text(encoding="utf-8"))
+            self.entries = {
+                entry.url: entry
+                for entry in TypeAdapter(list[CrawlLedgerEntry]).validate_python(raw_entries)
+            }
+
+        logger.debug(f"Loaded crawl ledger '{self.path}' with {len(self.entries)} URLs")
+
+
+    def get(self, url: str) -> CrawlLedgerEntry | None:
+        """Get the crawl state of a URL.
+
+        Args:
+            url: URL to look up.
+
+        Returns:
+            CrawlLedgerEntry | None: Entry of the URL, or None if it was never crawled.
+        """
+
+        return self.entries.get(url)
+
+
+    def update(self, entry: CrawlLedgerEntry) -> None:
+        """Insert or replace the crawl state of a URL.
+
+        Args:
+            entry: New entry for the URL.
+        """
+
+        self.entries[entry.url] = entry
+
+
+    def prune(self, is_listed: Callable[[str], bool]) -> int:
+        """Remove the entries of URLs that are no longer crawled.
+
+        Args:
+            is_listed: Whether a URL is still part of the crawl.
+
+        Returns:
+            int: Number of entries removed.
+        """
+
+        removed_urls = [url for url in self.entries if not is_listed(url)]
+        for url in removed_urls:
+            del self.entries[url]
+
+        return len(removed_urls)
+
+
+    def save(self) -> None:
+        """Atomically write the ledger to disk."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f".{self.path.name}.tmp")
+
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                [entry.model_dump(mode="json") for entry in self.entries.values()],
+                f,
+                indent=4,
+                ensure_ascii=False,
+            )
+
+        os.replace(temp_path, self.path)
+
+        logger.debug(f"Saved crawl ledger '{self.path}' with {len(self.entries)} URLs")
+
+
+class CrawlFailure(BaseModel):
+    """A URL that could not be crawled, with the reason of its last failure.
+
+    Attributes:
+        url: URL that failed.
+        reason: Failure category, such as "timeout", "http_404" or "error".
+        error: Error message of the last attempt, if any.
+        status_code: HTTP status code of the last attempt, if a response was received.
+        attempts: Number of attempts made.
+        transient: Whether the failure is considered transient.
+        failed_at: Time of the last failed attempt.
+    """
+
+    url: str
+    reason: str
+    error: str | None = None
+    status_code: int | None = None
+    attempts: int = 1
+    transient: bool = False
+    failed_at: datetime
+
+
+class CrawlFailureLedger:
+    """URLs that failed to crawl, persisted as a JSON file so reruns can retry just them.
+
+    Attributes:
+        path: Path of the ledger file.
+        failures: Failures keyed by URL.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.failures: dict[str, CrawlFailure] = {}
+
+        if self.path.exists():
+            raw_failures = json.loads(self.path.read_text(encoding="utf-8"))
+            self.failures = {
+                failure.url: failure
+                for failure in TypeAdapter(list[CrawlFailure]).validate_python(raw_failures)
+            }
+
+        logger.debug(f"Loaded crawl failure ledger '{self.path}' with {len(self.failures)} URLs")
+
+
+    def record_failure(self, failure: CrawlFailure) -> None:
+        """Insert or replace the failure of a URL.
+
+        Args:
+            failure: Latest failure of the URL.
+        """
+
+        self.failures[failure.url] = failure
+
+
+    def record_success(self, url: str) -> None:
+        """Forget the failure of a URL that was crawled successfully.
+
+        Args:
+            url: URL crawled successfully.
+        """
+
+        self.failures.pop(url, None)
+
+
+    def save(self) -> None:
+        """Atomically write the ledger to disk."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f".{self.path.name}.tmp")
+
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                [failure.model_dump(mode="json") for failure in self.failures.values()],
+                f,
+                indent=4,
+                ensure_ascii=False,
+            )
+
+        os.replace(temp_path, self.path)
+
+        logger.debug(f"Saved crawl failure ledger '{self.path}' with {len(self.failures)} URLs")
@@ -0,0 +1,647 @@
+import gzip
+import json
+import os
+import shutil
+import zlib
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import batched
+from pathlib import Path
+from typing import BinaryIO, Callable, Generator, Iterable
+
+import psutil
+from loguru import logger
+
+from src.slack_integrations_offline.domain.document import Document
+from src.slack_integrations_offline.utils import generate_random_hex
+
+
+MANIFEST_FILE_NAME = "manifest.json"
+
+# Number of legacy JSON files read and validated together by a single worker task
+JSON_FILES_PER_TASK = 64
+
+# Receives the manifest entry (`file`, `count`, `bytes`) of each shard once it is written
+ShardCallback = Callable[[dict], None]
+
+
+class ShardMemoryMonitor:
+    """Shard callback recording the process memory usage after each written shard.
+
+    Streaming writers keep memory bounded by the shard and concurrency sizes; the recorded
+    RSS makes that visible per shard in step metadata.
+
+    Attributes:
+        shards: Manifest entries of the written shards, each with the `rss_mb` measured
+            right after the shard was closed.
+        start_rss_mb: Process RSS in MB when the monitor was created.
+    """
+
+    def __init__(self) -> None:
+        self.shards: list[dict] = []
+
+        self._process = psutil.Process(os.getpid())
+        self.start_rss_mb = self._process.memory_info().rss // (1024 * 1024)
+
+
+    def __call__(self, shard: dict) -> None:
+        rss_mb = self._process.memory_info().rss // (1024 * 1024)
+        self.shards.append({**shard, "rss_mb": rss_mb})
+
+        logger.debug(
+            f"Wrote shard '{shard['file']}' with {shard['count']} documents. "
+            f"Current process memory usage: {rss_mb} MB"
+        )
+
+
+    @property
+    def peak_rss_mb(self) -> int:
+        """Highest RSS in MB measured after a shard, or at creation if no shard was written."""
+
+        return max([self.start_rss_mb] + [shard["rss_mb"] for shard in self.shards])
+
+
+class DocumentWriter(ABC):
+    """Incremental writer that persists documents one at a time.
+
+    Used as a context manager: documents are committed when the context exits cleanly
+    and discarded if it exits with an exception.
+
+    Attributes:
+        directory: Directory the documents are written to.
+        count: Number of documents written so far.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.count = 0
+
+
+    def __enter__(self) -> "DocumentWriter":
+        return self
+
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+    @abstractmethod
+    def write(self, document: Document) -> None:
+        """Write a single document.
+
+        Args:
+            document: Document to persist.
+        """
+
+
+    def close(self) -> None:
+        """Flush pending data and commit the written documents."""
+
+
+    def abort(self) -> None:
+        """Discard documents written by this writer where the format allows it."""
+
+
+class DocumentStore(ABC):
+    """Pluggable on-disk storage for documents.
+
+    Attributes:
+        directory: Directory holding the stored documents.
+    """
+
+    storage_format: str
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+
+
+    @abstractmethod
+    def open_writer(self, on_shard: ShardCallback | None = None) -> DocumentWriter:
+        """Open an incremental writer that replaces the stored documents on commit.
+
+        Args:
+            on_shard: Called with the manifest entry of each shard once it is written.
+                Ignored by formats without shards. Defaults to None.
+
+        Returns:
+            DocumentWriter: Writer for the store's format.
+        """
+
+
+    @abstractmethod
+    def iter_documents(self) -> Generator[Document, None, None]:
+        """Stream the stored documents one at a time.
+
+        Yields:
+            Document: Documents loaded from disk.
+        """
+
+
+    def write_documents(
+        self, documents: Iterable[Document], on_shard: ShardCallback | None = None
+    ) -> int:
+        """Replace the stored documents with the given ones.
+
+        Args:
+            documents: Documents to persist. Consumed lazily, so a generator can be passed.
+            on_shard: Called with the manifest entry of each shard once it is written.
+                Ignored by formats without shards. Defaults to None.
+
+        Returns:
+            int: Number of documents written.
+        """
+
+        with self.open_writer(on_shard=on_shard) as writer:
+            for document in documents:
+                writer.write(document)
+
+        return writer.count
+
+
+    def read_documents(self) -> list[Document]:
+        """Load all stored documents into memory.
+
+        Returns:
+            list[Document]: Documents loaded from disk.
+        """
+
+        return list(self.iter_documents())
+
+
+    def size_bytes(self) -> int:
+        """Compute the number of bytes the store occupies on disk.
+
+        Returns:
+            int: Total size of all files under the store directory.
+        """
+
+        return sum(
+            path.stat().st_size for path in self.directory.rglob("*") if path.is_file()
+        )
+
+
+class JsonDocumentWriter(DocumentWriter):
+    """Writer for the legacy layout of one pretty-printed JSON file (plus `.txt` copy) per document.
+
+    Files are written to a staging directory next to the store, which replaces the store
+    directory on commit, so the previous documents stay readable while the writer is open.
+
+    Attributes:
+        also_save_as_txt: Whether to also write a plain text copy of each document.
+        staging_directory: Directory the files are written to until the commit.
+    """
+
+    def __init__(self, directory: Path, also_save_as_txt: bool = True) -> None:
+        super().__init__(directory)
+        self.also_save_as_txt = also_save_as_txt
+
+        self.staging_directory = self.directory.with_name(
+            f".{self.directory.name}.{generate_random_hex(length=8)}.tmp"
+        )
+        self.staging_directory.mkdir(parents=True)
+
+
+    def write(self, document: Document) -> None:
+        document.write(output_dir=self.staging_directory, also_save_as_txt=self.also_save_as_txt)
+        self.count += 1
+
+
+    def close(self) -> None:
+        replaced_directory = None
+        if self.directory.exists():
+            replaced_directory = self.directory.with_name(f"{self.staging_directory.name}.old")
+            os.replace(self.directory, replaced_directory)
+
+        os.replace(self.staging_directory, self.directory)
+
+        if replaced_directory is not None:
+            shutil.rmtree(replaced_directory)
+
+
+    def abort(self) -> None:
+        shutil.rmtree(self.staging_directory, ignore_errors=True)
+
+
+class JsonDocumentStore(DocumentStore):
+    """Legacy layout storing each document as its own JSON file.
+
+    Kept as a compatibility reader for data crawled before the sharded format existed.
+
+    Attributes:
+        directory: Directory holding the JSON files.
+        nesting_level: Level of subdirectory nesting to search for JSON files.
+        max_workers: Number of reader threads. 1 reads sequentially.
+    """
+
+    storage_format = "json"
+
+    def __init__(
+        self, directory: Path, nesting_level: int = 0, max_workers: int | None = None
+    ) -> None:
+        super().__init__(directory)
+        self.nesting_level = nesting_level
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+
+
+    def open_writer(self, on_shard: ShardCallback | None = None) -> JsonDocumentWriter:
+        return JsonDocumentWriter(self.directory)
+
+
+    def iter_documents(self) -> Generator[Document, None, None]:
+        json_files = get_json_files(self.directory, nesting_level=self.nesting_level)
+
+        yield from load_documents_in_parallel(
+            tasks=batched(json_files, JSON_FILES_PER_TASK),
+            read_task=_read_json_files,
+            max_workers=self.max_workers,
+        )
+
+
+class JsonlDocumentWriter(DocumentWriter):
+    """Writer for gzip-compressed JSONL shards described by a manifest.
+
+    Shards get a per-writer prefix and the manifest is swapped in atomically on commit,
+    so readers never see a half-written store. Files no longer referenced by the new
+    manifest are removed afterwards.
+
+    By default shards are filled in write order. With `bucket_count`, each document goes
+    to a fixed bucket derived from its ID instead, and every bucket becomes one shard
+    sorted by ID on commit. The same documents then produce byte-identical shards whatever
+    order they were written in, and a changed document only changes its own shard.
+
+    Attributes:
+        shard_size: Maximum number of documents per shard, when not bucketing.
+        bucket_count: Number of fixed hash buckets, each written as one shard. None fills
+            shards in write order.
+        compression_level: Gzip compression level of the shards.
+        shards: Manifest entries of the shards written so far.
+        on_shard: Called with the manifest entry of each shard once it is written.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        shard_size: int = 1000,
+        compression_level: int = 3,
+        on_shard: ShardCallback | None = None,
+        bucket_count: int | None = None,
+    ) -> None:
+        super().__init__(directory)
+        self.shard_size = shard_size
+        self.bucket_count = bucket_count
+        self.compression_level = compression_level
+        self.shards: list[dict] = []
+        self.on_shard = on_shard
+
+        self._writer_id = generate_random_hex(length=8)
+        self._shard_file = None
+        self._shard_path: Path | None = None
+        self._shard_count = 0
+        self._bucket_files: dict[int, BinaryIO] = {}
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+
+    def write(self, document: Document) -> None:
+        line = document.model_dump_json().encode("utf-8") + b"\n"
+        self.count += 1
+
+        if self.bucket_count is not None:
+            self.__write_to_bucket(document.id, line)
+            return
+
+        if self._shard_file is None:
+            self.__open_shard()
+
+        self._shard_file.write(line)
+        self._shard_count += 1
+
+        if self._shard_count >= self.shard_size:
+            self.__close_shard()
+
+
+    def close(self) -> None:
+        if self._shard_file is not None:
+            self.__close_shard()
+
+        self.__write_buckets()
+
+        manifest = {
+            "format": JsonlDocumentStore.storage_format,
+            "compression": "gzip",
+            "count": self.count,
+            "bytes": sum(shard["bytes"] for shard in self.shards),
+            "shards": self.shards,
+        }
+
+        temp_manifest_path = self.directory / f"{MANIFEST_FILE_NAME}.tmp"
+        temp_manifest_path.write_text(json.dumps(manifest, indent=4), encoding="utf-8")
+        os.replace(temp_manifest_path, self.directory / MANIFEST_FILE_NAME)
+
+        referenced_files = {shard["file"] for shard in self.shards} | {MANIFEST_FILE_NAME}
+        for path in self.directory.iterdir():
+            if path.is_file() and path.name not in referenced_files:
+                path.unlink()
+
+        logger.debug(
+            f"Wrote {self.count} documents in {len(self.shards)} shards to '{self.directory}'"
+        )
+
+
+    def abort(self) -> None:
+        if self._shard_file is not None:
+            self.__close_shard_file()
+            self._shard_file = None
+            self._shard_path.unlink(missing_ok=True)
+
+        for bucket_file in self._bucket_files.values():
+            bucket_file.close()
+            Path(bucket_file.name).unlink(missing_ok=True)
+        self._bucket_files = {}
+
+        for shard in self.shards:
+            (self.directory / shard["file"]).unlink(missing_ok=True)
+
+        self.shards = []
+
+
+    def __write_to_bucket(self, document_id: str, line: bytes) -> None:
+        bucket = zlib.crc32(document_id.encode("utf-8")) % self.bucket_count
+
+        if bucket not in self._bucket_files:
+            bucket_path = self.directory / f".{self._writer_id}-bucket-{bucket:05d}.jsonl"
+            self._bucket_files[bucket] = open(bucket_path, "wb")
+
+        # The ID is kept in front of the line so buckets are sorted without parsing documents
+        self._bucket_files[bucket].write(document_id.encode("utf-8") + b"\t" + line)
+
+
+    def __write_buckets(self) -> None:
+        """Write each bucket as one shard, sorted by document ID, and remove the bucket files."""
+
+        for bucket in sorted(self._bucket_files):
+            bucket_file = self._bucket_files.pop(bucket)
+            bucket_file.close()
+
+            bucket_path = Path(bucket_file.name)
+            lines = sorted(bucket_path.read_bytes().splitlines(keepends=True))
+
+            self.__open_shard()
+            for line in lines:
+                self._shard_file.write(line.split(b"\t", 1)[1])
+            self._shard_count = len(lines)
+            self.__close_shard()
+
+            bucket_path.unlink()
+
+
+    def __open_shard(self) -> None:
+        shard_name = f"documents-{self._writer_id}-{len(self.shards):05d}.jsonl.gz"
+        self._shard_path = self.directory / shard_name
+        # No file name or timestamp in the gzip header, so identical shards hash identically
+        self._shard_file = gzip.GzipFile(
+            filename="",
+            mode="wb",
+            compresslevel=self.compression_level,
+            fileobj=open(self._shard_path, "wb"),
+            mtime=0,
+        )
+
+
+    def __close_shard_file(self) -> None:
+        # GzipFile leaves a caller-provided file object open
+        raw_file = self._shard_file.fileobj
+        self._shard_file.close()
+        raw_file.close()
+
+
+    def __close_shard(self) -> None:
+        self.__close_shard_file()
+        self.shards.append(
+            {
+                "file": self._shard_path.name,
+                "count": self._shard_count,
+                "bytes": self._shard_path.stat().st_size,
+            }
+        )
+
+        if self.on_shard is not None:
+            self.on_shard(self.shards[-1])
+
+        self._shard_file = None
+        self._shard_path = None
+        self._shard_count = 0
+
+
+class JsonlDocumentStore(DocumentStore):
+    """Compact layout storing documents as gzip-compressed JSONL shards with a manifest.
+
+    Attributes:
+        directory: Directory holding the shards and the manifest.
+        shard_size: Maximum number of documents per shard when writing.
+        bucket_count: Number of fixed hash buckets documents are sharded into when writing.
+            None fills shards in write order.
+        compression_level: Gzip compression level used when writing.
+        max_workers: Number of reader threads. 1 reads sequentially.
+    """
+
+    storage_format = "jsonl"
+
+    def __init__(
+        self,
+        directory: Path,
+        shard_size: int = 1000,
+        compression_level: int = 3,
+        max_workers: int | None = None,
+        bucket_count: int | None = None,
+    ) -> None:
+        super().__init__(directory)
+        self.shard_size = shard_size
+        self.bucket_count = bucket_count
+        self.compression_level = compression_level
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+
+
+    def open_writer(self, on_shard: ShardCallback | None = None) -> JsonlDocumentWriter:
+        return JsonlDocumentWriter(
+            self.directory,
+            shard_size=self.shard_size,
+            compression_level=self.compression_level,
+            on_shard=on_shard,
+            bucket_count=self.bucket_count,
+        )
+
+
+    def iter_documents(self) -> Generator[Document, None, None]:
+        yield from load_documents_in_parallel(
+            tasks=self.get_shard_paths(),
+            read_task=_read_shard,
+            max_workers=self.max_workers,
+        )
+
+
+    def read_manifest(self) -> dict:
+        """Load the manifest describing the stored shards.
+
+        Returns:
+            dict: Parsed manifest.
+        """
+
+        manifest_path = self.directory / MANIFEST_FILE_NAME
+
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+
+
+    def get_shard_paths(self) -> list[Path]:
+        """Get the paths of the stored shards in manifest order.
+
+        Returns:
+            list[Path]: Paths of the shard files.
+        """
+
+        return [self.directory / shard["file"] for shard in self.read_manifest()["shards"]]
+
+
+DOCUMENT_STORES: dict[str, type[DocumentStore]] = {
+    JsonDocumentStore.storage_format: JsonDocumentStore,
+    JsonlDocumentStore.storage_format: JsonlDocumentStore,
+}
+
+
+def get_document_store(
+    directory: Path,
+    storage_format: str | None = None,
+    shard_size: int = 1000,
+    nesting_level: int = 0,
+    max_workers: int | None = None,
+    bucket_count: int | None = None,
+) -> DocumentStore:
+    """Create the document store for a directory.
+
+    Args:
+        directory: Directory holding the stored documents.
+        storage_format: Either "jsonl" or "json". None detects the format from the directory:
+            "jsonl" when a manifest exists, "json" otherwise. Defaults to None.
+        shard_size: Maximum number of documents per shard for the "jsonl" format. Defaults to 1000.
+        nesting_level: Level of subdirectory nesting to search for files in the "json" format. Defaults to 0.
+        max_workers: Number of reader threads. None uses the thread pool default, 1 reads sequentially.
+            Defaults to None.
+        bucket_count: Number of fixed hash buckets documents are sharded into for the "jsonl"
+            format, so shards are identical across writes of the same documents. Defaults to
+            None, which fills shards in write order.
+
+    Returns:
+        DocumentStore: Store for the requested or detected format.
+
+    Raises:
+        ValueError: If the storage format is not supported.
+    """
+
+    directory = Path(directory)
+
+    if storage_format is None:
+        storage_format = (
+            JsonlDocumentStore.storage_format
+            if (directory / MANIFEST_FILE_NAME).exists()
+            else JsonDocumentStore.storage_format
+        )
+
+    if storage_format not in DOCUMENT_STORES:
+        raise ValueError(
+            f"Unsupported storage format '{storage_format}'. Choose one of: {list(DOCUMENT_STORES)}"
+        )
+
+    if storage_format == JsonlDocumentStore.storage_format:
+        return JsonlDocumentStore(
+            directory, shard_size=shard_size, max_workers=max_workers, bucket_count=bucket_count
+        )
+
+    return JsonDocumentStore(directory, nesting_level=nesting_level, max_workers=max_workers)
+
+
+def get_json_files(directory: Path, nesting_level: int = 0) -> list[Path]:
+    """Get the JSON files of the legacy layout with a single `os.scandir` walk.
+
+    Args:
+        directory: Path to the directory containing JSON files.
+        nesting_level: Level of subdirectory nesting to search for JSON files.
+
+    Returns:
+        list[Path]: Paths of the JSON files found.
+    """
+
+    json_files = []
+    pending_directories = [(directory, nesting_level)]
+
+    while pending_directories:
+        current_directory, level = pending_directories.pop()
+
+        with os.scandir(current_directory) as entries:
+            for entry in entries:
+                if level > 0:
+                    if entry.is_dir():
+                        pending_directories.append((entry.path, level - 1))
+
+                elif entry.name.endswith(".json") and entry.is_file():
+                    json_files.append(Path(entry.path))
+
+    return json_files
+
+
+def load_documents_in_parallel(
+    tasks: Iterable,
+    read_task: Callable[..., list[bytes]],
+    max_workers: int,
+) -> Generator[Document, None, None]:
+    """Stream documents by reading raw JSON in a thread pool and validating it as it arrives.
+
+    Reads are I/O bound and overlap in the thread pool. Validation stays in the calling
+    process: pydantic-core validates a document about as fast as a worker process could
+    pickle it back, so a process pool adds overhead without freeing the consumer. At most
+    `2 * max_workers` tasks are buffered, and documents are yielded in task order.
+
+    Args:
+        tasks: Units of work, such as a batch of file paths or a shard path.
+        read_task: Function run in a thread that turns a task into raw JSON documents.
+        max_workers: Number of reader threads. 1 reads sequentially.
+
+    Yields:
+        Document: Validated documents.
+    """
+
+    if max_workers <= 1:
+        for task in tasks:
+            yield from _validate_documents(read_task(task))
+
+        return
+
+    max_in_flight = 2 * max_workers
+
+    with ThreadPoolExecutor(max_workers=max_workers) as read_pool:
+        reads = deque()
+
+        for task in tasks:
+            reads.append(read_pool.submit(read_task, task))
+
+            while reads and (reads[0].done() or len(reads) > max_in_flight):
+                yield from _validate_documents(reads.popleft().result())
+
+        for read in reads:
+            yield from _validate_documents(read.result())
+
+
+def _read_json_files(json_files: Iterable[Path]) -> list[bytes]:
+    return [json_file.read_bytes() for json_file in json_files]
+
+
+def _read_shard(shard_path: Path) -> list[bytes]:
+    # Decompressing a whole shard at once is faster than line-buffered gzip reads
+    return gzip.decompress(shard_path.read_bytes()).splitlines()
+
+
+def _validate_documents(raw_documents: list[bytes]) -> list[Document]:
+    return [Document.model_validate_json(raw_document) for raw_document in raw_documents]
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from itertools import batched
+from pathlib import Path
+
+from loguru import logger
+from pymongo import UpdateOne, errors
+
+from src.slack_integrations_offline.config import settings
+from src.slack_integrations_offline.infrastructure.mongodb.client import get_mongodb_client
+
+
+# SQLite limits the number of parameters of a single statement
+QUERY_BATCH_SIZE = 500
+
+
+def summary_cache_key(
+    content_hash: str,
+    model_id: str,
+    prompt_version: str,
+    max_characters: int,
+    temperature: float,
+) -> str:
+    """Build the cache key of a summary from everything that determines it.
+
+    Args:
+        content_hash: SHA-256 hex digest of the summarized content.
+        model_id: Identifier of the language model.
+        prompt_version: Version of the summarization prompts.
+        max_characters: Maximum character length of the summary.
+        temperature: Sampling temperature.
+
+    Returns:
+        str: SHA-256 hex digest identifying the summary.
+    """
+
+    key_fields = json.dumps(
+        [content_hash, model_id, prompt_version, max_characters, temperature], separators=(",", ":")
+    )
+
+    return hashlib.sha256(key_fields.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """Content-addressed store of generated summaries, persisted across pipeline runs.
+
+    Summaries live in a local SQLite file. An optional MongoDB collection acts as a shared
+    second tier: local misses are looked up there, its hits are copied to the local file,
+    and new summaries are written to both.
+
+    Attributes:
+        path: Path of the SQLite file.
+        mongodb_collection_name: Name of the MongoDB collection of the shared tier, if any.
+        hit_count: Number of summaries found in the local file.
+        remote_hit_count: Number of summaries found in the MongoDB tier.
+        miss_count: Number of summaries found in neither.
+    """
+
+    def __init__(self, path: Path, mongodb_collection_name: str | None = None) -> None:
+        self.path = Path(path)
+        self.mongodb_collection_name = mongodb_collection_name
+
+        self.hit_count = 0
+        self.remote_hit_count = 0
+        self.miss_count = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, summary TEXT NOT NULL, model_id TEXT, created_at REAL)"
+            )
+
+        self._collection = None
+        if mongodb_collection_name:
+            client = get_mongodb_client(settings.MONGODB_URI)
+            self._collection = client[settings.MONGODB_DATABASE_NAME][mongodb_collection_name]
+
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Look up the summaries of several keys.
+
+        Args:
+            keys: Cache keys built with `summary_cache_key`.
+
+        Returns:
+            dict[str, str]: Cached summaries keyed by cache key; missing keys are omitted.
+        """
+
+        keys = list(dict.fromkeys(keys))
+        summaries: dict[str, str] = {}
+
+        with self._lock:
+            for batch in batched(keys, QUERY_BATCH_SIZE):
+                rows = self._connection.execute(
+                    f"SELECT key, summary FROM summaries WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                summaries.update(rows)
+
+        self.hit_count += len(summaries)
+
+        missing_keys = [key for key in keys if key not in summaries]
+        if missing_keys and self._collection is not None:
+            remote_summaries = self.__get_remote(missing_keys)
+            self.remote_hit_count += len(remote_summaries)
+            self.__put_local(remote_summaries, model_id=None)
+            summaries.update(remote_summaries)
+
+        self.miss_count += len(keys) - len(summaries)
+
+        return summaries
+
+
+    def put_many(self, summaries: dict[str, str], model_id: str | None = None) -> None:
+        """Store new summaries.
+
+        Args:
+            summaries: Summaries keyed by cache key.
+            model_id: Identifier of the language model that generated them. Defaults to None.
+        """
+
+        if not summaries:
+            return
+
+        self.__put_local(summaries, model_id)
+
+        if self._collection is not None:
+            self.__put_remote(summaries, model_id)
+
+
+    def stats(self) -> dict[str, int]:
+        """Counters of the cache, for reporting.
+
+        Returns:
+            dict[str, int]: Local hits, MongoDB hits and misses.
+        """
+
+        return {
+            "hits": self.hit_count,
+            "remote_hits": self.remote_hit_count,
+            "misses": self.miss_count,
+        }
+
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+
+        with self._lock:
+            self._connection.close()
+
+
+    def __put_local(self, summaries: dict[str, str], model_id: str | None) -> None:
+        now = time.time()
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO summaries (key, summary, model_id, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, summary, model_id, now) for key, summary in summaries.items()],
+            )
+
+
+    def __get_remote(self, keys: list[str]) -> dict[str, str]:
+        """Look up keys in the MongoDB tier; errors are logged and treated as misses."""
+
+        try:
+            return {
+                document["_id"]: document["summary"]
+                for document in self._collection.find(
+                    {"_id": {"$in": keys}}, projection={"summary": 1}
+                )
+            }
+
+        except errors.PyMongoError as e:
+            logger.warning(f"Failed to read the summary cache from MongoDB: {e}")
+            return {}
+
+
+    def __put_remote(self, summaries: dict[str, str], model_id: str | None) -> None:
+        """Write summaries to the MongoDB tier; errors are logged since the local copy is kept."""
+
+        operations = [
+            UpdateOne(
+                {"_id": key},
+                {"$set": {"summary": summary, "model_id": model_id, "created_at": time.time()}},
+                upsert=True,
+            )
+            for key, summary in summaries.items()
+        ]
+
+        try:
+            self._collection.bulk_write(operations, ordered=False)
+
+        except errors.PyMongoError as e:
+            logger.warning(f"Failed to write {len(operations)} summaries to MongoDB: {e}")
\ No newline at end of file
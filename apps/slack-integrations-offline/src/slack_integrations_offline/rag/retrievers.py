@@ -4,6 +4,7 @@ from langchain_mongodb import MongoDBAtlasVectorSearch
 from langchain_mongodb.retrievers.hybrid_search import MongoDBAtlasHybridSearchRetriever
 
 from src.slack_integrations_offline.rag.embeddings import get_openai_embedding_model
+from src.slack_integrations_offline.infrastructure.mongodb.client import get_mongodb_client
 from src.slack_integrations_offline.config import settings
 
 
@@ -38,10 +39,11 @@ def get_hybrid_search_retriever(
         MongoDBAtlasHybridSearchRetriever: Configured retriever with balanced vector and full-text penalties.
     """
     
-    vectorstore = MongoDBAtlasVectorSearch.from_connection_string(
-        connection_string=settings.MONGODB_URI,
+    mongodb_client = get_mongodb_client(settings.MONGODB_URI)
+
+    vectorstore = MongoDBAtlasVectorSearch(
+        collection=mongodb_client[settings.MONGODB_DATABASE_NAME]["rag"],
         embedding=embedding_model,
-        namespace=f"{settings.MONGODB_DATABASE_NAME}.rag",
         text_key="chunk",
         embedding_key="embedding",
         relevance_score_fn="dotProduct"
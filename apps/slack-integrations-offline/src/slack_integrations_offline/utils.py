@@ -1,3 +1,4 @@
+import hashlib
 import string
 import random
 
@@ -14,3 +15,30 @@ def generate_random_hex(length: int) -> str:
     
     hex_chars = string.hexdigits.lower()
     return "".join(random.choice(hex_chars) for _ in range(length))
+
+
+def generate_document_id(url: str, length: int = 32) -> str:
+    """Generate a document ID that is stable across crawls of the same URL.
+    
+    Args:
+        url: URL of the document, ideally in canonical form.
+        length: Number of hexadecimal characters to keep. Defaults to 32.
+    
+    Returns:
+        str: Lowercase hexadecimal prefix of the SHA-256 digest of the URL.
+    """
+
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:length]
+
+
+def compute_content_hash(content: str) -> str:
+    """Hash the content of a document to detect changes between runs.
+    
+    Args:
+        content: Content to hash.
+    
+    Returns:
+        str: SHA-256 hex digest of the content.
+    """
+
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
@@ -1,9 +1,10 @@
-from . import collect_crawl_data, collect_urls, compute_rag, generate_summaries, infrastructure
+from . import collect_crawl_data, collect_urls, compute_rag, generate_summaries, infrastructure, preprocessing
 
 __all__ = [
     "collect_crawl_data",
     "collect_urls",
     "compute_rag",
     "generate_summaries",
-    "infrastructure"
+    "infrastructure",
+    "preprocessing",
 ]
\ No newline at end of file
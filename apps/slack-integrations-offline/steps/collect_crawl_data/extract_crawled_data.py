@@ -1,53 +1,378 @@
+import asyncio
+from pathlib import Path
+from urllib.parse import urlsplit
+
 from loguru import logger
 from typing_extensions import Annotated
 from zenml import get_step_context, step
 
-from src.slack_integrations_offline.applications.crawlers import Crawl4AICrawler
-from src.slack_integrations_offline.domain import Document
+from src.slack_integrations_offline.applications.crawlers import (
+    AdaptiveRateLimiter,
+    Crawl4AICrawler,
+    CrawlFrontier,
+    IncrementalCrawlTracker,
+    ShardedCrawler,
+    UrlScope,
+    normalize_url,
+)
+from src.slack_integrations_offline.domain import Document, SitemapEntry
+from src.slack_integrations_offline.infrastructure.storage import (
+    CrawlFailureLedger,
+    CrawlLedger,
+    DocumentWriter,
+    ShardMemoryMonitor,
+    get_document_store,
+)
+from src.slack_integrations_offline.utils import generate_document_id
 
 @step
 def extract_crawled_data(
-    urls: list[str], max_workers:int = 10
-) -> Annotated[list[Document], "crawled_documents"]:
-    
-    """Extract content from multiple URLs using web crawling.
+    urls: list[SitemapEntry],
+    output_dir: Path,
+    max_workers:int = 10,
+    ledger_path: Path | None = None,
+    requests_per_second: float = 2.0,
+    max_requests_per_second: float = 20.0,
+    respect_crawl_delay: bool = True,
+    page_timeout: float = 60.0,
+    max_retries: int = 3,
+    fast_path: bool = True,
+    browser_pool_size: int = 1,
+    pages_per_browser: int = 500,
+    num_processes: int = 1,
+    shard_by: str = "path",
+    global_requests_per_second: float | None = None,
+    follow_links: bool = False,
+    scope_prefix: str | None = None,
+    max_depth: int = 3,
+    max_pages: int | None = None,
+    failures_path: Path | None = None,
+    retry_failures: bool = False,
+    storage_format: str = "jsonl",
+    shard_size: int = 1000,
+    shard_buckets: int | None = 64,
+) -> Annotated[str, "crawled_data_dir"]:
+
+    """Crawl URLs and write the extracted documents to disk as they complete.
+
+    Documents are streamed from the crawler straight into the document store, so memory
+    usage is bounded by the crawl concurrency and the shard size rather than by the site size.
+
+    With a crawl ledger the crawl is incremental: unchanged URLs are not crawled again,
+    only new or changed documents are written, keeping the document ID of each URL stable,
+    and the previously stored documents are carried over. Documents and ledger entries of
+    pages that are neither listed in `urls` nor reached by the frontier are dropped.
+
+    Each page gets `page_timeout` seconds per attempt, and transient failures (timeouts,
+    throttling, server errors) are retried with jittered exponential backoff. URLs that still
+    fail are written to the failure ledger, and `retry_failures` recrawls only those URLs,
+    carrying over the previously stored documents.
+
+    With `follow_links`, the URLs seed a frontier and the links of every crawled page are
+    crawled as well, within `scope_prefix` and the depth and page budgets.
 
     Args:
-        urls: List of URLs to crawl.
+        urls: Sitemap entries of the URLs to crawl.
+        output_dir: Directory the crawled documents are written to.
         max_workers: Maximum number of concurrent crawling requests.
+        ledger_path: Path of the crawl ledger enabling incremental crawling. Defaults to None,
+            which crawls every URL.
+        requests_per_second: Initial request rate per host, adapted to the server's responses.
+            Defaults to 2.0.
+        max_requests_per_second: Upper bound of the adaptive request rate per host. Defaults to 20.0.
+        respect_crawl_delay: Whether to cap the rate to the `robots.txt` crawl delay. Defaults to True.
+        page_timeout: Deadline in seconds for a single attempt at crawling a page. Defaults to 60.0.
+        max_retries: Maximum number of retries of a page after a transient failure. Defaults to 3.
+        fast_path: Whether to fetch static pages over plain HTTP and only render the pages that
+            need JavaScript with the browser. Defaults to True.
+        browser_pool_size: Maximum number of headless browsers per crawl process. Defaults to 1.
+        pages_per_browser: Number of pages after which a browser is closed and replaced,
+            capping its memory growth. Defaults to 500.
+        num_processes: Number of crawling processes; above 1, URLs are partitioned across
+            processes that each run their own browser and workers. Defaults to 1.
+        shard_by: How URLs are partitioned across processes, either "host" or "path".
+            Defaults to "path".
+        global_requests_per_second: Maximum number of requests per second across all
+            processes. Defaults to None, which only applies the per-host rates.
+        follow_links: Whether to also crawl the links found on the crawled pages. Defaults to False.
+        scope_prefix: URL prefix the followed links must start with. Defaults to None, which
+            allows any page on the hosts of `urls`.
+        max_depth: Maximum number of links followed from a sitemap URL. Defaults to 3.
+        max_pages: Maximum number of pages crawled when following links. Defaults to None,
+            which sets no limit.
+        failures_path: Path of the ledger the failed URLs are persisted to. Defaults to None.
+        retry_failures: Whether to crawl only the URLs of the failure ledger. Defaults to False.
+        storage_format: On-disk format, either "jsonl" (compressed shards) or "json" (one file per document).
+            Defaults to "jsonl".
+        shard_size: Maximum number of documents per shard for the "jsonl" format, when
+            `shard_buckets` is None. Defaults to 1000.
+        shard_buckets: Number of fixed hash buckets the "jsonl" shards are sorted into, so
+            unchanged documents produce identical shards across crawls and an S3 sync only
+            uploads the shards of changed pages. None fills shards in crawl order. Defaults to 64.
 
     Returns:
-        list[Document]: List of documents with their extracted content from crawled pages.
+        str: String representation of the output directory.
     """
-    
+
     try:
         logger.info(f"Starting crawl with {len(urls)} URLs")
-        crawler = Crawl4AICrawler(max_concurrent_requests=max_workers)
+        rate_limiter = AdaptiveRateLimiter(
+            initial_rate=requests_per_second, max_rate=max_requests_per_second
+        )
+        crawler_kwargs = {
+            "max_concurrent_requests": max_workers,
+            "rate_limiter": rate_limiter,
+            "respect_crawl_delay": respect_crawl_delay,
+            "page_timeout": page_timeout,
+            "max_retries": max_retries,
+            "fast_path": fast_path,
+            "browser_pool_size": browser_pool_size,
+            "pages_per_browser": pages_per_browser,
+        }
+        crawler = (
+            ShardedCrawler(
+                num_processes=num_processes,
+                shard_by=shard_by,
+                global_requests_per_second=global_requests_per_second,
+                **crawler_kwargs,
+            )
+            if num_processes > 1
+            else Crawl4AICrawler(**crawler_kwargs)
+        )
+
+        frontier = None
+        if follow_links:
+            if num_processes > 1:
+                raise ValueError("follow_links is not supported with several crawl processes")
+
+            scope = (
+                UrlScope.from_prefixes([scope_prefix])
+                if scope_prefix
+                else UrlScope.from_prefixes({_origin(entry.url) for entry in urls})
+            )
+            frontier = CrawlFrontier(scope=scope, max_depth=max_depth, max_pages=max_pages)
+
+        # Stored documents and ledger entries of pages no longer listed are dropped
+        listed_urls = {normalize_url(entry.url) or entry.url for entry in urls}
+
+        def is_listed(url: str) -> bool:
+            url = normalize_url(url) or url
+            return url in listed_urls or (frontier is not None and url in frontier.seen)
+
+        failure_ledger = CrawlFailureLedger(failures_path) if failures_path is not None else None
+        if retry_failures:
+            if failure_ledger is None:
+                raise ValueError("retry_failures requires a failures_path")
 
-        pages = crawler(urls)
-        logger.info(f"Crawler returned: {type(pages)}")
+            urls = _select_failed_urls(urls, failure_ledger)
+            logger.info(f"Retrying {len(urls)} previously failed URLs")
 
-        if pages is None:
-            logger.error("Crawler returned None!")
-            return []
+        # Writers only replace the stored documents on commit, so they can be carried over
+        previous_store = (
+            get_document_store(output_dir)
+            if (ledger_path is not None or retry_failures) and Path(output_dir).exists()
+            else None
+        )
+
+        tracker = None
+        entries = urls
+        if ledger_path is not None:
+            tracker = IncrementalCrawlTracker(
+                ledger=CrawlLedger(ledger_path),
+                max_concurrent_requests=max_workers,
+                rate_limiter=rate_limiter,
+                respect_crawl_delay=respect_crawl_delay,
+            )
+            # Unchanged URLs are only skipped if their document can be carried over
+            stored_document_ids = (
+                {document.id for document in previous_store.iter_documents()}
+                if previous_store is not None
+                else set()
+            )
+            entries = tracker.select(urls, stored_document_ids=stored_document_ids)
+
+        memory_monitor = ShardMemoryMonitor()
+        document_store = get_document_store(
+            output_dir,
+            storage_format=storage_format,
+            shard_size=shard_size,
+            bucket_count=shard_buckets,
+        )
+
+        with document_store.open_writer(on_shard=memory_monitor) as writer:
+            written_ids = asyncio.run(
+                _stream_to_writer(
+                    crawler, [entry.url for entry in entries], writer, tracker, frontier
+                )
+            )
+            crawled_count = writer.count
+
+            carried_over_count = 0
+            dropped_count = 0
+            if previous_store is not None:
+                for document in previous_store.iter_documents():
+                    if _is_written(document, written_ids):
+                        continue
+
+                    if is_listed(document.metadata.url):
+                        writer.write(document)
+                        carried_over_count += 1
+                    else:
+                        dropped_count += 1
 
-        augmented_pages = list(set(pages))
+            saved_documents_count = writer.count
+
+        if failure_ledger is not None:
+            # Discovered URLs that failed are recorded too, so they can be retried
+            for entry in entries:
+                if entry.url not in crawler.failures:
+                    failure_ledger.record_success(entry.url)
+            for failure in crawler.failures.values():
+                failure_ledger.record_failure(failure)
+
+            failure_ledger.save()
+
+        pruned_ledger_count = 0
+        if tracker is not None:
+            pruned_ledger_count = tracker.ledger.prune(is_listed)
+            tracker.ledger.save()
+            logger.info(
+                f"Incremental crawl: {tracker.new_documents} new | {tracker.changed_documents} changed | "
+                f"{tracker.unchanged_content} unchanged content | {carried_over_count} carried over | "
+                f"{dropped_count} no longer listed"
+            )
 
         logger.info(f"Number of urls for crawling {len(urls)}.")
-        logger.info(f"After crawling, we have a total of {len(augmented_pages)} documents.")
+        logger.info(
+            f"After crawling, we have a total of {saved_documents_count} documents in '{output_dir}'."
+        )
 
         step_context = get_step_context()
         step_context.add_output_metadata(
-            output_name="crawled_documents",
+            output_name="crawled_data_dir",
             metadata={
                 "no_urls_for_crawling": len(urls),
-                "len_documents_after_crawling": len(augmented_pages),
+                "len_documents_after_crawling": crawled_count,
+                "saved_documents_count": saved_documents_count,
+                "successful_urls": crawler.success_count,
+                "failed_urls": crawler.failed_count,
+                "timed_out_attempts": crawler.timeout_count,
+                "retries": crawler.retry_count,
+                "failure_reasons": crawler.failure_reasons(),
+                "permanent_failures": sum(
+                    not failure.transient for failure in crawler.failures.values()
+                ),
+                "latency_histogram": crawler.latency_histogram(),
+                "http_pages": crawler.http_page_count,
+                "browser_pages": crawler.browser_page_count,
+                "browser_fallbacks": crawler.browser_fallbacks,
+                "browsers_started": crawler.browsers_started,
+                "browsers_recycled": crawler.browsers_recycled,
+                "storage_format": storage_format,
+                "bytes_on_disk": document_store.size_bytes(),
+                "shards": memory_monitor.shards,
+                "peak_rss_mb": memory_monitor.peak_rss_mb,
+                "num_processes": num_processes,
+                **(
+                    {f"frontier_{name}": count for name, count in frontier.stats().items()}
+                    if frontier is not None
+                    else {}
+                ),
+                **crawler.rate_summary(),
+                **(
+                    {
+                        "incremental_urls_crawled": len(entries),
+                        "incremental_skipped_by_lastmod": tracker.skipped_by_lastmod,
+                        "incremental_not_modified": tracker.not_modified,
+                        "incremental_missing_documents": tracker.missing_documents,
+                        "incremental_unchanged_content": tracker.unchanged_content,
+                        "incremental_new_documents": tracker.new_documents,
+                        "incremental_changed_documents": tracker.changed_documents,
+                        "incremental_carried_over": carried_over_count,
+                        "incremental_dropped_documents": dropped_count,
+                        "incremental_pruned_ledger_entries": pruned_ledger_count,
+                    }
+                    if tracker is not None
+                    else {}
+                ),
             }
         )
 
-        return augmented_pages
-    
+        return str(output_dir)
+
     except Exception as e:
         logger.error(f"Error in extract_crawled_data: {e}")
         logger.exception("Full traceback:")
-        raise
\ No newline at end of file
+        raise
+
+
+def _origin(url: str) -> str:
+    """Scheme and host of a URL."""
+
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _is_written(document: Document, written_ids: set[str]) -> bool:
+    """Whether a stored document was crawled again, even if it was stored with a legacy random ID."""
+
+    url_id = generate_document_id(normalize_url(document.metadata.url) or document.metadata.url)
+
+    return document.id in written_ids or url_id in written_ids
+
+
+def _select_failed_urls(
+    urls: list[SitemapEntry], failure_ledger: CrawlFailureLedger
+) -> list[SitemapEntry]:
+    """Keep the sitemap entries of the URLs in the failure ledger.
+
+    Failed URLs that are no longer listed in the sitemap are retried as well.
+
+    Args:
+        urls: Sitemap entries of the site.
+        failure_ledger: Ledger of the previously failed URLs.
+
+    Returns:
+        list[SitemapEntry]: Sitemap entries of the failed URLs.
+    """
+
+    entries_by_url = {entry.url: entry for entry in urls}
+
+    return [
+        entries_by_url.get(url, SitemapEntry(url=url)) for url in failure_ledger.failures
+    ]
+
+
+async def _stream_to_writer(
+    crawler: Crawl4AICrawler,
+    urls: list[str],
+    writer: DocumentWriter,
+    tracker: IncrementalCrawlTracker | None,
+    frontier: CrawlFrontier | None = None,
+) -> set[str]:
+    """Write crawled documents as they complete, skipping duplicates and unchanged content.
+
+    Args:
+        crawler: Crawler producing the documents.
+        urls: URLs to crawl.
+        writer: Writer receiving the documents.
+        tracker: Incremental crawl tracker filtering unchanged documents, if any.
+        frontier: Frontier scheduling the links of the crawled pages, if any.
+
+    Returns:
+        set[str]: IDs of the written documents.
+    """
+
+    written_ids: set[str] = set()
+
+    async for document in crawler.stream(urls, frontier=frontier):
+        if tracker is not None:
+            document = tracker.record(document, crawler.validators)
+
+        if document is None or document.id in written_ids:
+            continue
+
+        writer.write(document)
+        written_ids.add(document.id)
+
+    return written_ids
\ No newline at end of file
@@ -1,35 +1,35 @@
-import os
-import requests
 from typing_extensions import Annotated
-from xml.etree import ElementTree
 from loguru import logger
 
 from zenml import step
 from zenml.steps import get_step_context
 
+from src.slack_integrations_offline.applications.crawlers.sitemap import SitemapCollector
+from src.slack_integrations_offline.domain.sitemap import SitemapEntry
+
 
 @step
-def extract_urls_from_sitemap(url_prefix: str) -> Annotated[list[str], "urls_from_sitemap"]:
+def extract_urls_from_sitemap(
+    url_prefix: str, max_concurrent_requests: int = 10
+) -> Annotated[list[SitemapEntry], "urls_from_sitemap"]:
+
+    """Extract URLs and their sitemap metadata from the sitemaps of a site.
 
-    """Extract URLs from a sitemap XML file.
+    Sitemaps are discovered from `robots.txt`, falling back to `sitemap.xml` and
+    `sitemap-pages.xml`, and sitemap indexes are followed.
 
     Args:
-        url_prefix: Base URL prefix to construct the sitemap URL from.
+        url_prefix: Base URL of the site to collect the URLs of.
+        max_concurrent_requests: Maximum number of sitemaps fetched concurrently. Defaults to 10.
 
     Returns:
-        list[str]: List of URLs extracted from the sitemap.
+        list[SitemapEntry]: List of sitemap entries extracted from the sitemaps.
     """
-    sitemap_url = url_prefix.rstrip('/') + '/sitemap-pages.xml'
-    logger.info(f"Constructed sitemap url {sitemap_url}")
+    logger.info(f"Collecting sitemap urls for {url_prefix}")
 
     try:
-        response = requests.get(sitemap_url)
-        response.raise_for_status()
-
-        root = ElementTree.fromstring(response.content)
-
-        namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-        urls = [loc.text for loc in root.findall('.//ns:loc', namespace)]
+        collector = SitemapCollector(max_concurrent_requests=max_concurrent_requests)
+        urls = collector(url_prefix)
 
         logger.info(f"Successfully extracted no. of urls {len(urls)}")
         
@@ -38,6 +38,11 @@ def extract_urls_from_sitemap(url_prefix: str) -> Annotated[list[str], "urls_fro
             output_name="urls_from_sitemap",
             metadata={
                 "len_of_urls": len(urls),
+                "len_of_urls_with_lastmod": sum(1 for url in urls if url.lastmod),
+                "len_of_urls_with_priority": sum(1 for url in urls if url.priority is not None),
+                "no_sitemaps": collector.sitemap_count,
+                "no_failed_sitemaps": collector.failed_sitemap_count,
+                "no_urls_outside_prefix": collector.out_of_prefix_count,
             }
         )
 
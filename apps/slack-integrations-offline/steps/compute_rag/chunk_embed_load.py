@@ -1,5 +1,6 @@
-from typing import Any, Generator
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import batched
+from typing import Any, Generator, Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from loguru import logger
 from tqdm import tqdm
@@ -20,7 +21,7 @@ from src.slack_integrations_offline.domain.document import Document
 
 @step
 def chunk_embed_load(
-    documents: list[Document],
+    extract_collection_name: str,
     collection_name: str,
     embedding_model_id: str, 
     embedding_model_dim: int,
@@ -29,12 +30,17 @@ def chunk_embed_load(
     top_k: int,
     processing_batch_size: int,
     processing_max_workers: int,
+    limit: int = 0,
+    fetch_batch_size: int = 100,
 ) -> None:
     
     """Chunk documents, generate embeddings, and load them into MongoDB with vector index.
+
+    Source documents are streamed from MongoDB instead of being passed as an artifact,
+    so peak memory stays bounded by the batch sizes rather than the corpus size.
     
     Args:
-        documents: List of documents to process.
+        extract_collection_name: Name of the MongoDB collection to stream source documents from.
         collection_name: Name of the MongoDB collection to store documents.
         embedding_model_id: Identifier for the embedding model to use.
         embedding_model_dim: Dimensionality of the embedding vectors.
@@ -43,6 +49,8 @@ def chunk_embed_load(
         top_k: Number of top results to retrieve in searches.
         processing_batch_size: Number of documents to process in each batch.
         processing_max_workers: Maximum number of concurrent workers for processing.
+        limit: Maximum number of source documents to process. 0 for no limit. Defaults to 0.
+        fetch_batch_size: Number of source documents fetched from MongoDB per round trip. Defaults to 100.
     """
     
     splitter = get_splitter(chunk_size=chunk_size)
@@ -50,18 +58,36 @@ def chunk_embed_load(
     retriever = get_retriever(embedding_model_id=embedding_model_id, k=top_k)
 
     with MongoDBService(
+        model=Document, collection_name=extract_collection_name
+    ) as source_client, MongoDBService(
         model=Document, collection_name=collection_name
     ) as mongodb_client:
         
         mongodb_client.clear_collection()
 
-        docs = [
+        total_docs = source_client.get_collection_count()
+        if limit:
+            total_docs = min(total_docs, limit)
+
+        documents = source_client.stream_documents(
+            limit=limit,
+            batch_size=fetch_batch_size,
+            projection={"id": 1, "content": 1, "metadata": 1},
+        )
+
+        # Chunks keep the stable document ID and content hash to be matched on later runs
+        docs = (
             LangChainDocument(
-                page_content=doc.content, metadata=doc.metadata.model_dump()
+                page_content=doc.content,
+                metadata={
+                    **doc.metadata.model_dump(),
+                    "document_id": doc.id,
+                    "content_hash": doc.content_hash,
+                },
             )
             for doc in documents
             if doc
-        ]
+        )
 
         process_docs(
             docs=docs,
@@ -69,6 +95,7 @@ def chunk_embed_load(
             splitter=splitter,
             batch_size=processing_batch_size,
             max_workers=processing_max_workers,
+            total_docs=total_docs,
         )
 
         index = MongodbIndex(
@@ -84,59 +111,71 @@ def chunk_embed_load(
 
 
 def process_docs(
-    docs: LangChainDocument,
+    docs: Iterable[LangChainDocument],
     retriever: Any,
     splitter: RecursiveCharacterTextSplitter,
     batch_size: int = 4,
     max_workers: int = 2,
-) -> None:
+    total_docs: int | None = None,
+) -> int:
     """Process documents in parallel batches by splitting and embedding them.
+
+    Documents are consumed lazily and at most `2 * max_workers` batches are in flight
+    at any time, so the input can be a generator of arbitrary length.
     
     Args:
-        docs: List of LangChain documents to process.
+        docs: Iterable of LangChain documents to process.
         retriever: Retriever instance for generating and storing embeddings.
         splitter: Text splitter for chunking documents.
         batch_size: Number of documents to process in each batch.
         max_workers: Maximum number of concurrent workers.
+        total_docs: Expected number of documents, used for progress reporting. Defaults to None.
+    
+    Returns:
+        int: Number of documents processed.
     """
-    batches = list(get_batches(docs=docs, batch_size=batch_size))
-    results = []
-
-    total_docs = len(docs)
+    max_in_flight = 2 * max_workers
+    processed_docs = 0
 
+    with ThreadPoolExecutor(max_workers=max_workers) as executor, tqdm(
+        total=total_docs, desc="Processing documents"
+    ) as pbar:
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        for batch in get_batches(docs=docs, batch_size=batch_size):
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch_count = future.result()
+                    processed_docs += batch_count
+                    pbar.update(batch_count)
 
-        futures = [
-            executor.submit(process_batch, splitter, batch, retriever)
-            for batch in batches
-        ]
+            pending.add(executor.submit(process_batch, splitter, batch, retriever))
 
-        with tqdm(total=total_docs, desc="Processing documents") as pbar:
-            for future in as_completed(futures):
-                result = future.result()
-                results.append(result)
-                pbar.update(batch_size)
+        for future in wait(pending).done:
+            batch_count = future.result()
+            processed_docs += batch_count
+            pbar.update(batch_count)
 
-    return results
+    return processed_docs
 
 
 
 
 def get_batches(
-    docs: list[LangChainDocument], batch_size: int
+    docs: Iterable[LangChainDocument], batch_size: int
 ) -> Generator[list[LangChainDocument], None, None]:
     """Generate batches of documents for parallel processing.
     
     Args:
-        docs: List of LangChain documents to batch.
+        docs: Iterable of LangChain documents to batch.
         batch_size: Number of documents per batch.
     
     Yields:
         Generator[list[LangChainDocument], None, None]: Batches of documents.
     """
-    for i in range(0, len(docs), batch_size):
-        yield docs[i : i + batch_size]
+    for batch in batched(docs, batch_size):
+        yield list(batch)
 
 
 
@@ -144,13 +183,16 @@ def process_batch(
     splitter: RecursiveCharacterTextSplitter,
     batch: list[LangChainDocument],
     retriever: Any,
-) -> None:
+) -> int:
     """Process a single batch of documents by splitting and adding to vector store.
     
     Args:
         splitter: Text splitter for chunking documents.
         batch: Batch of LangChain documents to process.
         retriever: Retriever instance containing the vector store.
+    
+    Returns:
+        int: Number of documents in the batch.
     """
     try:
         split_docs = splitter.split_documents(batch)
@@ -159,4 +201,6 @@ def process_batch(
         logger.info(f"Successfully processed {len(batch)} documents.")
 
     except Exception as e:
-        logger.warning(f"Error processing batch of {len(batch)} documents: {str(e)}")
\ No newline at end of file
+        logger.warning(f"Error processing batch of {len(batch)} documents: {str(e)}")
+
+    return len(batch)
\ No newline at end of file
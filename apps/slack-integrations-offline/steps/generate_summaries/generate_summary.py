@@ -1,12 +1,16 @@
+from pathlib import Path
+
 from loguru import logger
 from typing_extensions import Annotated
 from zenml import get_step_context, step
 
 from src.slack_integrations_offline.domain.document import Document
+from src.slack_integrations_offline.infrastructure.materializers import DocumentListMaterializer
 from src.slack_integrations_offline.applications.summary import SummarizationGenerator
+from src.slack_integrations_offline.infrastructure.storage import SummaryCache
 
 
-@step
+@step(output_materializers=DocumentListMaterializer)
 def generate_summary(
     summarization_model: str,
     documents: list[Document],
@@ -14,7 +18,11 @@ def generate_summary(
     max_workers: int = 10,
     min_document_characters: int = 50,
     summarization_max_characters: int = 1000,
-
+    requests_per_minute: int = 500,
+    tokens_per_minute: int = 200_000,
+    cache_path: Path | None = None,
+    cache_collection_name: str | None = None,
+    max_input_tokens: int = 12_000,
 ) -> Annotated[list[Document],"summary"]:
     """Generate summaries for multiple documents using a llm.
     
@@ -25,25 +33,53 @@ def generate_summary(
         max_workers: Maximum number of concurrent workers for parallel processing.
         min_document_characters: Minimum character length for documents to be summarized.
         summarization_max_characters: Maximum character length for generated summaries.
+        requests_per_minute: Requests per minute allowed by the provider; replaced by the limit
+            reported in the response headers.
+        tokens_per_minute: Tokens per minute allowed by the provider; replaced by the limit
+            reported in the response headers.
+        cache_path: Path of the SQLite summary cache reused across runs, None to disable
+            caching. Defaults to None.
+        cache_collection_name: MongoDB collection shared as a second cache tier, if any.
+            Defaults to None.
+        max_input_tokens: Documents with more content tokens are split into sections, summarized
+            in parallel and reduced into one summary. Defaults to 12000.
     
     Returns:
         list[Document]: List of documents with their generated summaries.
     """
     
+    cache = (
+        SummaryCache(cache_path, mongodb_collection_name=cache_collection_name)
+        if cache_path is not None
+        else None
+    )
+
     summary_generator = SummarizationGenerator(
         summarization_model=summarization_model,
         summarization_max_characters=summarization_max_characters,
         max_workers=max_workers,
         min_document_length=min_document_characters,
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+        cache=cache,
+        max_input_tokens=max_input_tokens,
     )
 
-    summaries = summary_generator.generate(documents=documents, temperature=temperature)
+    try:
+        summaries = summary_generator.generate(documents=documents, temperature=temperature)
+
+    finally:
+        if cache is not None:
+            cache.close()
 
     step_context = get_step_context()
     step_context.add_output_metadata(
         output_name="summary",
         metadata={
-            "len of summaries generated": len(summaries)
+            "len of summaries generated": len(summaries),
+            "rate_limits": summary_generator.rate_limit_stats,
+            **summary_generator.path_stats,
+            "summary_cache": cache.stats() if cache is not None else {},
         }
     )
 
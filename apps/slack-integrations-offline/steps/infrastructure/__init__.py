@@ -1,11 +1,13 @@
 from .save_documents_to_disk import save_documents_to_disk
 from .read_documents_from_disk import read_documents_from_disk
 from .upload_to_s3 import upload_to_s3
+from .download_from_s3 import download_from_s3
 from .ingest_to_mongodb import ingest_to_mongodb
     
 __all__ = [
     "save_documents_to_disk",
     "read_documents_from_disk",
     "upload_to_s3",
+    "download_from_s3",
     "ingest_to_mongodb",
 ]
\ No newline at end of file
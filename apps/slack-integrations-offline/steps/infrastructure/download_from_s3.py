@@ -0,0 +1,79 @@
+from pathlib import Path
+
+from loguru import logger
+from typing_extensions import Annotated
+from zenml import get_step_context, step
+
+from src.slack_integrations_offline.config import settings
+from src.slack_integrations_offline.infrastructure.aws.s3 import S3Client
+
+
+@step
+def download_from_s3(
+    output_dir: Path,
+    s3_prefix: str = "",
+    sync_mode: str = "archive",
+    no_sign_request: bool = False,
+    part_size_mb: int = 16,
+    max_concurrency: int = 8,
+) -> Annotated[str, "output"]:
+    """Restore a folder published with `upload_to_s3` so pipelines can start from S3.
+
+    In "archive" mode the `<folder name>.zip` archive under the prefix is downloaded and
+    extracted. In "sync" mode the folder is restored from its manifest, downloading only
+    files that are missing or changed locally.
+    
+    Args:
+        output_dir: Local folder to restore.
+        s3_prefix: Prefix path in the S3 bucket where the folder was uploaded. Defaults to empty string.
+        sync_mode: Either "archive" or "sync". Defaults to "archive".
+        no_sign_request: Use unsigned requests, for public buckets. Defaults to False.
+        part_size_mb: Size of each ranged GET in MB. Only used in "archive" mode. Defaults to 16.
+        max_concurrency: Maximum number of ranged GETs, or files in "sync" mode, downloaded
+            in parallel. Defaults to 8.
+    
+    Returns:
+        str: String representation of the restored folder path.
+
+    Raises:
+        ValueError: If the sync mode is not supported.
+    """
+
+    output_dir = Path(output_dir)
+    s3_client = S3Client(
+        bucket_name=settings.AWS_S3_BUCKET_NAME, no_sign_request=no_sign_request
+    )
+
+    if sync_mode == "archive":
+        s3_key = f"{s3_prefix.rstrip('/')}/{output_dir.name}.zip".lstrip("/")
+        s3_client.download_folder(
+            s3_key=s3_key,
+            local_path=output_dir,
+            part_size_mb=part_size_mb,
+            max_concurrency=max_concurrency,
+        )
+        transfer_metadata = {}
+    elif sync_mode == "sync":
+        download_result = s3_client.download_shards(
+            local_path=output_dir,
+            s3_prefix=s3_prefix,
+            max_concurrency=max_concurrency,
+        )
+        s3_key = download_result.manifest_key
+        transfer_metadata = download_result.model_dump(exclude={"manifest_key"})
+    else:
+        raise ValueError(f"Unsupported sync mode: {sync_mode}. Expected 'archive' or 'sync'.")
+
+    step_context = get_step_context()
+    step_context.add_output_metadata(
+        output_name="output",
+        metadata={
+            "folder_path": str(output_dir),
+            "s3_key": s3_key,
+            "sync_mode": sync_mode,
+            **transfer_metadata,
+        }
+    )
+
+    logger.info(f"Restored {output_dir} from S3: {s3_key}")
+    return str(output_dir)
\ No newline at end of file
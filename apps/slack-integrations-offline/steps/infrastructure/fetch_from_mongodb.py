@@ -6,14 +6,15 @@ from typing_extensions import Annotated
 from zenml import get_step_context, step
 
 from src.slack_integrations_offline.domain.document import Document
+from src.slack_integrations_offline.infrastructure.materializers import DocumentListMaterializer
 from src.slack_integrations_offline.infrastructure.mongodb.service import MongoDBService
 
 
-@step
+@step(output_materializers=DocumentListMaterializer)
 def fetch_from_mongodb(
     collection_name: str, 
     limit: int,
-) -> Annotated[list[dict], "documents"]:
+) -> Annotated[list[Document], "documents"]:
     """Fetch documents from a MongoDB collection.
     
     Args:
@@ -21,7 +22,7 @@ def fetch_from_mongodb(
         limit: Maximum number of documents to retrieve.
     
     Returns:
-        list[dict]: List of documents fetched from the collection.
+        list[Document]: List of documents fetched from the collection.
     """
     with MongoDBService(model=Document, collection_name=collection_name) as service:
         documents =service.fetch_documents(limit=limit, query={})
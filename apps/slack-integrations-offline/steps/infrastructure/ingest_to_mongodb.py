@@ -13,7 +13,13 @@ from src.slack_integrations_offline.domain.document import Document
 def ingest_to_mongodb(
     models: list[BaseModel], 
     collection_name: str, 
-    clear_collection: bool = True
+    clear_collection: bool = True,
+    upsert_key: str | None = None,
+    batch_size: int = 500,
+    max_workers: int = 4,
+    skip_unchanged: bool = False,
+    fail_on_error: bool = True,
+    delete_missing: bool = False,
 ) -> Annotated[int, "output"]:
     """Ingest documents into a MongoDB collection.
     
@@ -21,12 +27,30 @@ def ingest_to_mongodb(
         models: List of BaseModel instances to ingest into the collection.
         collection_name: Name of the MongoDB collection to ingest documents into.
         clear_collection: Whether to clear existing documents before ingestion. Defaults to True.
+        upsert_key: Dotted field path used to replace existing documents instead of inserting duplicates,
+            e.g. "metadata.url". Defaults to None.
+        batch_size: Number of documents per bulk write. Defaults to 500.
+        max_workers: Maximum number of bulk writes in flight at the same time. Defaults to 4.
+        skip_unchanged: Whether to skip documents whose `content_hash` matches the stored document
+            with the same `upsert_key`. Defaults to False.
+        fail_on_error: Whether to fail the step when some documents could not be written,
+            instead of only logging them. Defaults to True.
+        delete_missing: Whether to delete the stored documents whose `upsert_key` value is not
+            among the ingested documents, such as pages removed from the site. Defaults to False.
     
     Returns:
         int: Count of documents in the collection after ingestion.
+
+    Raises:
+        RuntimeError: If some documents could not be written and `fail_on_error` is set.
+        ValueError: If no documents are provided, or if `delete_missing` is set without an
+            `upsert_key`.
     """
     if not models:
         raise ValueError("No documents provided for ingestion")
+
+    if delete_missing and not upsert_key:
+        raise ValueError("Deleting missing documents requires an upsert key.")
     
 
     model_type = type(models[0]) # getting the class object i.e Document
@@ -42,7 +66,32 @@ def ingest_to_mongodb(
             )
             service.clear_collection()
 
-        service.ingest_documents(models)
+        result = service.ingest_documents(
+            models,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            upsert_key=upsert_key,
+            skip_unchanged=skip_unchanged,
+        )
+
+        if result.failed_count:
+            message = (
+                f"Failed to ingest {result.failed_count}/{len(models)} documents "
+                f"into MongoDB collection '{collection_name}'"
+            )
+
+            if fail_on_error:
+                logger.error(message)
+                raise RuntimeError(message)
+
+            logger.warning(message)
+
+        deleted_count = 0
+        if delete_missing:
+            deleted_count = service.delete_missing(models, upsert_key=upsert_key)
+            logger.info(
+                f"Deleted {deleted_count} documents no longer ingested from MongoDB collection '{collection_name}'"
+            )
 
         count = service.get_collection_count()
 
@@ -55,7 +104,13 @@ def ingest_to_mongodb(
     step_context.add_output_metadata(
         output_name="output",
         metadata={
-            "count": count
+            "count": count,
+            "inserted_count": result.inserted_count,
+            "updated_count": result.updated_count,
+            "unchanged_count": result.unchanged_count,
+            "failed_count": result.failed_count,
+            "deleted_count": deleted_count,
+            "documents_per_second": round(result.documents_per_second, 2),
         }
     )
 
@@ -1,32 +1,61 @@
-import shutil
 from pathlib import Path
 
+from loguru import logger
 from typing_extensions import Annotated
 from zenml.steps import step, get_step_context
 
 from src.slack_integrations_offline.domain.document import Document
+from src.slack_integrations_offline.infrastructure.storage import (
+    ShardMemoryMonitor,
+    get_document_store,
+)
 
 
 @step
 def save_documents_to_disk(
     documents: Annotated[list[Document], "documents"],
     output_dir: Path,
+    storage_format: str = "jsonl",
+    shard_size: int = 1000,
 ) -> Annotated[str, "output"]:
+    """Save documents to disk, replacing any documents already stored in the directory.
+
+    Documents are written one at a time, so artifacts loaded lazily by the
+    `DocumentListMaterializer` are streamed to disk without being fully loaded in memory.
+    
+    Args:
+        documents: List of documents to save.
+        output_dir: Directory the documents are written to.
+        storage_format: On-disk format, either "jsonl" (compressed shards) or "json" (one file per document).
+            Defaults to "jsonl".
+        shard_size: Maximum number of documents per shard for the "jsonl" format. Defaults to 1000.
+    
+    Returns:
+        str: String representation of the output directory.
+    """
     
-    if output_dir.exists():
-        shutil.rmtree(output_dir)
+    document_store = get_document_store(
+        output_dir, storage_format=storage_format, shard_size=shard_size
+    )
 
-    output_dir.mkdir(parents=True)
+    memory_monitor = ShardMemoryMonitor()
+    saved_documents_count = document_store.write_documents(documents, on_shard=memory_monitor)
+    bytes_on_disk = document_store.size_bytes()
 
-    for document in documents:
-        document.write(output_dir=output_dir, also_save_as_txt=True)
+    logger.info(
+        f"Saved {saved_documents_count} documents to '{output_dir}' ({bytes_on_disk // 1024} KB)"
+    )
 
     step_context = get_step_context()
     step_context.add_output_metadata(
         output_name="output",
         metadata={
-            "saved_documents_count": len(documents),
+            "saved_documents_count": saved_documents_count,
             "output_dir": str(output_dir),
+            "storage_format": storage_format,
+            "bytes_on_disk": bytes_on_disk,
+            "shards": memory_monitor.shards,
+            "peak_rss_mb": memory_monitor.peak_rss_mb,
         }
     )
 
@@ -13,20 +13,55 @@ from src.slack_integrations_offline.infrastructure.aws.s3 import S3Client
 def upload_to_s3(
     folder_path: Path,
     s3_prefix: str = "",
+    sync_mode: str = "archive",
+    streaming: bool = True,
+    part_size_mb: int = 16,
+    max_concurrency: int = 8,
 ) -> Annotated[str, "output"]:
     """Upload a local folder to AWS S3 and generate a presigned download URL.
+
+    In "archive" mode the whole folder is uploaded as a single zip archive. In "sync" mode
+    only files whose content is not already in S3 are uploaded, alongside a manifest.
     
     Args:
         folder_path: Path to the local folder to upload.
         s3_prefix: Prefix path in S3 bucket where files will be uploaded. Defaults to empty string.
+        sync_mode: Either "archive" or "sync". Defaults to "archive".
+        streaming: Stream the archive into a parallel multipart upload instead of writing a
+            temporary zip file first. Only used in "archive" mode. Defaults to True.
+        part_size_mb: Size of each multipart upload part in MB. Defaults to 16.
+        max_concurrency: Maximum number of parts, or files in "sync" mode, uploaded in
+            parallel. Defaults to 8.
     
     Returns:
         str: String representation of the uploaded folder path.
+
+    Raises:
+        ValueError: If the sync mode is not supported.
     """
     time.sleep(1)
 
     s3_client = S3Client(bucket_name=settings.AWS_S3_BUCKET_NAME)
-    s3_key = s3_client.upload_folder(local_path=folder_path, s3_prefix=s3_prefix)
+
+    if sync_mode == "archive":
+        s3_key = s3_client.upload_folder(
+            local_path=folder_path,
+            s3_prefix=s3_prefix,
+            streaming=streaming,
+            part_size_mb=part_size_mb,
+            max_concurrency=max_concurrency,
+        )
+        transfer_metadata = {}
+    elif sync_mode == "sync":
+        sync_result = s3_client.sync_folder(
+            local_path=folder_path,
+            s3_prefix=s3_prefix,
+            max_concurrency=max_concurrency,
+        )
+        s3_key = sync_result.manifest_key
+        transfer_metadata = sync_result.model_dump(exclude={"manifest_key"})
+    else:
+        raise ValueError(f"Unsupported sync mode: {sync_mode}. Expected 'archive' or 'sync'.")
 
     download_url = s3_client.get_public_url(s3_key=s3_key)
     
@@ -36,7 +71,9 @@ def upload_to_s3(
         metadata={
             "folder_path": str(folder_path),
             "s3_prefix": s3_prefix,
+            "sync_mode": sync_mode,
             "download_url": download_url,
+            **transfer_metadata,
         }
     )
 
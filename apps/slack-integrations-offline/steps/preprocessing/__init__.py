@@ -0,0 +1,4 @@
+from .deduplicate_documents import deduplicate_documents
+from .strip_boilerplate import strip_boilerplate
+
+__all__ = ["deduplicate_documents", "strip_boilerplate"]
\ No newline at end of file
@@ -0,0 +1,71 @@
+import time
+
+from loguru import logger
+from typing_extensions import Annotated
+from zenml import get_step_context, step
+
+from src.slack_integrations_offline.applications.preprocessing import (
+    NearDuplicateDetector,
+    deduplicate_documents as deduplicate,
+)
+from src.slack_integrations_offline.domain.document import Document
+from src.slack_integrations_offline.infrastructure.materializers import DocumentListMaterializer
+
+
+@step(output_materializers=DocumentListMaterializer)
+def deduplicate_documents(
+    documents: list[Document],
+    similarity_threshold: float = 0.9,
+    num_permutations: int = 128,
+    shingle_size: int = 5,
+) -> Annotated[list[Document], "deduplicated"]:
+    """Drop near-duplicate documents before they reach summarization and embedding.
+
+    Documents published under several URLs (versioned paths, trailing-slash variants, print
+    views) are grouped by MinHash similarity of their markdown. One canonical document is kept
+    per group and the URLs of the others are recorded in its `aliases`.
+
+    Args:
+        documents: List of documents to deduplicate.
+        similarity_threshold: Minimum estimated Jaccard similarity of word shingles for two
+            documents to be duplicates. Defaults to 0.9.
+        num_permutations: Number of MinHash values per document. Defaults to 128.
+        shingle_size: Number of consecutive words per shingle. Defaults to 5.
+
+    Returns:
+        list[Document]: Deduplicated documents.
+    """
+
+    detector = NearDuplicateDetector(
+        threshold=similarity_threshold,
+        num_permutations=num_permutations,
+        shingle_size=shingle_size,
+    )
+
+    start_time = time.perf_counter()
+    deduplicated_documents, duplicate_groups = deduplicate(documents, detector)
+    elapsed_seconds = time.perf_counter() - start_time
+
+    logger.info(
+        f"Kept {len(deduplicated_documents)}/{len(documents)} documents after near-duplicate "
+        f"detection in {elapsed_seconds:.2f}s"
+    )
+
+    step_context = get_step_context()
+    step_context.add_output_metadata(
+        output_name="deduplicated",
+        metadata={
+            "input_documents": len(documents),
+            "output_documents": len(deduplicated_documents),
+            "duplicates_removed": len(documents) - len(deduplicated_documents),
+            "duplicate_groups": len(duplicate_groups),
+            "largest_duplicate_group": max(map(len, duplicate_groups), default=0),
+            "duplicate_group_examples": duplicate_groups[:10],
+            "similarity_threshold": similarity_threshold,
+            "lsh_bands": detector.num_bands,
+            "lsh_rows_per_band": detector.rows_per_band,
+            "elapsed_seconds": round(elapsed_seconds, 3),
+        }
+    )
+
+    return deduplicated_documents
\ No newline at end of file
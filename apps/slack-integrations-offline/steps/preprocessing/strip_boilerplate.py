@@ -0,0 +1,95 @@
+import time
+
+import tiktoken
+from loguru import logger
+from typing_extensions import Annotated
+from zenml import get_step_context, step
+
+from src.slack_integrations_offline.applications.preprocessing import (
+    BoilerplateDetector,
+    strip_boilerplate as strip,
+)
+from src.slack_integrations_offline.domain.document import Document
+from src.slack_integrations_offline.infrastructure.materializers import DocumentListMaterializer
+
+
+@step(output_materializers=DocumentListMaterializer)
+def strip_boilerplate(
+    documents: list[Document],
+    min_page_fraction: float = 0.2,
+    min_pages: int = 10,
+    tokenizer_model: str = "gpt-4o-mini",
+) -> Annotated[list[Document], "stripped"]:
+    """Remove the navigation, sidebars and footers repeated across the pages of a crawl.
+
+    Lines found on a large fraction of the pages are stripped from every document before it
+    is summarized and embedded, and the tokens saved are reported in the step metadata, or
+    the characters saved when the tokenizer cannot be downloaded.
+
+    Args:
+        documents: List of documents to clean.
+        min_page_fraction: Fraction of the pages a line must appear on to be boilerplate.
+            Defaults to 0.2.
+        min_pages: Minimum number of pages a line must appear on to be boilerplate.
+            Defaults to 10.
+        tokenizer_model: Model whose tokenizer measures the token savings.
+            Defaults to "gpt-4o-mini".
+
+    Returns:
+        list[Document]: Documents without their boilerplate lines.
+    """
+
+    detector = BoilerplateDetector(min_page_fraction=min_page_fraction, min_pages=min_pages)
+
+    encoding = _get_encoding(tokenizer_model)
+
+    start_time = time.perf_counter()
+    stripped_documents, stats = strip(documents, detector, encoding=encoding)
+    elapsed_seconds = time.perf_counter() - start_time
+
+    unit = "tokens" if encoding is not None else "characters"
+    saved = stats[f"{unit}_before"] - stats[f"{unit}_after"]
+
+    logger.info(
+        f"Stripped {len(detector.boilerplate_hashes)} boilerplate lines from {len(stripped_documents)} "
+        f"documents in {elapsed_seconds:.2f}s, saving {saved}/{stats[f'{unit}_before']} {unit}"
+    )
+
+    metadata = {
+        "documents": len(stripped_documents),
+        "boilerplate_lines": len(detector.boilerplate_hashes),
+        "lines_removed": sum(detector.removed_lines.values()),
+        "top_boilerplate_lines": dict(detector.removed_lines.most_common(20)),
+        **stats,
+        "characters_saved": stats["characters_before"] - stats["characters_after"],
+        "elapsed_seconds": round(elapsed_seconds, 3),
+    }
+    if encoding is not None:
+        tokens_saved = stats["tokens_before"] - stats["tokens_after"]
+        metadata["tokens_saved"] = tokens_saved
+        metadata["tokens_saved_ratio"] = round(tokens_saved / max(stats["tokens_before"], 1), 4)
+
+    step_context = get_step_context()
+    step_context.add_output_metadata(output_name="stripped", metadata=metadata)
+
+    return stripped_documents
+
+
+def _get_encoding(model: str) -> tiktoken.Encoding | None:
+    """Get the tokenizer of a model, falling back to the one of the embedding splitter.
+
+    Tokenizer files are downloaded on first use, so None is returned when they cannot be
+    fetched and the savings are reported in characters instead.
+    """
+
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+
+    except Exception as e:
+        logger.warning(f"Tokenizer of '{model}' is unavailable, reporting characters only: {e}")
+
+        return None
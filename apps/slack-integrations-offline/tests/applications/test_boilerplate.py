@@ -0,0 +1,114 @@
+import pytest
+
+from src.slack_integrations_offline.applications.preprocessing import (
+    BoilerplateDetector,
+    strip_boilerplate,
+)
+from src.slack_integrations_offline.domain import Document, DocumentMetadata
+
+
+NAVIGATION = "[Home](/)\n[Guides](/guides)\n[API reference](/api)"
+FOOTER = "Copyright 2024 Example Inc.\nAll rights reserved."
+
+
+def make_page(index, body):
+    return f"{NAVIGATION}\n\n# Page {index}\n\n{body}\n\n{FOOTER}"
+
+
+def make_document(index, content):
+    return Document(
+        metadata=DocumentMetadata(
+            id=str(index),
+            url=f"https://docs.example.com/{index}",
+            title=f"Page {index}",
+            properties={},
+        ),
+        content=content,
+    )
+
+
+class WordEncoding:
+    """Tokenizer stand-in counting words, since tiktoken downloads its files on first use."""
+
+    def encode_ordinary(self, text):
+        return text.split()
+
+
+def make_detector():
+    return BoilerplateDetector(min_page_fraction=0.5, min_pages=3)
+
+
+def test_repeated_blocks_are_removed():
+    pages = [make_page(index, f"Content of page {index}.") for index in range(4)]
+    detector = make_detector().fit(pages)
+
+    assert detector.strip(pages[0]) == "# Page 0\n\nContent of page 0."
+    assert detector.removed_lines["[home](/)"] == 1
+    assert sum(detector.removed_lines.values()) == 5
+
+
+def test_single_repeated_line_is_kept():
+    pages = [f"See the changelog for details.\n\nContent of page {index}." for index in range(4)]
+    detector = make_detector().fit(pages)
+
+    assert detector.boilerplate_hashes
+    assert detector.strip(pages[0]) == pages[0]
+
+
+def test_runs_are_broken_by_content_lines():
+    pages = [f"First repeated line\nContent {index}\nSecond repeated line" for index in range(4)]
+    detector = make_detector().fit(pages)
+
+    assert detector.strip(pages[0]) == pages[0]
+
+
+def test_lines_below_the_page_threshold_are_kept():
+    pages = [make_page(index, f"Content of page {index}.") for index in range(2)]
+    pages += [f"# Page {index}\n\nContent of page {index}." for index in range(2, 6)]
+    detector = make_detector().fit(pages)
+
+    assert not detector.boilerplate_hashes
+    assert detector.strip(pages[0]) == pages[0]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "| Name | Type |\n| --- | --- |\n| id | string |\n| url | string |",
+        "Name | Type\n--- | ---\nid | string\nurl | string",
+        "```python\nimport os\nimport sys\n```",
+        "## Installation\n## Usage",
+    ],
+    ids=["table", "table_without_outer_pipes", "code_block", "headings"],
+)
+def test_structural_markdown_is_preserved(body):
+    pages = [make_page(index, body) for index in range(4)]
+    detector = make_detector().fit(pages)
+
+    assert detector.strip(pages[0]) == f"# Page 0\n\n{body}"
+
+
+def test_strip_boilerplate_reports_sizes():
+    contents = [make_page(index, f"Content of page {index}.") for index in range(4)]
+    contents.append("A page without boilerplate.")
+    documents = [make_document(index, content) for index, content in enumerate(contents)]
+    encoding = WordEncoding()
+
+    stripped, stats = strip_boilerplate(documents, make_detector(), encoding=encoding)
+
+    assert stripped[0].content == "# Page 0\n\nContent of page 0."
+    assert stripped[4] is documents[4]
+    assert documents[0].content == contents[0]
+    assert stats["documents_changed"] == 4
+    assert stats["characters_before"] == sum(map(len, contents))
+    assert stats["characters_after"] == sum(len(document.content) for document in stripped)
+    assert stats["tokens_before"] == sum(len(encoding.encode_ordinary(text)) for text in contents)
+    assert stats["tokens_after"] < stats["tokens_before"]
+
+
+def test_strip_boilerplate_without_encoding_counts_characters_only():
+    documents = [make_document(index, make_page(index, "Content.")) for index in range(4)]
+
+    _, stats = strip_boilerplate(documents, make_detector())
+
+    assert set(stats) == {"documents_changed", "characters_before", "characters_after"}
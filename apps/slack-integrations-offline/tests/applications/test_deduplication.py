@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from src.slack_integrations_offline.applications.preprocessing import (
+    NearDuplicateDetector,
+    deduplicate_documents,
+)
+from src.slack_integrations_offline.domain import Document, DocumentMetadata
+
+
+def make_text(seed, num_words=300):
+    words = random.Random(seed).choices([f"word{index}" for index in range(2000)], k=num_words)
+
+    return " ".join(words)
+
+
+def make_document(url, content, aliases=None):
+    return Document(
+        metadata=DocumentMetadata(
+            id=url,
+            url=url,
+            title=url,
+            properties={},
+            aliases=aliases or [],
+        ),
+        content=content,
+    )
+
+
+def test_near_duplicates_share_a_cluster():
+    detector = NearDuplicateDetector()
+    text = make_text(0)
+    near_duplicate = text.replace(text.split()[150], "changed", 1)
+
+    signatures = [detector.signature(text) for text in [text, make_text(1), near_duplicate]]
+
+    assert detector.similarity(signatures[0], signatures[2]) >= 0.9
+    assert detector.find_clusters(signatures) == [[0, 2]]
+
+
+def test_distinct_documents_are_not_clustered():
+    detector = NearDuplicateDetector()
+
+    signatures = [detector.signature(make_text(seed)) for seed in range(20)]
+
+    assert detector.find_clusters(signatures) == []
+
+
+def test_signature_ignores_case_and_markup():
+    detector = NearDuplicateDetector()
+    text = make_text(0)
+
+    assert (detector.signature(text) == detector.signature(f"# {text.upper()} **")).all()
+
+
+def test_wordless_documents_are_kept_as_is():
+    documents = [
+        make_document("https://docs.example.com/a", "---"),
+        make_document("https://docs.example.com/b", "---"),
+        make_document("https://docs.example.com/c", ""),
+    ]
+
+    deduplicated, groups = deduplicate_documents(documents, NearDuplicateDetector())
+
+    assert NearDuplicateDetector().signature("---") is None
+    assert deduplicated == documents
+    assert groups == []
+
+
+def test_canonical_url_is_the_shortest_shallowest_one():
+    text = make_text(0)
+    documents = [
+        make_document("https://docs.example.com/v2/guide/install", text),
+        make_document("https://docs.example.com/guide/install?print=1", text),
+        make_document("https://docs.example.com/guide/install", text),
+        make_document("https://docs.example.com/other", make_text(1)),
+    ]
+
+    deduplicated, groups = deduplicate_documents(documents, NearDuplicateDetector())
+
+    assert [document.metadata.url for document in deduplicated] == [
+        "https://docs.example.com/guide/install",
+        "https://docs.example.com/other",
+    ]
+    assert groups == [
+        [
+            "https://docs.example.com/guide/install",
+            "https://docs.example.com/v2/guide/install",
+            "https://docs.example.com/guide/install?print=1",
+        ]
+    ]
+
+
+def test_duplicate_urls_and_aliases_are_recorded_on_the_canonical_document():
+    text = make_text(0)
+    documents = [
+        make_document("https://docs.example.com/guide", text, aliases=["https://docs.example.com/guide/"]),
+        make_document("https://docs.example.com/v1/guide", text, aliases=["https://docs.example.com/old/guide"]),
+    ]
+
+    deduplicated, _ = deduplicate_documents(documents, NearDuplicateDetector())
+
+    assert len(deduplicated) == 1
+    assert deduplicated[0].metadata.aliases == [
+        "https://docs.example.com/guide/",
+        "https://docs.example.com/v1/guide",
+        "https://docs.example.com/old/guide",
+    ]
+    assert documents[0].metadata.aliases == ["https://docs.example.com/guide/"]
+
+
+def test_invalid_threshold_is_rejected():
+    with pytest.raises(ValueError):
+        NearDuplicateDetector(threshold=0.0)
@@ -0,0 +1,159 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from src.slack_integrations_offline.applications.crawlers.rate_limiter import (
+    AdaptiveRateLimiter,
+    HostRateLimiter,
+    _parse_retry_after,
+)
+
+
+URL = "https://docs.example.com/page"
+
+
+def test_parse_retry_after_seconds():
+    assert _parse_retry_after(" 120 ") == 120.0
+
+
+def test_parse_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=60)
+
+    delay = _parse_retry_after(format_datetime(retry_at, usegmt=True))
+
+    assert 55 <= delay <= 60
+
+
+def test_parse_retry_after_date_without_timezone_is_utc():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=60)
+
+    delay = _parse_retry_after(retry_at.strftime("%a, %d %b %Y %H:%M:%S -0000"))
+
+    assert 55 <= delay <= 60
+
+
+def test_parse_retry_after_past_date_is_zero():
+    assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+@pytest.mark.parametrize("retry_after", ["", "soon", "-5"])
+def test_parse_retry_after_invalid(retry_after):
+    assert _parse_retry_after(retry_after) is None
+
+
+def test_retry_after_pause_is_capped():
+    rate_limiter = AdaptiveRateLimiter(max_retry_after=30.0)
+
+    rate_limiter.record(URL, 429, latency=0.1, retry_after="Fri, 01 Jan 2100 00:00:00 GMT")
+
+    host_limiter = rate_limiter.hosts["docs.example.com"]
+    assert host_limiter._blocked_until - time.monotonic() <= 30.0
+
+
+def test_fast_successes_increase_the_rate_up_to_the_maximum():
+    rate_limiter = AdaptiveRateLimiter(initial_rate=1.0, max_rate=2.0, additive_increase=0.5)
+
+    rate_limiter.record(URL, 200, latency=0.1)
+    assert rate_limiter.current_rates() == {"docs.example.com": 1.5}
+
+    for _ in range(5):
+        rate_limiter.record(URL, 200, latency=0.1)
+    assert rate_limiter.current_rates() == {"docs.example.com": 2.0}
+
+
+def test_client_errors_leave_the_rate_unchanged():
+    rate_limiter = AdaptiveRateLimiter(initial_rate=1.0)
+
+    rate_limiter.record(URL, 404, latency=0.1)
+
+    assert rate_limiter.current_rates() == {"docs.example.com": 1.0}
+
+
+@pytest.mark.parametrize("status_code, latency", [(429, 0.1), (503, 0.1), (200, 10.0)])
+def test_throttling_or_slow_responses_decrease_the_rate(status_code, latency):
+    rate_limiter = AdaptiveRateLimiter(initial_rate=4.0, target_latency=5.0)
+
+    rate_limiter.record(URL, status_code, latency=latency)
+
+    assert rate_limiter.current_rates() == {"docs.example.com": 2.0}
+
+
+def test_concurrent_throttling_decreases_the_rate_once():
+    rate_limiter = AdaptiveRateLimiter(initial_rate=8.0)
+
+    for _ in range(10):
+        rate_limiter.record(URL, 429, latency=1.0)
+
+    assert rate_limiter.current_rates() == {"docs.example.com": 4.0}
+    assert rate_limiter.hosts["docs.example.com"].throttle_count == 10
+
+
+def test_throttling_after_the_decrease_decreases_again():
+    rate_limiter = AdaptiveRateLimiter(initial_rate=8.0)
+
+    rate_limiter.record(URL, 429, latency=0.0)
+    time.sleep(0.01)
+    rate_limiter.record(URL, 429, latency=0.0)
+
+    assert rate_limiter.current_rates() == {"docs.example.com": 2.0}
+
+
+def test_decrease_stops_at_the_minimum_rate():
+    host_limiter = HostRateLimiter("docs.example.com", rate=1.0, min_rate=0.5, max_rate=10.0)
+
+    for _ in range(3):
+        host_limiter.decrease(0.5, sent_at=time.monotonic())
+
+    assert host_limiter.rate == 0.5
+
+
+def test_limit_rate_lowers_the_floor_below_the_crawl_delay():
+    host_limiter = HostRateLimiter("docs.example.com", rate=2.0, min_rate=0.2, max_rate=20.0)
+
+    host_limiter.limit_rate(0.1)
+    host_limiter.decrease(0.5, sent_at=time.monotonic())
+    host_limiter.increase(1.0)
+
+    assert host_limiter.max_rate == 0.1
+    assert host_limiter.min_rate == 0.1
+    assert host_limiter.rate == 0.1
+
+
+def test_limit_rate_never_raises_the_maximum():
+    host_limiter = HostRateLimiter("docs.example.com", rate=2.0, min_rate=0.2, max_rate=5.0)
+
+    host_limiter.limit_rate(10.0)
+
+    assert host_limiter.max_rate == 5.0
+    assert host_limiter.rate == 2.0
+
+
+def test_acquire_paces_requests_at_the_rate():
+    host_limiter = HostRateLimiter("docs.example.com", rate=20.0, min_rate=1.0, max_rate=20.0)
+
+    async def acquire_all():
+        start = time.monotonic()
+        for _ in range(5):
+            await host_limiter.acquire()
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(acquire_all())
+
+    # The first token is available right away, the next four take 1/20 s each
+    assert 0.18 <= elapsed < 0.5
+    assert host_limiter.request_count == 5
+
+
+def test_block_pauses_the_host():
+    host_limiter = HostRateLimiter("docs.example.com", rate=100.0, min_rate=1.0, max_rate=100.0)
+    host_limiter.block(0.2)
+
+    async def acquire():
+        start = time.monotonic()
+        await host_limiter.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(acquire()) >= 0.19
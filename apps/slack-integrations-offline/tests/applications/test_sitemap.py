@@ -0,0 +1,172 @@
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.slack_integrations_offline.applications.crawlers.sitemap import SitemapCollector
+
+
+def urlset(*urls: str) -> bytes:
+    locations = "".join(f"<url><loc>{url}</loc><priority>0.5</priority></url>" for url in urls)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locations}</urlset>'
+    ).encode("utf-8")
+
+
+def sitemap_index(*urls: str) -> bytes:
+    locations = "".join(f"<sitemap><loc>{url}</loc></sitemap>" for url in urls)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locations}</sitemapindex>'
+    ).encode("utf-8")
+
+
+class Site:
+    """Local HTTP server answering the requested paths from an in-memory map of files."""
+
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+        self.requested_paths: list[str] = []
+
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                site.requested_paths.append(self.path)
+                body = site.files.get(self.path)
+
+                if body is None:
+                    self.send_error(404)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+
+@pytest.fixture
+def site():
+    site = Site()
+    thread = threading.Thread(target=site.server.serve_forever, daemon=True)
+    thread.start()
+
+    yield site
+
+    site.server.shutdown()
+    site.server.server_close()
+
+
+def collected_urls(entries) -> set[str]:
+    return {entry.url for entry in entries}
+
+
+def test_reads_sitemaps_declared_in_robots_txt(site):
+    site.files["/robots.txt"] = f"User-agent: *\nSitemap: {site.url}/declared.xml\n".encode()
+    site.files["/declared.xml"] = urlset(f"{site.url}/docs/a", f"{site.url}/docs/b")
+    site.files["/sitemap.xml"] = urlset(f"{site.url}/docs/fallback")
+
+    collector = SitemapCollector()
+    entries = collector(f"{site.url}/")
+
+    assert collected_urls(entries) == {f"{site.url}/docs/a", f"{site.url}/docs/b"}
+    assert entries[0].priority == 0.5
+    assert "/sitemap.xml" not in site.requested_paths
+
+
+def test_falls_back_to_sitemap_xml_without_robots_txt(site):
+    site.files["/sitemap.xml"] = urlset(f"{site.url}/docs/a")
+
+    entries = SitemapCollector()(f"{site.url}/")
+
+    assert collected_urls(entries) == {f"{site.url}/docs/a"}
+
+
+def test_falls_back_to_sitemap_pages_xml(site):
+    site.files["/robots.txt"] = b"User-agent: *\nDisallow:\n"
+    site.files["/sitemap-pages.xml"] = urlset(f"{site.url}/docs/a")
+
+    collector = SitemapCollector()
+    entries = collector(f"{site.url}/")
+
+    assert collected_urls(entries) == {f"{site.url}/docs/a"}
+    assert collector.failed_sitemap_count == 1
+
+
+def test_decompresses_gzip_sitemaps(site):
+    site.files["/sitemap.xml"] = sitemap_index(f"{site.url}/pages.xml.gz")
+    site.files["/pages.xml.gz"] = gzip.compress(urlset(f"{site.url}/docs/a", f"{site.url}/docs/b"))
+
+    entries = SitemapCollector()(f"{site.url}/")
+
+    assert collected_urls(entries) == {f"{site.url}/docs/a", f"{site.url}/docs/b"}
+
+
+def test_follows_nested_sitemap_indexes(site):
+    site.files["/sitemap.xml"] = sitemap_index(f"{site.url}/index-1.xml", f"{site.url}/pages-1.xml")
+    site.files["/index-1.xml"] = sitemap_index(f"{site.url}/index-2.xml", f"{site.url}/pages-1.xml")
+    site.files["/index-2.xml"] = sitemap_index(f"{site.url}/pages-2.xml")
+    site.files["/pages-1.xml"] = urlset(f"{site.url}/docs/a", f"{site.url}/docs/b")
+    site.files["/pages-2.xml"] = urlset(f"{site.url}/docs/b", f"{site.url}/docs/c")
+
+    collector = SitemapCollector()
+    entries = collector(f"{site.url}/")
+
+    assert sorted(entry.url for entry in entries) == [
+        f"{site.url}/docs/a", f"{site.url}/docs/b", f"{site.url}/docs/c"
+    ]
+    assert collector.sitemap_count == 5
+    assert site.requested_paths.count("/pages-1.xml") == 1
+
+
+def test_ignores_indexes_nested_deeper_than_max_depth(site):
+    site.files["/sitemap.xml"] = sitemap_index(f"{site.url}/index-1.xml")
+    site.files["/index-1.xml"] = sitemap_index(f"{site.url}/pages.xml")
+    site.files["/pages.xml"] = urlset(f"{site.url}/docs/a")
+
+    entries = SitemapCollector(max_depth=1)(f"{site.url}/")
+
+    assert entries == []
+    assert "/pages.xml" not in site.requested_paths
+
+
+def test_keeps_only_entries_within_the_url_prefix(site):
+    site.files["/robots.txt"] = f"Sitemap: {site.url}/sitemap.xml\n".encode()
+    site.files["/sitemap.xml"] = urlset(
+        f"{site.url}/docs", f"{site.url}/docs/a", f"{site.url}/docs-old/a", f"{site.url}/blog/b"
+    )
+
+    collector = SitemapCollector()
+    entries = collector(f"{site.url}/docs")
+
+    assert collected_urls(entries) == {f"{site.url}/docs", f"{site.url}/docs/a"}
+    assert collector.out_of_prefix_count == 2
+
+
+def test_raises_when_no_sitemap_can_be_fetched(site):
+    collector = SitemapCollector()
+
+    with pytest.raises(ValueError, match="No sitemap could be fetched"):
+        collector(f"{site.url}/")
+
+    assert collector.failed_sitemap_count == 2
+
+
+def test_skips_malformed_child_sitemaps(site):
+    site.files["/sitemap.xml"] = sitemap_index(f"{site.url}/broken.xml", f"{site.url}/pages.xml")
+    site.files["/broken.xml"] = b"<urlset><url><loc>"
+    site.files["/pages.xml"] = urlset(f"{site.url}/docs/a")
+
+    collector = SitemapCollector()
+    entries = collector(f"{site.url}/")
+
+    assert collected_urls(entries) == {f"{site.url}/docs/a"}
+    assert collector.failed_sitemap_count == 1
@@ -0,0 +1,5 @@
+import os
+
+
+# Settings are loaded on import and require an OpenAI key, which the tests never use
+os.environ.setdefault("OPENAI_API_KEY", "test")
@@ -0,0 +1,215 @@
+import hashlib
+import json
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.slack_integrations_offline.domain import Document, DocumentMetadata
+from src.slack_integrations_offline.infrastructure.aws.s3 import S3Client
+from src.slack_integrations_offline.infrastructure.storage import get_document_store
+
+
+BUCKET_NAME = "test-bucket"
+REGION = "us-east-1"
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", REGION)
+
+    with mock_aws():
+        yield S3Client(bucket_name=BUCKET_NAME, region=REGION)
+
+
+@pytest.fixture
+def source_folder(tmp_path):
+    folder = tmp_path / "source"
+    (folder / "nested").mkdir(parents=True)
+    (folder / "a.json").write_text('{"id": "a"}')
+    (folder / "nested" / "b.json").write_text('{"id": "b"}')
+    (folder / "nested" / "copy_of_a.json").write_text('{"id": "a"}')
+    (folder / "large.bin").write_bytes(bytes(range(256)) * 8192)
+
+    return folder
+
+
+def make_documents(count):
+    return [
+        Document(
+            metadata=DocumentMetadata(
+                id=str(index),
+                url=f"https://docs.example.com/{index}",
+                title=f"Page {index}",
+                properties={},
+            ),
+            content=f"Content of page {index}",
+        )
+        for index in range(count)
+    ]
+
+
+def list_object_keys(prefix):
+    response = boto3.client("s3", region_name=REGION).list_objects_v2(
+        Bucket=BUCKET_NAME, Prefix=prefix
+    )
+
+    return {s3_object["Key"] for s3_object in response.get("Contents", [])}
+
+
+def read_folder(folder):
+    return {
+        path.relative_to(folder).as_posix(): path.read_bytes()
+        for path in sorted(folder.rglob("*"))
+        if path.is_file()
+    }
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_upload_folder_round_trip(s3_client, source_folder, tmp_path, streaming):
+    s3_key = s3_client.upload_folder(source_folder, s3_prefix="archives", streaming=streaming)
+
+    destination = s3_client.download_folder(s3_key, tmp_path / "restored", part_size_mb=1)
+
+    assert s3_key == "archives/source.zip"
+    assert read_folder(destination) == read_folder(source_folder)
+
+
+def test_download_folder_removes_stale_files(s3_client, source_folder, tmp_path):
+    s3_key = s3_client.upload_folder(source_folder)
+    destination = tmp_path / "restored"
+    destination.mkdir()
+    (destination / "stale.json").write_text("{}")
+
+    s3_client.download_folder(s3_key, destination)
+
+    assert read_folder(destination) == read_folder(source_folder)
+    assert not list(tmp_path.glob(".restored.*"))
+
+
+def test_sync_folder_round_trip(s3_client, source_folder, tmp_path):
+    sync_result = s3_client.sync_folder(source_folder, s3_prefix="shards")
+    destination = tmp_path / "restored"
+
+    download_result = s3_client.download_shards(destination, s3_prefix="shards")
+
+    assert sync_result.manifest_key == "shards/manifest.json"
+    assert sync_result.uploaded_objects == 3
+    assert sync_result.skipped_objects == 1
+    assert download_result.downloaded_objects == 4
+    assert read_folder(destination) == read_folder(source_folder)
+
+
+def test_sync_folder_skips_unchanged_files(s3_client, source_folder):
+    s3_client.sync_folder(source_folder, s3_prefix="shards")
+    (source_folder / "nested" / "b.json").write_text('{"id": "b", "updated": true}')
+
+    sync_result = s3_client.sync_folder(source_folder, s3_prefix="shards")
+
+    assert sync_result.uploaded_objects == 1
+    assert sync_result.skipped_objects == 3
+    assert sync_result.deleted_objects == 1
+    assert len(list_object_keys("shards/objects/")) == 3
+
+
+def test_sync_folder_skips_bucketed_shards_written_in_another_order(s3_client, tmp_path):
+    documents = make_documents(200)
+    store = get_document_store(tmp_path / "crawled", storage_format="jsonl", bucket_count=8)
+    store.write_documents(documents)
+    first_sync = s3_client.sync_folder(store.directory, s3_prefix="shards")
+
+    store.write_documents(reversed(documents))
+    second_sync = s3_client.sync_folder(store.directory, s3_prefix="shards")
+
+    documents[0].content = "Updated content"
+    store.write_documents(documents)
+    third_sync = s3_client.sync_folder(store.directory, s3_prefix="shards")
+
+    # The store manifest names the shards of each writer, so it is uploaded on every write
+    assert first_sync.uploaded_objects == 9
+    assert second_sync.uploaded_objects == 1
+    assert second_sync.skipped_objects == 8
+    assert third_sync.uploaded_objects == 2
+    assert third_sync.deleted_objects == 2
+    assert sorted(document.id for document in store.iter_documents()) == sorted(
+        document.id for document in documents
+    )
+
+
+def test_sync_folder_keeps_orphans_when_asked(s3_client, source_folder):
+    s3_client.sync_folder(source_folder, s3_prefix="shards")
+    (source_folder / "nested" / "b.json").unlink()
+
+    sync_result = s3_client.sync_folder(source_folder, s3_prefix="shards", delete_orphans=False)
+
+    assert sync_result.deleted_objects == 0
+    assert len(list_object_keys("shards/objects/")) == 3
+
+
+def test_download_shards_keeps_matching_files_and_removes_stale_ones(
+    s3_client, source_folder, tmp_path
+):
+    s3_client.sync_folder(source_folder, s3_prefix="shards")
+    destination = tmp_path / "restored"
+    s3_client.download_shards(destination, s3_prefix="shards")
+    (destination / "a.json").write_text("modified")
+    (destination / "stale.json").write_text("{}")
+
+    download_result = s3_client.download_shards(destination, s3_prefix="shards")
+
+    assert download_result.downloaded_objects == 1
+    assert download_result.skipped_objects == 3
+    assert download_result.removed_objects == 1
+    assert read_folder(destination) == read_folder(source_folder)
+
+
+def test_download_shards_rejects_tampered_objects(s3_client, source_folder, tmp_path):
+    s3_client.sync_folder(source_folder, s3_prefix="shards")
+    digest = hashlib.sha256((source_folder / "nested" / "b.json").read_bytes()).hexdigest()
+    boto3.client("s3", region_name=REGION).put_object(
+        Bucket=BUCKET_NAME, Key=f"shards/objects/{digest}", Body=b'{"id": "tampered"}'
+    )
+    destination = tmp_path / "restored"
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        s3_client.download_shards(destination, s3_prefix="shards")
+
+    assert not (destination / "nested" / "b.json").exists()
+    assert not list(tmp_path.rglob("*.download"))
+
+
+def test_failed_download_shards_leaves_the_folder_untouched(s3_client, source_folder, tmp_path):
+    destination = tmp_path / "restored"
+    s3_client.sync_folder(source_folder, s3_prefix="shards")
+    s3_client.download_shards(destination, s3_prefix="shards")
+    (destination / "stale.json").write_text("{}")
+    previous_files = read_folder(destination)
+
+    (source_folder / "a.json").write_text('{"id": "a", "updated": true}')
+    (source_folder / "nested" / "b.json").write_text('{"id": "b", "updated": true}')
+    s3_client.sync_folder(source_folder, s3_prefix="shards", delete_orphans=False)
+    digest = hashlib.sha256((source_folder / "nested" / "b.json").read_bytes()).hexdigest()
+    boto3.client("s3", region_name=REGION).put_object(
+        Bucket=BUCKET_NAME, Key=f"shards/objects/{digest}", Body=b'{"id": "tampered"}'
+    )
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        s3_client.download_shards(destination, s3_prefix="shards")
+
+    assert read_folder(destination) == previous_files
+    assert not list(tmp_path.rglob("*.download"))
+
+
+def test_download_shards_rejects_paths_outside_the_folder(s3_client, tmp_path):
+    s3_client.sync_folder(tmp_path, s3_prefix="shards")
+    manifest = {"files": {"../evil.txt": {"sha256": "0" * 64, "size": 0}}}
+    boto3.client("s3", region_name=REGION).put_object(
+        Bucket=BUCKET_NAME, Key="shards/manifest.json", Body=json.dumps(manifest).encode("utf-8")
+    )
+
+    with pytest.raises(ValueError):
+        s3_client.download_shards(tmp_path / "restored", s3_prefix="shards")
+
+    assert not (tmp_path / "evil.txt").exists()
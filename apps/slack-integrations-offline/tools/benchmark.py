@@ -0,0 +1,707 @@
+import gc
+import gzip
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Iterator
+
+import click
+from bson import ObjectId
+
+from src.slack_integrations_offline.domain.document import Document, DocumentMetadata
+from src.slack_integrations_offline.infrastructure.mongodb.service import decode_documents
+from src.slack_integrations_offline.infrastructure.storage import get_document_store
+from src.slack_integrations_offline.infrastructure.storage.document_store import DOCUMENT_STORES
+from src.slack_integrations_offline.utils import generate_random_hex
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+@click.group(
+    help="""
+    Micro-benchmarks for the offline pipelines."""
+)
+def main() -> None:
+    pass
+
+
+@main.command("mongodb-decode")
+@click.option(
+    "--num-documents",
+    default=20_000,
+    show_default=True,
+    help="Number of raw MongoDB documents to decode.",
+)
+@click.option(
+    "--data-dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=ROOT_DIR / "data" / "enhanced",
+    show_default=True,
+    help="Directory with sample documents used to build the raw MongoDB documents.",
+)
+@click.option(
+    "--repeat",
+    default=10,
+    show_default=True,
+    help="Number of runs per strategy; the median one is reported.",
+)
+def mongodb_decode(num_documents: int, data_dir: Path, repeat: int) -> None:
+    """Compare the per-key parsing loop against the bulk decode and unvalidated construction.
+
+    Strategies are interleaved and the garbage collector is paused while timing, since
+    collections triggered by building the raw documents otherwise dominate the variance.
+    """
+
+    samples = [
+        Document.from_file(json_file).model_dump(exclude={"id"})
+        for json_file in sorted(data_dir.glob("*.json"))
+    ]
+
+    def build_raw_documents() -> list[dict]:
+        return [
+            {**samples[i % len(samples)], "_id": ObjectId()}
+            for i in range(num_documents)
+        ]
+
+    strategies: dict[str, Callable[[list[dict]], list[Document]]] = {
+        "per-key loop": lambda documents: _parse_documents_per_key(documents),
+        "bulk validated": lambda documents: decode_documents(Document, documents),
+        "unvalidated construct": lambda documents: _construct_documents(documents),
+    }
+
+    timings: dict[str, list[float]] = {name: [] for name in strategies}
+    for _ in range(repeat):
+        for name, strategy in strategies.items():
+            raw_documents = build_raw_documents()
+            gc.collect()
+            gc.disable()
+
+            start_time = time.perf_counter()
+            strategy(raw_documents)
+            timings[name].append(time.perf_counter() - start_time)
+
+            gc.enable()
+
+    click.echo(f"Decoding {num_documents} documents (median of {repeat} runs)")
+    for name, strategy_timings in timings.items():
+        _report(name, statistics.median(strategy_timings), num_documents)
+
+
+@main.command("document-store")
+@click.option(
+    "--num-documents",
+    default=5_000,
+    show_default=True,
+    help="Number of documents to write and read back.",
+)
+@click.option(
+    "--data-dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=ROOT_DIR / "data" / "crawled",
+    show_default=True,
+    help="Directory with a crawl used as sample documents.",
+)
+def document_store(num_documents: int, data_dir: Path) -> None:
+    """Compare write/read time and bytes on disk of the document storage formats."""
+
+    documents = _load_sample_documents(data_dir, num_documents)
+
+    click.echo(f"Writing and reading {num_documents} documents")
+    for storage_format in DOCUMENT_STORES:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = get_document_store(Path(temp_dir) / "documents", storage_format=storage_format)
+
+            start_time = time.perf_counter()
+            store.write_documents(documents)
+            write_seconds = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            read_count = sum(1 for _ in store.iter_documents())
+            read_seconds = time.perf_counter() - start_time
+
+            click.echo(f"{storage_format} ({store.size_bytes() / (1024 * 1024):.1f} MB on disk)")
+            _report("write", write_seconds, num_documents)
+            _report("read", read_seconds, read_count)
+
+
+@main.command("read-documents")
+@click.option(
+    "--file-counts",
+    default="500,2000,8000",
+    show_default=True,
+    help="Comma-separated numbers of stored documents to benchmark.",
+)
+@click.option(
+    "--max-workers",
+    default="1,4,16",
+    show_default=True,
+    help="Comma-separated reader thread counts to compare; 1 reads sequentially.",
+)
+@click.option(
+    "--storage-format",
+    type=click.Choice(list(DOCUMENT_STORES)),
+    default="json",
+    show_default=True,
+    help="On-disk format of the stored documents.",
+)
+@click.option(
+    "--data-dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=ROOT_DIR / "data" / "crawled",
+    show_default=True,
+    help="Directory with a crawl used as sample documents.",
+)
+def read_documents(
+    file_counts: str, max_workers: str, storage_format: str, data_dir: Path
+) -> None:
+    """Compare sequential and threaded document loading across corpus sizes."""
+
+    for num_documents in [int(count) for count in file_counts.split(",")]:
+        documents = _load_sample_documents(data_dir, num_documents)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            get_document_store(
+                Path(temp_dir), storage_format=storage_format
+            ).write_documents(documents)
+
+            click.echo(f"Reading {num_documents} documents in '{storage_format}' format")
+            for workers in [int(count) for count in max_workers.split(",")]:
+                store = get_document_store(Path(temp_dir), max_workers=workers)
+
+                start_time = time.perf_counter()
+                read_count = sum(1 for _ in store.iter_documents())
+                _report(f"{workers} workers", time.perf_counter() - start_time, read_count)
+
+
+@main.command("s3-upload")
+@click.option(
+    "--copies",
+    default=50,
+    show_default=True,
+    help="Number of copies of the crawl folder packed into the uploaded folder.",
+)
+@click.option(
+    "--part-size-mb",
+    default=16,
+    show_default=True,
+    help="Multipart upload part size in MB for the streaming mode.",
+)
+@click.option(
+    "--max-concurrency",
+    default=8,
+    show_default=True,
+    help="Maximum number of parts uploaded in parallel for the streaming mode.",
+)
+@click.option(
+    "--data-dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=ROOT_DIR / "data" / "crawled",
+    show_default=True,
+    help="Crawl folder replicated to build the uploaded folder.",
+)
+def s3_upload(copies: int, part_size_mb: int, max_concurrency: int, data_dir: Path) -> None:
+    """Compare the temporary-zip and streaming folder uploads against an in-memory S3 (moto)."""
+
+    try:
+        from moto import mock_aws
+    except ImportError:
+        raise click.ClickException("The s3-upload benchmark requires moto: pip install 'moto[s3]'")
+
+    from src.slack_integrations_offline.infrastructure.aws.s3 import S3Client
+
+    with tempfile.TemporaryDirectory() as temp_dir, mock_aws():
+        folder = Path(temp_dir) / "crawled"
+        for copy_index in range(copies):
+            shutil.copytree(data_dir, folder / f"copy-{copy_index}")
+
+        folder_mb = sum(path.stat().st_size for path in folder.rglob("*") if path.is_file()) / (1024 * 1024)
+        click.echo(f"Uploading a {folder_mb:.1f} MB folder")
+
+        s3_client = S3Client(bucket_name="benchmark-bucket")
+        for name, streaming in [("temporary zip", False), ("streaming multipart", True)]:
+            start_time = time.perf_counter()
+            s3_client.upload_folder(
+                folder,
+                s3_prefix=name.replace(" ", "-"),
+                streaming=streaming,
+                part_size_mb=part_size_mb,
+                max_concurrency=max_concurrency,
+            )
+            _report(name, time.perf_counter() - start_time, folder_mb, unit="MB")
+
+
+@main.command("s3-download")
+@click.option(
+    "--copies",
+    default=50,
+    show_default=True,
+    help="Number of copies of the crawl folder packed into the downloaded folder.",
+)
+@click.option(
+    "--part-size-mb",
+    default=16,
+    show_default=True,
+    help="Ranged GET size in MB for the archive download.",
+)
+@click.option(
+    "--max-concurrency",
+    default=8,
+    show_default=True,
+    help="Maximum number of ranged GETs or files downloaded in parallel.",
+)
+@click.option(
+    "--data-dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=ROOT_DIR / "data" / "crawled",
+    show_default=True,
+    help="Crawl folder replicated to build the downloaded folder.",
+)
+def s3_download(copies: int, part_size_mb: int, max_concurrency: int, data_dir: Path) -> None:
+    """Time the archive and manifest restores against an in-memory S3 (moto) and check the result."""
+
+    try:
+        from moto import mock_aws
+    except ImportError:
+        raise click.ClickException("The s3-download benchmark requires moto: pip install 'moto[s3]'")
+
+    from src.slack_integrations_offline.infrastructure.aws.s3 import S3Client, compute_sha256
+
+    def snapshot(folder: Path) -> dict[str, str]:
+        return {
+            path.relative_to(folder).as_posix(): compute_sha256(path)
+            for path in folder.rglob("*")
+            if path.is_file()
+        }
+
+    with tempfile.TemporaryDirectory() as temp_dir, mock_aws():
+        folder = Path(temp_dir) / "crawled"
+        for copy_index in range(copies):
+            shutil.copytree(data_dir, folder / f"copy-{copy_index}")
+
+        expected = snapshot(folder)
+        folder_mb = sum(path.stat().st_size for path in folder.rglob("*") if path.is_file()) / (1024 * 1024)
+
+        s3_client = S3Client(bucket_name="benchmark-bucket")
+        archive_key = s3_client.upload_folder(folder, s3_prefix="archive")
+        s3_client.sync_folder(folder, s3_prefix="sync")
+
+        click.echo(f"Restoring a {folder_mb:.1f} MB folder")
+        restores: dict[str, Callable[[Path], object]] = {
+            "archive": lambda output_dir: s3_client.download_folder(
+                archive_key,
+                output_dir,
+                part_size_mb=part_size_mb,
+                max_concurrency=max_concurrency,
+            ),
+            "manifest": lambda output_dir: s3_client.download_shards(
+                output_dir, s3_prefix="sync", max_concurrency=max_concurrency
+            ),
+            "manifest (up to date)": lambda output_dir: s3_client.download_shards(
+                output_dir, s3_prefix="sync", max_concurrency=max_concurrency
+            ),
+        }
+
+        for name, restore in restores.items():
+            output_dir = Path(temp_dir) / name.split()[0]
+
+            start_time = time.perf_counter()
+            restore(output_dir)
+            _report(name, time.perf_counter() - start_time, folder_mb, unit="MB")
+
+            if snapshot(output_dir) != expected:
+                raise click.ClickException(f"The {name} restore does not match the uploaded folder")
+
+
+@main.command("sitemap")
+@click.option(
+    "--num-sitemaps",
+    default=50,
+    show_default=True,
+    help="Number of gzip-compressed child sitemaps listed by the sitemap index.",
+)
+@click.option(
+    "--urls-per-sitemap",
+    default=10_000,
+    show_default=True,
+    help="Number of URLs in each child sitemap.",
+)
+@click.option(
+    "--max-concurrent-requests",
+    default=10,
+    show_default=True,
+    help="Maximum number of sitemaps fetched concurrently.",
+)
+def sitemap(num_sitemaps: int, urls_per_sitemap: int, max_concurrent_requests: int) -> None:
+    """Collect URLs from a local fixture site with robots.txt, a nested sitemap index and gzip'd sitemaps."""
+
+    from src.slack_integrations_offline.applications.crawlers.sitemap import SitemapCollector
+
+    namespace = "http://www.sitemaps.org/schemas/sitemap/0.9"
+    fixture: dict[str, bytes] = {}
+
+    def urlset(sitemap_index: int) -> bytes:
+        urls = "".join(
+            f"<url><loc>{{base_url}}/page-{sitemap_index}-{i}</loc>"
+            f"<lastmod>2024-01-01</lastmod><priority>0.5</priority></url>"
+            for i in range(urls_per_sitemap)
+        )
+        return f'<?xml version="1.0"?><urlset xmlns="{namespace}">{urls}</urlset>'.encode()
+
+    def sitemap_index(locations: list[str]) -> bytes:
+        sitemaps = "".join(f"<sitemap><loc>{{base_url}}{location}</loc></sitemap>" for location in locations)
+        return f'<?xml version="1.0"?><sitemapindex xmlns="{namespace}">{sitemaps}</sitemapindex>'.encode()
+
+    child_paths = [f"/sitemaps/pages-{i}.xml.gz" for i in range(num_sitemaps)]
+    for i, path in enumerate(child_paths):
+        fixture[path] = urlset(i)
+
+    # The root index lists half of the children directly and the rest through a nested index
+    fixture["/sitemaps/nested.xml"] = sitemap_index(child_paths[num_sitemaps // 2 :])
+    fixture["/sitemap.xml"] = sitemap_index(child_paths[: num_sitemaps // 2] + ["/sitemaps/nested.xml"])
+    fixture["/robots.txt"] = b"User-agent: *\nAllow: /\nSitemap: {base_url}/sitemap.xml\n"
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path not in fixture:
+                self.send_error(404)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(fixture[self.path])))
+            self.end_headers()
+            self.wfile.write(fixture[self.path])
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    for path, body in fixture.items():
+        body = body.replace(b"{base_url}", base_url.encode())
+        fixture[path] = gzip.compress(body) if path.endswith(".gz") else body
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        start_time = time.perf_counter()
+        entries = SitemapCollector(max_concurrent_requests=max_concurrent_requests)(base_url)
+        elapsed_seconds = time.perf_counter() - start_time
+    finally:
+        server.shutdown()
+
+    expected_count = num_sitemaps * urls_per_sitemap
+    click.echo(f"Collecting {expected_count} URLs from {num_sitemaps + 2} sitemaps")
+    _report("sitemap collector", elapsed_seconds, len(entries), unit="URLs")
+
+    if len(entries) != expected_count or any(entry.lastmod is None or entry.priority is None for entry in entries):
+        raise click.ClickException(f"Expected {expected_count} URLs with metadata, got {len(entries)}")
+
+
+@main.command("crawl-tiers")
+@click.option(
+    "--num-pages",
+    default=500,
+    show_default=True,
+    help="Number of pages served by the fixture site.",
+)
+@click.option(
+    "--js-ratio",
+    default=0.1,
+    show_default=True,
+    help="Fraction of the pages that only render their content with JavaScript.",
+)
+@click.option(
+    "--max-concurrent-requests",
+    default=10,
+    show_default=True,
+    help="Maximum number of pages crawled concurrently.",
+)
+@click.option(
+    "--compare-browser/--no-compare-browser",
+    default=True,
+    show_default=True,
+    help="Also crawl every page with the headless browser, as before the HTTP fast path.",
+)
+def crawl_tiers(num_pages: int, js_ratio: float, max_concurrent_requests: int, compare_browser: bool) -> None:
+    """Crawl a local fixture site of static and JavaScript-rendered pages with and without the HTTP fast path."""
+
+    from src.slack_integrations_offline.applications.crawlers import (
+        AdaptiveRateLimiter,
+        Crawl4AICrawler,
+    )
+
+    section = "".join(
+        f"<h2>Section {i}</h2><p>{'Pipelines orchestrate steps and artifacts. ' * 20}</p>"
+        f"<pre><code>from zenml import pipeline, step</code></pre>"
+        for i in range(8)
+    )
+    static_page = (
+        "<html><head><title>Page {index}</title><meta name='description' content='Page {index}'></head>"
+        "<body><nav><a href='/'>Home</a><a href='/page-0'>First</a></nav>"
+        f"<main><h1>Page {{index}}</h1>{section}</main></body></html>"
+    )
+    js_page = (
+        "<html><head><title>App {index}</title><script src='/app.js'></script></head>"
+        "<body><noscript>You need to enable JavaScript to run this app.</noscript>"
+        "<div id='root'></div></body></html>"
+    )
+
+    num_js_pages = int(num_pages * js_ratio)
+    fixture = {
+        f"/page-{i}": (js_page if i < num_js_pages else static_page).format(index=i).encode()
+        for i in range(num_pages)
+    }
+
+    strategies = {"http fast path": True}
+    if compare_browser:
+        strategies["browser only"] = False
+
+    with _serve_html_fixture(fixture) as base_url:
+        urls = [f"{base_url}{path}" for path in fixture]
+        click.echo(f"Crawling {num_pages} pages ({num_js_pages} need JavaScript)")
+        for name, fast_path in strategies.items():
+            crawler = Crawl4AICrawler(
+                max_concurrent_requests=max_concurrent_requests,
+                rate_limiter=AdaptiveRateLimiter(initial_rate=10_000.0, max_rate=10_000.0),
+                respect_crawl_delay=False,
+                fast_path=fast_path,
+            )
+
+            start_time = time.perf_counter()
+            documents = crawler(urls)
+            _report(name, time.perf_counter() - start_time, len(documents), unit="pages")
+            click.echo(
+                f"    {crawler.http_page_count} over HTTP | {crawler.browser_page_count} rendered | "
+                f"{crawler.failed_count} failed | fallbacks: {crawler.browser_fallbacks}"
+            )
+
+
+@main.command("crawl-overhead")
+@click.option(
+    "--num-pages",
+    default=200,
+    show_default=True,
+    help="Number of pages served by the fixture site.",
+)
+@click.option(
+    "--batch-size",
+    default=20,
+    show_default=True,
+    help="Pages per crawler call when a browser is started for every batch.",
+)
+@click.option(
+    "--browser-pool-size",
+    default=2,
+    show_default=True,
+    help="Number of pooled browsers.",
+)
+@click.option(
+    "--pages-per-browser",
+    default=100,
+    show_default=True,
+    help="Number of pages after which a pooled browser is recycled.",
+)
+def crawl_overhead(num_pages: int, batch_size: int, browser_pool_size: int, pages_per_browser: int) -> None:
+    """Compare per-page setup costs: run config and browser per page or batch against reused ones."""
+
+    from crawl4ai import CrawlerRunConfig
+    from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+    from src.slack_integrations_offline.applications.crawlers import (
+        AdaptiveRateLimiter,
+        Crawl4AICrawler,
+    )
+    from src.slack_integrations_offline.applications.crawlers.http_fetcher import MARKDOWN_OPTIONS
+
+    click.echo(f"Building the crawl configuration for {num_pages} pages")
+
+    start_time = time.perf_counter()
+    for _ in range(num_pages):
+        CrawlerRunConfig(markdown_generator=DefaultMarkdownGenerator(options=MARKDOWN_OPTIONS))
+    _report("config per page", time.perf_counter() - start_time, num_pages, unit="pages")
+
+    crawler = Crawl4AICrawler()
+    start_time = time.perf_counter()
+    for _ in range(num_pages):
+        crawler.run_config
+    _report("shared config", time.perf_counter() - start_time, num_pages, unit="pages")
+
+    body = f"<html><head><title>Page</title></head><body><main>{'<p>Static content.</p>' * 200}</main></body></html>"
+    fixture = {f"/page-{i}": body.encode() for i in range(num_pages)}
+
+    def build_crawler() -> Crawl4AICrawler:
+        return Crawl4AICrawler(
+            rate_limiter=AdaptiveRateLimiter(initial_rate=10_000.0, max_rate=10_000.0),
+            respect_crawl_delay=False,
+            fast_path=False,
+            browser_pool_size=browser_pool_size,
+            pages_per_browser=pages_per_browser,
+        )
+
+    with _serve_html_fixture(fixture) as base_url:
+        urls = [f"{base_url}{path}" for path in fixture]
+        click.echo(f"Rendering {num_pages} pages with the browser")
+
+        batched_crawler = build_crawler()
+        start_time = time.perf_counter()
+        browsers_started = 0
+        for batch_start in range(0, num_pages, batch_size):
+            batched_crawler(urls[batch_start : batch_start + batch_size])
+            browsers_started += batched_crawler.browsers_started
+        _report(f"browser per {batch_size} pages", time.perf_counter() - start_time, num_pages, unit="pages")
+        click.echo(f"    {browsers_started} browsers started")
+
+        pooled_crawler = build_crawler()
+        start_time = time.perf_counter()
+        pooled_crawler(urls)
+        _report("browser pool", time.perf_counter() - start_time, num_pages, unit="pages")
+        click.echo(
+            f"    {pooled_crawler.browsers_started} browsers started | "
+            f"{pooled_crawler.browsers_recycled} recycled"
+        )
+
+
+@main.command("dedup")
+@click.option(
+    "--num-documents",
+    default=100_000,
+    show_default=True,
+    help="Number of distinct synthetic documents.",
+)
+@click.option(
+    "--duplicate-ratio",
+    default=0.1,
+    show_default=True,
+    help="Fraction of documents that get a near-duplicate under another URL.",
+)
+@click.option(
+    "--words-per-document",
+    default=500,
+    show_default=True,
+    help="Number of words of each synthetic document.",
+)
+def dedup(num_documents: int, duplicate_ratio: float, words_per_document: int) -> None:
+    """Time near-duplicate detection on synthetic documents with known duplicates."""
+
+    import random
+
+    from src.slack_integrations_offline.applications.preprocessing import (
+        NearDuplicateDetector,
+        deduplicate_documents,
+    )
+    from src.slack_integrations_offline.domain.document import DocumentMetadata
+
+    rng = random.Random(0)
+    vocabulary = [f"word{i}" for i in range(20_000)]
+
+    def make_document(url: str, words: list[str]) -> Document:
+        return Document(
+            metadata=DocumentMetadata(id=generate_random_hex(length=32), url=url, title="", properties={}),
+            content=" ".join(words),
+        )
+
+    documents = []
+    for i in range(num_documents):
+        words = rng.choices(vocabulary, k=words_per_document)
+        documents.append(make_document(f"https://docs.example.com/page-{i}", words))
+
+        if rng.random() < duplicate_ratio:
+            # A versioned copy of the page with a single edited word
+            words = list(words)
+            words[rng.randrange(len(words))] = "edited"
+            documents.append(make_document(f"https://docs.example.com/v2/page-{i}", words))
+
+    click.echo(f"Deduplicating {len(documents)} documents ({len(documents) - num_documents} near-duplicates)")
+
+    start_time = time.perf_counter()
+    deduplicated, groups = deduplicate_documents(documents, NearDuplicateDetector())
+    _report("minhash + lsh", time.perf_counter() - start_time, len(documents))
+    click.echo(f"    {len(documents) - len(deduplicated)} removed | {len(groups)} groups")
+
+
+@contextmanager
+def _serve_html_fixture(pages: dict[str, bytes]) -> Iterator[str]:
+    """Serve HTML pages keyed by path from a local HTTP server.
+
+    Yields:
+        str: Base URL of the server.
+    """
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            if self.path not in pages:
+                self.send_error(404)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(pages[self.path])))
+            self.end_headers()
+            self.wfile.write(pages[self.path])
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+
+
+def _load_sample_documents(data_dir: Path, num_documents: int) -> list[Document]:
+    """Load a stored crawl and replicate it with fresh ids up to the requested size."""
+
+    samples = get_document_store(data_dir).read_documents()
+
+    return [
+        samples[i % len(samples)].model_copy(update={"id": generate_random_hex(length=32)})
+        for i in range(num_documents)
+    ]
+
+
+def _parse_documents_per_key(documents: list[dict]) -> list[Document]:
+    """Reference implementation of the original per-key, per-row parsing loop."""
+
+    parsed_documents = []
+    for doc in documents:
+        for key, value in doc.items():
+            if isinstance(value, ObjectId):
+                doc[key] = str(value)
+
+        _id = doc.pop("_id", None)
+        doc["id"] = _id
+
+        parsed_documents.append(Document.model_validate(doc))
+
+    return parsed_documents
+
+
+def _construct_documents(documents: list[dict]) -> list[Document]:
+    """Reference implementation of a trusted decode building models without validation."""
+
+    constructed_documents = []
+    for doc in documents:
+        doc["id"] = str(doc.pop("_id"))
+        doc["metadata"] = DocumentMetadata.model_construct(**doc["metadata"])
+        constructed_documents.append(Document.model_construct(**doc))
+
+    return constructed_documents
+
+
+def _report(name: str, elapsed_seconds: float, num_items: int, unit: str = "docs") -> None:
+    click.echo(
+        f"  {name:<24} {elapsed_seconds:8.3f}s  {num_items / max(elapsed_seconds, 1e-9):12,.0f} {unit}/s"
+    )
+
+
+if __name__ == "__main__":
+    main()